@@ -1,9 +1,19 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, Response
 import json
 import os
+import base64
+import hashlib
+import threading
 from datetime import datetime
+from typing import Dict, List
 from hkust_scraper import HKUSTGZScraper
-from research_matcher import ResearchMatcher
+from matcher_registry import MatcherRegistry
+from jobs import FINISHED_STATES, Job, JobConflict, JobManager, JobStore
+from result_cache import normalize_interests
+from facet_index import normalize_filters
+from shared_corpus import SharedCorpus
+from profile_store import as_dicts, open_profiles
+from exporters import EXPORT_MIMETYPES, MATCH_FIELDS, export_stream, match_rows, parquet_available, profile_fields
 from config import Config
 
 app = Flask(__name__)
@@ -11,44 +21,264 @@ app.config.from_object(Config)
 
 # Global variables to store data
 faculty_profiles = []
+profiles_file = None
 research_matcher = None
 
+# One matcher per worker process: the model is loaded and warmed up at boot
+matcher_registry = MatcherRegistry()
+# Parse workers started by `python app.py` re-import this module as __mp_main__; they need no model
+if Config.WARMUP_ON_STARTUP and __name__ != '__mp_main__':
+    matcher_registry.warm_up()
+
+# Long-running crawls run here, so request threads stay free for /match; with a job store
+# every worker can follow or cancel them and only one crawl runs on the node at a time
+job_store = JobStore(Config.JOB_STORE_PATH, history=Config.JOB_HISTORY) if Config.JOB_STORE_PATH else None
+job_manager = JobManager(max_workers=Config.MAX_CONCURRENT_JOBS, history=Config.JOB_HISTORY, store=job_store)
+
+# The corpus is published once per node and every worker maps the same copy
+shared_corpus = SharedCorpus(Config.SHARED_CORPUS_DIR) if Config.SHARED_CORPUS_DIR else None
+corpus_version = None
+corpus_lock = threading.Lock()
+
+def set_corpus(profiles: List[Dict], filename: str, previous_path: str = None):
+    """Embed a newly loaded corpus and publish it to the other workers"""
+    global faculty_profiles, profiles_file
+    
+    matcher = matcher_registry.get_matcher()
+    with corpus_lock:
+        faculty_profiles = profiles
+        profiles_file = filename
+        loaded = matcher.load_corpus(profiles, filename, previous_path=previous_path)
+        if shared_corpus is None or not loaded:
+            return
+        
+        key = f"{matcher.corpus['version']}:{Config.SENTENCE_MODEL}:{Config.EMBEDDING_MODE}"
+        version = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        try:
+            pointer = shared_corpus.publish(version, profiles, filename, matcher.corpus['embeddings'],
+                                            getattr(matcher.corpus['index'], 'offsets', None))
+        except OSError as e:
+            app.logger.error(f"Error publishing shared corpus: {e}")
+            return
+        # Serve from the shared mapping too, like every other worker
+        attach_corpus(pointer)
+
+def attach_corpus(pointer: Dict):
+    """Switch this worker to a published corpus version (caller holds ``corpus_lock``)"""
+    global faculty_profiles, profiles_file, corpus_version
+    
+    try:
+        profiles, embeddings, offsets = shared_corpus.attach(pointer)
+    except (OSError, ValueError) as e:
+        app.logger.error(f"Error attaching shared corpus {pointer['version']}: {e}")
+        return
+    
+    if matcher_registry.get_matcher().load_corpus(profiles, pointer['profiles_file'],
+                                                  embeddings=embeddings, offsets=offsets):
+        faculty_profiles = profiles
+        profiles_file = pointer['profiles_file']
+    # Don't retry a version that failed to load on every request
+    corpus_version = pointer['version']
+
+@app.before_request
+def sync_shared_corpus():
+    """Pick up a corpus version published by another worker"""
+    if shared_corpus is None:
+        return
+    
+    pointer = shared_corpus.current()
+    if pointer and pointer['version'] != corpus_version:
+        with corpus_lock:
+            if pointer['version'] != corpus_version:
+                attach_corpus(pointer)
+
 @app.route('/')
 def index():
     """Main page"""
     return render_template('index.html')
 
+def run_scrape_job(job: Job, headless: bool, delay: float, fetch_mode: str):
+    """Background scrape: crawl, save the profiles file and embed the new corpus"""
+    scraper = HKUSTGZScraper(headless=headless, delay=delay, fetch_mode=fetch_mode,
+                             progress_callback=job.report_progress, cancel_event=job.cancel_event)
+    profiles = scraper.scrape_all_faculty()
+    
+    # A cancelled crawl keeps its checkpoint for the next run instead of replacing the corpus
+    if job.cancel_event.is_set():
+        return None
+    
+    # Save results
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"faculty_profiles_{timestamp}.json"
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2, ensure_ascii=False)
+    
+    job.report_progress({'stage': 'embedding'})
+    set_corpus(profiles, filename)
+    
+    return {
+        'message': f'Successfully scraped {len(profiles)} faculty profiles',
+        'filename': filename,
+        'count': len(profiles)
+    }
+
 @app.route('/scrape', methods=['POST'])
 def scrape_faculty():
-    """Start scraping HKUST-GZ faculty directory"""
-    global faculty_profiles
-    
+    """Start scraping HKUST-GZ faculty directory as a background job"""
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         headless = data.get('headless', True)
-        delay = data.get('delay', 2.0)
-        
-        # Initialize scraper
-        scraper = HKUSTGZScraper(headless=headless, delay=delay)
-        
-        # Start scraping
-        profiles = scraper.scrape_all_faculty()
+        # No delay means the configured SCRAPER_PAGES_PER_SECOND rate applies
+        delay = data.get('delay')
+        fetch_mode = data.get('fetch_mode')
+        
+        # Crawls share one checkpoint file, so only one may run at a time
+        try:
+            job = job_manager.submit('scrape', lambda job: run_scrape_job(job, headless, delay, fetch_mode),
+                                     group='crawl')
+        except JobConflict as e:
+            return jsonify({
+                'success': False,
+                'error': 'A crawl is already running',
+                'job_id': e.job_id
+            }), 409
         
-        # Save results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"faculty_profiles_{timestamp}.json"
+        return jsonify({
+            'success': True,
+            'message': 'Scraping started',
+            'job_id': job.id
+        }), 202
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(profiles, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Get the status, progress and result of a background job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Ask a background job to stop"""
+    job = job_manager.cancel(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream a job's progress and status changes as Server-Sent Events"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    # Reconnecting EventSource clients resume after the last event they received
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0) or 0)
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Last-Event-ID and after must be integers'
+        }), 400
+    
+    def stream():
+        nonlocal last_id
+        while True:
+            events = job_manager.events_after(job_id, last_id, timeout=Config.SSE_HEARTBEAT_SECONDS)
+            if not events:
+                state = job_manager.get(job_id)
+                if state is None or state['status'] in FINISHED_STATES:
+                    return
+                yield ': keep-alive\n\n'
+                continue
+            for event in events:
+                last_id = event['id']
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def run_refresh_job(job: Job, headless: bool, delay: float):
+    """Background refresh: re-crawl, save the profiles file and re-embed only what changed"""
+    scraper = HKUSTGZScraper(headless=headless, delay=delay,
+                             progress_callback=job.report_progress, cancel_event=job.cancel_event)
+    report = scraper.refresh_faculty(as_dicts(faculty_profiles))
+    profiles = report['profiles']
+    
+    if job.cancel_event.is_set():
+        return None
+    if not profiles:
+        raise RuntimeError('Refresh returned no profiles')
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"faculty_profiles_{timestamp}.json"
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2, ensure_ascii=False)
+    
+    # Unchanged profiles reuse their embeddings from the previous file's store
+    job.report_progress({'stage': 'embedding'})
+    set_corpus(profiles, filename, previous_path=profiles_file)
+    
+    return {
+        'message': (f"Refreshed {len(profiles)} profiles: {len(report['added'])} added, "
+                    f"{len(report['changed'])} changed, {len(report['removed'])} removed"),
+        'filename': filename,
+        'count': len(profiles),
+        'added': report['added'],
+        'changed': report['changed'],
+        'removed': report['removed']
+    }
+
+@app.route('/refresh', methods=['POST'])
+def refresh_faculty():
+    """Re-crawl the faculty directory as a background job, re-fetching and re-embedding only what changed"""
+    
+    try:
+        data = request.get_json() or {}
+        headless = data.get('headless', True)
+        delay = data.get('delay')
         
-        faculty_profiles = profiles
+        try:
+            job = job_manager.submit('refresh', lambda job: run_refresh_job(job, headless, delay), group='crawl')
+        except JobConflict as e:
+            return jsonify({
+                'success': False,
+                'error': 'A crawl is already running',
+                'job_id': e.job_id
+            }), 409
         
         return jsonify({
             'success': True,
-            'message': f'Successfully scraped {len(profiles)} faculty profiles',
-            'filename': filename,
-            'count': len(profiles)
-        })
+            'message': 'Refresh started',
+            'job_id': job.id
+        }), 202
         
     except Exception as e:
         return jsonify({
@@ -59,7 +289,6 @@ def scrape_faculty():
 @app.route('/load_profiles', methods=['POST'])
 def load_profiles():
     """Load previously scraped faculty profiles"""
-    global faculty_profiles
     
     try:
         data = request.get_json()
@@ -71,13 +300,17 @@ def load_profiles():
                 'error': 'File not found'
             }), 404
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            faculty_profiles = json.load(f)
+        # The compact store beside the file is built on first load and reused after that
+        profiles = open_profiles(filename)
+        
+        # Embed the corpus now (or reuse the stored embeddings) so /match only encodes queries,
+        # then publish it so the other workers swap to it on their next request
+        set_corpus(profiles, filename)
         
         return jsonify({
             'success': True,
-            'message': f'Loaded {len(faculty_profiles)} faculty profiles',
-            'count': len(faculty_profiles)
+            'message': f'Loaded {len(profiles)} faculty profiles',
+            'count': len(profiles)
         })
         
     except Exception as e:
@@ -86,15 +319,57 @@ def load_profiles():
             'error': str(e)
         }), 500
 
+def format_match(match: Dict) -> Dict:
+    """Frontend representation of a match"""
+    profile = match['faculty_profile']
+    return {
+        'name': profile.get('name', 'Unknown'),
+        'title': profile.get('title', ''),
+        'department': profile.get('department', ''),
+        'email': profile.get('email', ''),
+        'similarity_score': round(match['similarity_score'], 3),
+        'match_reasons': match['match_reasons'],
+        'research_interests': profile.get('research_interests', []),
+        'bio': profile.get('bio', '')[:200] + '...' if len(profile.get('bio', '')) > 200 else profile.get('bio', ''),
+        'profile_url': profile.get('url', ''),
+        'google_scholar': profile.get('google_scholar', ''),
+        'research_gate': profile.get('research_gate', '')
+    }
+
+def encode_cursor(offset: int, query_key: str) -> str:
+    """Opaque cursor for the page of a ranked match list starting at ``offset``"""
+    payload = json.dumps({'offset': offset, 'query': query_key}).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+def decode_cursor(cursor: str, query_key: str) -> int:
+    """Offset of a cursor, which must have been issued for the same query and corpus"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        offset = int(payload['offset'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+    if payload.get('query') != query_key or offset < 0:
+        raise ValueError('Cursor does not match this query or the profiles have changed')
+    return offset
+
 @app.route('/match', methods=['POST'])
 def match_interests():
-    """Match user interests with faculty profiles"""
-    global faculty_profiles, research_matcher
+    """Match user interests with faculty profiles, one page of ranked results at a time
+    
+    Pages are requested with ``page_size`` and the ``next_cursor`` of the
+    previous page. With ``stream`` set the response is NDJSON: the ranked
+    page goes out as soon as top-k is known and each result's reasons follow
+    as they finish. Optional ``filters`` restrict the search to facet values
+    (see ``GET /facets``).
+    """
+    global research_matcher
     
     try:
         data = request.get_json()
         user_interests = data.get('interests', '')
         openai_key = data.get('openai_key', '')
+        stream = bool(data.get('stream', False))
+        filters = data.get('filters') or None
         
         if not user_interests:
             return jsonify({
@@ -102,42 +377,84 @@ def match_interests():
                 'error': 'Research interests are required'
             }), 400
         
-        if not faculty_profiles:
+        try:
+            page_size = min(max(1, int(data.get('page_size') or Config.MATCH_PAGE_SIZE)), Config.MAX_RESULTS)
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'page_size must be an integer'
+            }), 400
+        
+        try:
+            facet_filters = normalize_filters(filters)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        profiles = faculty_profiles
+        if not profiles:
             return jsonify({
                 'success': False,
                 'error': 'No faculty profiles loaded. Please scrape or load profiles first.'
             }), 400
         
-        # Initialize research matcher
-        research_matcher = ResearchMatcher(openai_api_key=openai_key)
-        
-        # Perform matching
-        matches = research_matcher.match_faculty_with_interests(faculty_profiles, user_interests)
-        
-        # Prepare results for frontend
-        results = []
-        for match in matches:
-            profile = match['faculty_profile']
-            results.append({
-                'name': profile.get('name', 'Unknown'),
-                'title': profile.get('title', ''),
-                'department': profile.get('department', ''),
-                'email': profile.get('email', ''),
-                'similarity_score': round(match['similarity_score'], 3),
-                'match_reasons': match['match_reasons'],
-                'research_interests': profile.get('research_interests', []),
-                'bio': profile.get('bio', '')[:200] + '...' if len(profile.get('bio', '')) > 200 else profile.get('bio', ''),
-                'profile_url': profile.get('url', ''),
-                'google_scholar': profile.get('google_scholar', ''),
-                'research_gate': profile.get('research_gate', '')
-            })
+        # Embed the corpus if this worker hasn't done so yet
+        if not matcher_registry.get_matcher().has_corpus(profiles):
+            matcher_registry.get_matcher().load_corpus(profiles, profiles_file)
         
-        return jsonify({
+        # Get the shared research matcher, bound to the caller's OpenAI key
+        research_matcher = matcher = matcher_registry.get_matcher(openai_key)
+        
+        corpus = matcher.corpus
+        query_key = hashlib.sha1(
+            f"{normalize_interests(user_interests)}:{facet_filters}:{corpus['version'] if corpus else ''}".encode('utf-8')
+        ).hexdigest()[:16]
+        try:
+            offset = decode_cursor(data['cursor'], query_key) if data.get('cursor') else 0
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # Rank first (the ranked list is cached); reasons are only generated for the requested page
+        matches = matcher.match_faculty_with_interests(profiles, user_interests, with_reasons=False,
+                                                       filters=filters)
+        
+        page = matches[offset:offset + page_size]
+        reasons_ready = not any(match.get('reasons_pending') for match in page)
+        next_offset = offset + len(page)
+        summary = {
             'success': True,
-            'matches': results,
-            'total_matches': len(results),
-            'total_profiles': len(faculty_profiles)
-        })
+            'total_matches': len(matches),
+            'total_profiles': len(profiles),
+            'offset': offset,
+            'reasons_pending': not reasons_ready,
+            'next_cursor': encode_cursor(next_offset, query_key) if next_offset < len(matches) else None
+        }
+        
+        # Reasons are filled into the cached matches, so each one is generated once per query
+        if not stream:
+            for _ in matcher.fill_match_reasons(page, user_interests):
+                pass
+            return jsonify(dict(summary, reasons_pending=False, matches=[format_match(match) for match in page]))
+        
+        def generate():
+            try:
+                yield json.dumps(dict(summary, type='page', matches=[format_match(match) for match in page]),
+                                 ensure_ascii=False) + '\n'
+                if not reasons_ready:
+                    for index, reasons in matcher.fill_match_reasons(page, user_interests):
+                        yield json.dumps({'type': 'reasons', 'rank': offset + index, 'match_reasons': reasons},
+                                         ensure_ascii=False) + '\n'
+                yield json.dumps({'type': 'done'}) + '\n'
+            except Exception as e:
+                yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+        
+        return Response(generate(), mimetype='application/x-ndjson',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
         
     except Exception as e:
         return jsonify({
@@ -145,6 +462,113 @@ def match_interests():
             'error': str(e)
         }), 500
 
+@app.route('/match_batch', methods=['POST'])
+def match_batch():
+    """Match many interest statements at once, streaming one NDJSON line per query as it's ready
+    
+    A query that could not be matched gets an ``error`` line instead of ``matches``.
+    """
+    data = request.get_json() or {}
+    interests = data.get('interests')
+    openai_key = data.get('openai_key', '')
+    with_reasons = data.get('with_reasons', True)
+    filters = data.get('filters') or None
+    
+    if not isinstance(interests, list) or not interests or not all(isinstance(text, str) for text in interests):
+        return jsonify({
+            'success': False,
+            'error': 'interests must be a non-empty list of strings'
+        }), 400
+    
+    if len(interests) > Config.MAX_BATCH_QUERIES:
+        return jsonify({
+            'success': False,
+            'error': f'At most {Config.MAX_BATCH_QUERIES} interest statements per batch'
+        }), 400
+    
+    try:
+        normalize_filters(filters)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    profiles, filename = faculty_profiles, profiles_file
+    if not profiles:
+        return jsonify({
+            'success': False,
+            'error': 'No faculty profiles loaded. Please scrape or load profiles first.'
+        }), 400
+    
+    if not matcher_registry.get_matcher().has_corpus(profiles):
+        matcher_registry.get_matcher().load_corpus(profiles, filename)
+    matcher = matcher_registry.get_matcher(openai_key)
+    
+    def generate():
+        count = 0
+        try:
+            for query_index, matches in matcher.match_batch(profiles, interests, with_reasons=bool(with_reasons),
+                                                            filters=filters):
+                count += 1
+                if isinstance(matches, Exception):
+                    # Matching failed for this query, which is not the same as finding nothing
+                    yield json.dumps({
+                        'query_index': query_index,
+                        'interests': interests[query_index],
+                        'error': str(matches)
+                    }, ensure_ascii=False) + '\n'
+                    continue
+                results = [format_match(match) for match in matches]
+                yield json.dumps({
+                    'query_index': query_index,
+                    'interests': interests[query_index],
+                    'matches': results,
+                    'total_matches': len(results)
+                }, ensure_ascii=False) + '\n'
+            yield json.dumps({'done': True, 'total_queries': count, 'total_profiles': len(profiles)}) + '\n'
+        except Exception as e:
+            yield json.dumps({'done': True, 'error': str(e), 'total_queries': count}) + '\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/facets')
+def facet_counts():
+    """Profile counts per department, title and link presence, for building search filters"""
+    profiles = faculty_profiles
+    if not profiles:
+        return jsonify({
+            'success': False,
+            'error': 'No faculty profiles loaded. Please scrape or load profiles first.'
+        }), 400
+    
+    matcher = matcher_registry.get_matcher()
+    if not matcher.has_corpus(profiles):
+        matcher.load_corpus(profiles, profiles_file)
+    if matcher.corpus is None:
+        return jsonify({
+            'success': False,
+            'error': 'Faculty profiles could not be indexed'
+        }), 500
+    
+    facet_index = matcher.corpus['facet_index']
+    return jsonify({
+        'success': True,
+        'facets': facet_index.counts(),
+        'total_profiles': len(facet_index)
+    })
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Hit-rate statistics of the /match result cache and the LLM response cache"""
+    matcher = matcher_registry.get_matcher()
+    return jsonify({
+        'success': True,
+        'stats': matcher.result_cache.stats(),
+        'llm': matcher.llm_cache.stats()
+    })
+
 @app.route('/analyze/<int:match_index>', methods=['POST'])
 def analyze_faculty(match_index):
     """Get detailed analysis of a specific faculty member"""
@@ -184,49 +608,107 @@ def analyze_faculty(match_index):
 
 @app.route('/export', methods=['POST'])
 def export_results():
-    """Export matching results"""
+    """Stream matching results or the corpus as CSV, NDJSON, JSON or Parquet
+    
+    ``mode`` picks the rows: ``matches`` exports the posted matches,
+    ``run`` re-runs the match for ``interests`` (and ``filters``) and
+    exports every ranked result, and ``corpus`` exports all stored profiles
+    (within ``filters``), each with its ``similarity_score`` when
+    ``interests`` are given; the score is empty for profiles that were never
+    embedded because they have no name or no research text. Rows are
+    encoded in chunks of ``EXPORT_CHUNK_ROWS`` straight into the response.
+    Accepts JSON or form posts.
+    """
     try:
-        data = request.get_json()
-        matches = data.get('matches', [])
+        data = request.get_json(silent=True) or request.form.to_dict()
+        mode = data.get('mode', 'matches')
         format_type = data.get('format', 'json')
+        user_interests = data.get('interests', '')
+        filters = data.get('filters') or None
+        # Form posts carry structured fields as JSON strings
+        if isinstance(filters, str):
+            filters = json.loads(filters)
         
-        if not matches:
+        if format_type not in Config.EXPORT_FORMATS:
             return jsonify({
                 'success': False,
-                'error': 'No matches to export'
+                'error': f'Unsupported format: {format_type}'
             }), 400
         
-        if not research_matcher:
+        if format_type == 'parquet' and not parquet_available():
             return jsonify({
                 'success': False,
-                'error': 'Research matcher not initialized'
+                'error': 'Parquet export requires pyarrow'
             }), 400
         
-        # Export results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        try:
+            normalize_filters(filters)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        if format_type == 'json':
-            filename = f"faculty_matches_{timestamp}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(matches, f, indent=2, ensure_ascii=False)
+        if mode == 'matches':
+            matches = data.get('matches') or []
+            if isinstance(matches, str):
+                matches = json.loads(matches)
+            if not matches:
+                return jsonify({
+                    'success': False,
+                    'error': 'No matches to export'
+                }), 400
+            rows = (dict(match, rank=rank) for rank, match in enumerate(matches, 1))
+            fields = MATCH_FIELDS
+        
+        elif mode in ('run', 'corpus'):
+            profiles = faculty_profiles
+            if not profiles:
+                return jsonify({
+                    'success': False,
+                    'error': 'No faculty profiles loaded. Please scrape or load profiles first.'
+                }), 400
             
-            return send_file(filename, as_attachment=True)
-        
-        elif format_type == 'csv':
-            filename = f"faculty_matches_{timestamp}.csv"
-            csv_data = research_matcher.export_results(matches, 'csv')
+            if mode == 'run' and not user_interests:
+                return jsonify({
+                    'success': False,
+                    'error': 'Research interests are required'
+                }), 400
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(csv_data)
+            if user_interests:
+                if not matcher_registry.get_matcher().has_corpus(profiles):
+                    matcher_registry.get_matcher().load_corpus(profiles, profiles_file)
+                matcher = matcher_registry.get_matcher(data.get('openai_key', ''))
             
-            return send_file(filename, as_attachment=True)
+            if mode == 'run':
+                rows = match_rows(matcher.match_faculty_with_interests(profiles, user_interests, filters=filters))
+                fields = MATCH_FIELDS
+            elif user_interests:
+                if not matcher.has_corpus(profiles):
+                    return jsonify({
+                        'success': False,
+                        'error': 'Faculty profiles could not be indexed'
+                    }), 500
+                # Scored from the precomputed corpus embeddings, one block at a time
+                rows = (dict(profile, similarity_score=score)
+                        for profile, score in matcher.iter_corpus_scores(user_interests, filters))
+                fields = profile_fields(profiles) + ['similarity_score']
+            else:
+                rows = iter(profiles)
+                fields = profile_fields(profiles)
         
         else:
             return jsonify({
                 'success': False,
-                'error': f'Unsupported format: {format_type}'
+                'error': f'Unsupported export mode: {mode}'
             }), 400
         
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"faculty_{mode}_{timestamp}.{format_type}"
+        return Response(export_stream(rows, fields, format_type, Config.EXPORT_CHUNK_ROWS),
+                        mimetype=EXPORT_MIMETYPES[format_type],
+                        headers={'Content-Disposition': f'attachment; filename={filename}'})
+        
     except Exception as e:
         return jsonify({
             'success': False,
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Vector Index Benchmark
+Measures recall@k, query latency and memory of the vector index backends
+(IVF, float16 / int8 quantized) against exact float32 search, on a stored
+embedding matrix or synthetic data.
+"""
+
+import argparse
+import time
+import numpy as np
+from vector_index import create_index, top_k
+
+
+def synthetic_embeddings(n: int, dim: int, topics: int, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors, roughly mimicking topical structure of research profiles"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    labels = rng.integers(0, topics, size=n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def make_queries(embeddings: np.ndarray, count: int, seed: int = 1) -> np.ndarray:
+    """Perturbed corpus vectors used as queries"""
+    rng = np.random.default_rng(seed)
+    queries = embeddings[rng.choice(len(embeddings), size=count)]
+    queries = queries + 0.3 * rng.standard_normal(queries.shape).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def benchmark(index, queries: np.ndarray, truth: list, k: int) -> dict:
+    """Run all queries through an index and compare with exact top-k"""
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        indices, _ = index.search(query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(set(indices.tolist()) & expected)
+
+    latencies = np.array(latencies)
+    return {
+        'recall': hits / (k * len(queries)),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector index backends")
+    parser.add_argument('--embeddings', help="Path to a matrix.npy from an embedding store")
+    parser.add_argument('--profiles', type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument('--dim', type=int, default=384, help="Synthetic embedding dimension")
+    parser.add_argument('--topics', type=int, default=200, help="Synthetic topic clusters")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('-k', type=int, default=50)
+    parser.add_argument('--nlist', type=int, default=0, help="IVF cells (0 = sqrt(n))")
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[4, 8, 16, 32])
+    parser.add_argument('--rerank', type=int, nargs='+', default=[1, 2, 4],
+                        help="Float32 re-rank pool sizes (multiples of k) for quantized indexes")
+    args = parser.parse_args()
+
+    if args.embeddings:
+        embeddings = np.load(args.embeddings, mmap_mode='r')
+    else:
+        embeddings = synthetic_embeddings(args.profiles, args.dim, args.topics)
+    queries = make_queries(embeddings, args.queries)
+
+    print(f"Corpus: {embeddings.shape[0]} x {embeddings.shape[1]}, {len(queries)} queries, k={args.k}")
+    print("-" * 60)
+
+    exact = create_index('exact')
+    exact.build(embeddings)
+    truth = [set(top_k(embeddings @ query, args.k)[0].tolist()) for query in queries]
+    result = benchmark(exact, queries, truth, args.k)
+    print(f"{'exact float32':<16} recall@{args.k}={result['recall']:.3f}  "
+          f"p50={result['p50_ms']:.2f} ms  p95={result['p95_ms']:.2f} ms  "
+          f"memory={embeddings.nbytes / 1e6:.1f} MB")
+
+    ivf = create_index('ivf', nlist=args.nlist)
+    start = time.perf_counter()
+    ivf.build(embeddings)
+    print(f"IVF build: {ivf.nlist} cells in {time.perf_counter() - start:.1f} s")
+
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        result = benchmark(ivf, queries, truth, args.k)
+        print(f"{'ivf nprobe=' + str(nprobe):<16} recall@{args.k}={result['recall']:.3f}  "
+              f"p50={result['p50_ms']:.2f} ms  p95={result['p95_ms']:.2f} ms")
+
+    for kind in ('float16', 'int8'):
+        quantized = create_index(kind)
+        quantized.build(embeddings)
+        for rerank in args.rerank:
+            quantized.rerank = rerank
+            result = benchmark(quantized, queries, truth, args.k)
+            print(f"{kind + ' rerank=' + str(rerank):<16} recall@{args.k}={result['recall']:.3f}  "
+                  f"p50={result['p50_ms']:.2f} ms  p95={result['p95_ms']:.2f} ms  "
+                  f"memory={quantized.codes.nbytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Profile Parser Benchmark
+Measures profile extraction throughput against a snapshot store,
+with no network access, so selector changes can be timed reproducibly.
+"""
+
+import argparse
+import logging
+import time
+import numpy as np
+from hkust_scraper import HKUSTGZScraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profile parsing on stored HTML snapshots")
+    parser.add_argument('--snapshots', required=True, help="Snapshot directory written by the scraper")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over the stored pages")
+    args = parser.parse_args()
+
+    scraper = HKUSTGZScraper(fetch_mode='replay', snapshot_dir=args.snapshots)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    directory_url = scraper.get_faculty_directory_url()
+    pages = [(url, html) for url, html in scraper.snapshots if url != directory_url]
+    if not pages:
+        print(f"No profile snapshots found in {args.snapshots}")
+        return
+
+    size_mb = sum(len(html) for _, html in pages) / 1e6
+    print(f"Snapshots: {len(pages)} pages, {size_mb:.1f} MB of HTML, {args.repeat} passes")
+    print("-" * 60)
+
+    timings = []
+    profiles = 0
+    for _ in range(args.repeat):
+        profiles = 0
+        for url, html in pages:
+            start = time.perf_counter()
+            profile = scraper.parse_faculty_profile(html, url)
+            timings.append((time.perf_counter() - start) * 1000)
+            profiles += bool(profile['name'])
+
+    timings = np.array(timings)
+    total_seconds = timings.sum() / 1000
+    print(f"Profiles extracted per pass: {profiles}/{len(pages)}")
+    print(f"Throughput: {len(timings) / total_seconds:.0f} pages/s")
+    print(f"Per page: mean={timings.mean():.2f} ms  p50={np.percentile(timings, 50):.2f} ms  "
+          f"p95={np.percentile(timings, 95):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
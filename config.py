@@ -1,4 +1,5 @@
 import os
+import hashlib
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,9 +16,34 @@ class Config:
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
     PORT = int(os.getenv('PORT', 5000))
     
+    # Background Jobs
+    MAX_CONCURRENT_JOBS = int(os.getenv('MAX_CONCURRENT_JOBS', 1))
+    JOB_HISTORY = int(os.getenv('JOB_HISTORY', 50))
+    SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+    
     # API Rate Limiting
     REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', 1.0))
     MAX_REQUESTS_PER_MINUTE = int(os.getenv('MAX_REQUESTS_PER_MINUTE', 60))
+    RATE_LIMIT_BURST = float(os.getenv('RATE_LIMIT_BURST', 1))
+    MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))
+    MAX_BACKOFF_SECONDS = float(os.getenv('MAX_BACKOFF_SECONDS', 60.0))
+    LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', 8))  # concurrent match-reason requests
+    # The OpenAI limit is the account's API quota, unrelated to scraping politeness
+    OPENAI_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', 3000))
+    OPENAI_BURST = float(os.getenv('OPENAI_BURST', LLM_CONCURRENCY))
+    
+    # Scraper Configuration ('http' with Selenium fallback, or 'selenium')
+    SCRAPER_FETCH_MODE = os.getenv('SCRAPER_FETCH_MODE', 'http')
+    SCRAPER_CONCURRENCY = int(os.getenv('SCRAPER_CONCURRENCY', 8))
+    SCRAPER_PER_HOST_LIMIT = int(os.getenv('SCRAPER_PER_HOST_LIMIT', 4))
+    SCRAPER_PAGES_PER_SECOND = float(os.getenv('SCRAPER_PAGES_PER_SECOND', MAX_REQUESTS_PER_MINUTE / 60.0))
+    SCRAPER_BROWSER_WORKERS = int(os.getenv('SCRAPER_BROWSER_WORKERS', 2))
+    SCRAPER_DRIVER_MAX_PAGES = int(os.getenv('SCRAPER_DRIVER_MAX_PAGES', 50))
+    SCRAPER_PARSE_WORKERS = int(os.getenv('SCRAPER_PARSE_WORKERS', 0))  # 0 = one per CPU
+    SCRAPER_QUEUE_SIZE = int(os.getenv('SCRAPER_QUEUE_SIZE', 64))
+    CRAWL_CHECKPOINT_FILE = os.getenv('CRAWL_CHECKPOINT_FILE', 'crawl_checkpoint.jsonl')
+    CRAWL_STATE_FILE = os.getenv('CRAWL_STATE_FILE', 'crawl_state.json')
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', '')
     
     # Data Sources Configuration
     USE_GOOGLE_SCHOLAR = os.getenv('USE_GOOGLE_SCHOLAR', 'True').lower() == 'true'
@@ -29,12 +55,60 @@ class Config:
     SEMANTIC_SCHOLAR_API_KEY = os.getenv('SEMANTIC_SCHOLAR_API_KEY', '')
     
     # Model Configuration
+    SENTENCE_MODEL = os.getenv('SENTENCE_MODEL', 'all-MiniLM-L6-v2')
     SIMILARITY_THRESHOLD = float(os.getenv('SIMILARITY_THRESHOLD', 0.7))
     MAX_RESULTS = int(os.getenv('MAX_RESULTS', 50))
+    MATCH_PAGE_SIZE = int(os.getenv('MATCH_PAGE_SIZE', 20))  # /match results per page
+    MATCH_QUERY_BLOCK = int(os.getenv('MATCH_QUERY_BLOCK', 64))  # queries encoded and scored together
+    MAX_BATCH_QUERIES = int(os.getenv('MAX_BATCH_QUERIES', 1000))  # per /match_batch request
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 128))
+    WARMUP_ON_STARTUP = os.getenv('WARMUP_ON_STARTUP', 'True').lower() == 'true'
+    MAX_OPENAI_CLIENTS = int(os.getenv('MAX_OPENAI_CLIENTS', 32))
+    
+    # Multi-Vector Embeddings ('profile' = one vector per profile, 'chunks' = one per
+    # interest, publication and bio window; chunk scores aggregate by 'max' or top-m 'mean')
+    EMBEDDING_MODE = os.getenv('EMBEDDING_MODE', 'profile')
+    CHUNK_WORDS = int(os.getenv('CHUNK_WORDS', 128))
+    CHUNK_AGGREGATION = os.getenv('CHUNK_AGGREGATION', 'max')
+    CHUNK_TOP_M = int(os.getenv('CHUNK_TOP_M', 3))
+    
+    # Vector Index Configuration ('exact', 'ivf', or quantized 'float16' / 'int8')
+    # The quantized backends trade latency for memory; 'exact' is the fastest brute-force option
+    VECTOR_INDEX = os.getenv('VECTOR_INDEX', 'exact')
+    ANN_MIN_PROFILES = int(os.getenv('ANN_MIN_PROFILES', 10000))
+    IVF_NLIST = int(os.getenv('IVF_NLIST', 0))
+    IVF_NPROBE = int(os.getenv('IVF_NPROBE', 16))
+    QUANTIZED_RERANK = int(os.getenv('QUANTIZED_RERANK', 4))  # float32 re-rank pool, in multiples of k
+    
+    # Hybrid Retrieval (BM25 weight in the fused score, 0 disables it)
+    LEXICAL_WEIGHT = float(os.getenv('LEXICAL_WEIGHT', 0.3))
+    LEXICAL_CANDIDATES = int(os.getenv('LEXICAL_CANDIDATES', 200))
+    
+    # /match Result Cache (entries, and TTL in seconds with 0 = no expiry)
+    RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', 256))
+    RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', 3600))
+    
+    # Persistent LLM Response Cache (mode: 'read_write', 'cache_only' or 'off'; TTL 0 = no expiry)
+    LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', 'llm_cache.sqlite3')
+    LLM_CACHE_MODE = os.getenv('LLM_CACHE_MODE', 'read_write')
+    LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', 30 * 24 * 3600))
+    
+    # Shared Corpus (published once per node and memory-mapped by every worker; '' disables it).
+    # The default is keyed by the working directory so separate checkouts on one host don't share it.
+    SHARED_CORPUS_DIR = os.getenv(
+        'SHARED_CORPUS_DIR',
+        f"/dev/shm/faculty-research-agent-{hashlib.sha1(os.getcwd().encode('utf-8')).hexdigest()[:12]}"
+        if os.path.isdir('/dev/shm') else ''
+    )
+    # Job status and the one-crawl-at-a-time guard, shared by the workers on this node ('' = per process)
+    JOB_STORE_PATH = os.getenv(
+        'JOB_STORE_PATH', os.path.join(SHARED_CORPUS_DIR, 'jobs.sqlite3') if SHARED_CORPUS_DIR else ''
+    )
     
     # File paths
     UPLOAD_FOLDER = 'uploads'
     RESULTS_FOLDER = 'results'
     
-    # Supported export formats
-    EXPORT_FORMATS = ['csv', 'json', 'pdf', 'excel'] 
\ No newline at end of file
+    # Supported export formats (parquet needs pyarrow)
+    EXPORT_FORMATS = ['csv', 'ndjson', 'json', 'parquet']
+    EXPORT_CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', 1000))  # rows encoded per streamed chunk 
\ No newline at end of file
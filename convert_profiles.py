@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Profile Store Converter
+Converts faculty_profiles_*.json files into compact profile stores and
+compares load time and memory of the JSON file against the store.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import time
+import tracemalloc
+from profile_store import ProfileStore, store_directory
+
+
+def measure(load):
+    """Run ``load`` and return (result, seconds, MB still allocated by it)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    seconds = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return result, seconds, allocated
+
+
+def load_json(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_store(directory: str) -> ProfileStore:
+    store = ProfileStore(directory)
+    if not store.load():
+        raise SystemExit(f"Could not load profile store {directory}")
+    return store
+
+
+def directory_size(directory: str) -> float:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert faculty profile JSON files into compact profile stores")
+    parser.add_argument('files', nargs='*', help="Profile JSON files (default: faculty_profiles_*.json)")
+    parser.add_argument('--compare', action='store_true', help="Compare load time and memory with the JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    files = args.files or sorted(glob.glob('faculty_profiles_*.json'))
+    if not files:
+        print("No faculty_profiles_*.json files found")
+        return
+
+    for path in files:
+        profiles = load_json(path)
+        start = time.perf_counter()
+        store = ProfileStore.write(profiles, store_directory(path), source_path=path)
+        print(f"{path}: {len(store)} profiles -> {store.directory} "
+              f"({directory_size(store.directory):.1f} MB, {time.perf_counter() - start:.2f} s)")
+        del profiles
+
+        if args.compare:
+            _, json_seconds, json_mb = measure(lambda: load_json(path))
+            _, store_seconds, store_mb = measure(lambda: load_store(store.directory))
+            print(f"  JSON : load {json_seconds * 1000:8.1f} ms, {json_mb:8.1f} MB resident")
+            print(f"  store: load {store_seconds * 1000:8.1f} ms, {store_mb:8.1f} MB resident "
+                  f"(heavy fields memory-mapped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+class CrawlCheckpoint:
+    """Append-only JSONL log with one line per crawled profile URL
+
+    Each line records a URL, its status and (when done) the extracted
+    profile. Writes are O(1) per profile; on restart URLs whose latest
+    record is ``done`` are skipped, and the final profile list is compacted
+    from the log.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = {}
+        self.done = set()
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def open(self, resume: bool = True) -> 'CrawlCheckpoint':
+        """Load an existing log when resuming, otherwise start an empty one"""
+        self.records = self.read_records() if resume else {}
+        self.done = {url for url, record in self.records.items() if record['status'] == STATUS_DONE}
+        if self.records:
+            self.logger.info(f"Resuming crawl from {self.path}: {len(self.done)} profiles already done")
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self._ends_with_torn_line():
+            self._file.write('\n')
+        return self
+
+    def _ends_with_torn_line(self) -> bool:
+        if not os.path.getsize(self.path):
+            return False
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def read_records(self) -> Dict[str, Dict]:
+        """Latest record per URL, in first-seen order; a torn last line is ignored"""
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Skipping unreadable checkpoint line in {self.path}")
+                    continue
+                records[record['url']] = record
+        return records
+
+    def record(self, url: str, status: str, profile: Optional[Dict] = None, **fields):
+        """Append one record and flush it, so a crash loses at most the line being written"""
+        record = {'url': url, 'status': status, 'timestamp': time.time(), **fields}
+        if profile is not None:
+            record['profile'] = profile
+
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.records[url] = record
+            if status == STATUS_DONE:
+                self.done.add(url)
+            else:
+                self.done.discard(url)
+
+    def completed_urls(self) -> set:
+        with self._lock:
+            return set(self.done)
+
+    def pending(self, urls: Iterable[str]) -> List[str]:
+        """URLs that still need to be crawled"""
+        completed = self.completed_urls()
+        return [url for url in urls if url not in completed]
+
+    def compact(self, urls: Iterable[str] = None) -> List[Dict]:
+        """Profiles of completed URLs, in ``urls`` order (or log order)"""
+        urls = self.records.keys() if urls is None else urls
+        profiles = []
+        for url in urls:
+            record = self.records.get(url)
+            if record and record['status'] == STATUS_DONE and record.get('profile'):
+                profiles.append(record['profile'])
+        return profiles
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """Remove the log once a crawl has completed and its results were compacted"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            self.logger.info(f"Crawl complete, removed checkpoint {self.path}")
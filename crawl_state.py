@@ -0,0 +1,66 @@
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+
+def profile_fingerprint(profile: Dict) -> str:
+    """Hash of a profile's extracted fields, used to detect content changes"""
+    return hashlib.sha1(json.dumps(profile, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class CrawlState:
+    """Per-URL HTTP validators and content fingerprints from the last crawl
+
+    Stored as one JSON file mapping each profile URL to its ``etag``,
+    ``last_modified``, ``fingerprint`` and last extracted ``profile``, so a
+    refresh can issue conditional requests and report what changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        self.logger = logging.getLogger(__name__)
+
+    def load(self) -> 'CrawlState':
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error loading crawl state {self.path}: {e}")
+            self.entries = {}
+        return self
+
+    def seed(self, profiles: List[Dict]):
+        """Start from previously scraped profiles when no state has been saved yet"""
+        for profile in profiles:
+            url = profile.get('url')
+            if url and url not in self.entries:
+                self.entries[url] = {
+                    'etag': None,
+                    'last_modified': None,
+                    'fingerprint': profile_fingerprint(profile),
+                    'profile': profile
+                }
+
+    def validators(self, url: str) -> Dict[str, Optional[str]]:
+        entry = self.entries.get(url, {})
+        return {'etag': entry.get('etag'), 'last_modified': entry.get('last_modified')}
+
+    def update(self, url: str, profile: Dict, etag: str = None, last_modified: str = None):
+        self.entries[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'fingerprint': profile_fingerprint(profile),
+            'profile': profile
+        }
+
+    def save(self):
+        """Atomically write the state file"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.logger.info(f"Crawl state saved to {self.path} ({len(self.entries)} profiles)")
@@ -0,0 +1,104 @@
+import queue
+import logging
+import threading
+from typing import Any, Callable, List, Optional
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+class DriverPool:
+    """Pool of browser workers, each reusing its own WebDriver
+
+    Items are spread over ``size`` threads. A worker replaces its driver
+    after ``max_pages_per_driver`` pages, or as soon as the driver raises a
+    ``WebDriverException``, so one crashed browser cannot stall the run. A
+    page that merely times out fails on its own and the driver is kept.
+    Results are returned in input order.
+    """
+
+    def __init__(self, driver_factory: Callable[[], Any], size: int = 2,
+                 max_pages_per_driver: int = 50, max_retries: int = 1):
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_retries = max_retries
+        self.logger = logging.getLogger(__name__)
+
+    def map(self, func: Callable[[Any, Any], Any], items: List[Any],
+            on_result: Callable[[int, Any, Any], None] = None,
+            stop_event: threading.Event = None) -> List[Optional[Any]]:
+        """Apply ``func(driver, item)`` to every item; failed items yield None
+
+        ``on_result(index, item, result)`` is called from the worker thread
+        as each item finishes. Once ``stop_event`` is set, workers finish
+        their current item and skip the rest.
+        """
+        results = [None] * len(items)
+        work = queue.Queue()
+        for index, item in enumerate(items):
+            work.put((index, item))
+
+        workers = [
+            threading.Thread(target=self._work, args=(func, work, results, on_result, stop_event),
+                             name=f"driver-pool-{n}", daemon=True)
+            for n in range(min(self.size, len(items)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return results
+
+    def _work(self, func, work: queue.Queue, results: List, on_result, stop_event: threading.Event):
+        driver = None
+        pages = 0
+
+        try:
+            while not (stop_event and stop_event.is_set()):
+                try:
+                    index, item = work.get_nowait()
+                except queue.Empty:
+                    return
+
+                result = None
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        if driver is None:
+                            driver = self.driver_factory()
+                            pages = 0
+                        result = func(driver, item)
+                        pages += 1
+                        break
+                    except TimeoutException as e:
+                        # A slow page, not a broken browser: relaunching Chrome wouldn't help
+                        self.logger.warning(f"Timed out on {item}: {e}")
+                        pages += 1
+                        break
+                    except WebDriverException as e:
+                        self.logger.warning(f"Driver failed on {item} (attempt {attempt + 1}), recycling: {e}")
+                        self._quit(driver)
+                        driver = None
+                    except Exception as e:
+                        self.logger.error(f"Error processing {item}: {e}")
+                        pages += 1
+                        break
+
+                results[index] = result
+                if on_result:
+                    on_result(index, item, result)
+
+                if driver is not None and pages >= self.max_pages_per_driver:
+                    self.logger.info(f"Recycling driver after {pages} pages")
+                    self._quit(driver)
+                    driver = None
+
+        finally:
+            self._quit(driver)
+
+    def _quit(self, driver):
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error closing driver: {e}")
@@ -0,0 +1,169 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Callable, Optional
+import numpy as np
+
+
+def content_hash(text: str) -> str:
+    """Hash the research text a profile embedding was computed from"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def make_profile_ids(faculty_profiles: List[Dict]) -> List[str]:
+    """Build stable, unique ids for profiles (profile URL, falling back to name)"""
+    ids = []
+    seen = {}
+    for profile in faculty_profiles:
+        base_id = profile.get('url') or profile.get('name') or ''
+        count = seen.get(base_id, 0)
+        seen[base_id] = count + 1
+        ids.append(base_id if count == 0 else f"{base_id}#{count}")
+    return ids
+
+
+class EmbeddingStore:
+    """Memory-mapped float32 embedding matrix stored beside a faculty profiles file
+
+    The store is a directory next to ``faculty_profiles_*.json`` holding
+    ``matrix.npy`` (one row per profile) and ``manifest.json`` (the id and
+    content hash of each row). Rows are only re-embedded when the text they
+    were computed from changes.
+    """
+
+    def __init__(self, profiles_path: str, model_name: str, suffix: str = 'embeddings'):
+        self.model_name = model_name
+        self.directory = f"{os.path.splitext(profiles_path)[0]}.{suffix}"
+        self.matrix_path = os.path.join(self.directory, 'matrix.npy')
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.ids = []
+        self.hashes = []
+        self.version = None
+        self.matrix = None
+        self.logger = logging.getLogger(__name__)
+
+    def load(self) -> bool:
+        """Load the manifest and memory-map the matrix, if a compatible store exists"""
+        try:
+            if not (os.path.exists(self.manifest_path) and os.path.exists(self.matrix_path)):
+                return False
+
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+
+            if manifest.get('model') != self.model_name:
+                self.logger.info(f"Embedding store {self.directory} was built with another model, ignoring it")
+                return False
+
+            # Row count and width must agree with the manifest, or the pair came from different saves
+            matrix = np.load(self.matrix_path, mmap_mode='r')
+            if (matrix.dtype != np.float32 or matrix.ndim != 2 or matrix.shape[0] != len(manifest['ids'])
+                    or len(manifest['hashes']) != len(manifest['ids'])
+                    or matrix.shape[1] != manifest.get('dimension', matrix.shape[1])):
+                self.logger.warning(f"Embedding store {self.directory} is inconsistent, ignoring it")
+                return False
+
+            self.ids = manifest['ids']
+            self.hashes = manifest['hashes']
+            self.version = manifest.get('version')
+            self.matrix = matrix
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error loading embedding store {self.directory}: {e}")
+            return False
+
+    def sync(self, ids: List[str], texts: List[str], encode_fn: Callable[[List[str]], np.ndarray],
+             seed: 'EmbeddingStore' = None) -> np.ndarray:
+        """Return embeddings aligned with ``ids``, encoding only new or changed texts
+
+        A ``seed`` store (e.g. the one beside the previous profiles file) is
+        used as the row cache when this store doesn't exist yet.
+        """
+        hashes = [content_hash(text) for text in texts]
+
+        if self.matrix is None:
+            self.load()
+
+        # Warm cache: nothing changed, serve the memory-mapped matrix as is
+        if self.matrix is not None and ids == self.ids and hashes == self.hashes:
+            return self.matrix
+
+        source = self
+        if self.matrix is None and seed is not None and seed.load():
+            self.logger.info(f"Seeding embedding store {self.directory} from {seed.directory}")
+            source = seed
+
+        cached_rows = {}
+        if source.matrix is not None:
+            cached_rows = {
+                (row_id, row_hash): row
+                for row, (row_id, row_hash) in enumerate(zip(source.ids, source.hashes))
+            }
+
+        reuse_positions, reuse_rows, stale_positions = [], [], []
+        for position, key in enumerate(zip(ids, hashes)):
+            row = cached_rows.get(key)
+            if row is None:
+                stale_positions.append(position)
+            else:
+                reuse_positions.append(position)
+                reuse_rows.append(row)
+
+        new_embeddings = None
+        if stale_positions:
+            self.logger.info(f"Embedding {len(stale_positions)} new or changed profiles "
+                             f"({len(reuse_positions)} reused from {source.directory})")
+            new_embeddings = encode_fn([texts[position] for position in stale_positions])
+
+        dimension = self._dimension(new_embeddings, source)
+        matrix = np.empty((len(ids), dimension), dtype=np.float32)
+        if reuse_positions:
+            matrix[reuse_positions] = source.matrix[reuse_rows]
+        if stale_positions:
+            matrix[stale_positions] = new_embeddings
+
+        self._save(ids, hashes, matrix)
+        return self.matrix
+
+    def _dimension(self, new_embeddings: Optional[np.ndarray], source: 'EmbeddingStore') -> int:
+        if new_embeddings is not None:
+            return new_embeddings.shape[1]
+        if source.matrix is not None:
+            return source.matrix.shape[1]
+        return 0
+
+    def _save(self, ids: List[str], hashes: List[str], matrix: np.ndarray):
+        """Atomically replace the matrix and manifest, then re-map the matrix"""
+        os.makedirs(self.directory, exist_ok=True)
+        version = hashlib.sha1(
+            '\n'.join(f"{row_id}\t{row_hash}" for row_id, row_hash in zip(ids, hashes)).encode('utf-8')
+        ).hexdigest()
+
+        # Drop the old mapping before replacing the file underneath it
+        self.matrix = None
+
+        # Per-writer tmp names, so workers saving at once never write into each other's files
+        writer = f"{os.getpid()}.{threading.get_ident()}"
+        matrix_tmp = f"{self.matrix_path}.{writer}.tmp.npy"
+        np.save(matrix_tmp, matrix)
+        os.replace(matrix_tmp, self.matrix_path)
+
+        manifest_tmp = f"{self.manifest_path}.{writer}.tmp"
+        with open(manifest_tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'model': self.model_name,
+                'dimension': int(matrix.shape[1]),
+                'version': version,
+                'ids': ids,
+                'hashes': hashes
+            }, f)
+        os.replace(manifest_tmp, self.manifest_path)
+
+        self.ids = list(ids)
+        self.hashes = list(hashes)
+        self.version = version
+        self.matrix = np.load(self.matrix_path, mmap_mode='r')
+        self.logger.info(f"Embedding store saved to {self.directory} ({len(ids)} profiles)")
@@ -0,0 +1,191 @@
+import io
+import csv
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+    'parquet': 'application/vnd.apache.parquet'
+}
+MATCH_FIELDS = ['rank', 'name', 'title', 'department', 'email', 'similarity_score', 'match_reasons',
+                'research_interests', 'profile_url', 'google_scholar', 'research_gate']
+LIST_FIELDS = ('research_interests', 'publications', 'match_reasons')
+INTEGER_FIELDS = ('rank',)
+FLOAT_FIELDS = ('similarity_score', 'lexical_score')
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def match_rows(matches: Iterable[Dict]) -> Iterator[Dict]:
+    """Export rows for matcher results (dicts holding a ``faculty_profile``), in rank order"""
+    for rank, match in enumerate(matches, 1):
+        profile = match['faculty_profile']
+        yield {
+            'rank': rank,
+            'name': profile.get('name', ''),
+            'title': profile.get('title', ''),
+            'department': profile.get('department', ''),
+            'email': profile.get('email', ''),
+            'similarity_score': match['similarity_score'],
+            'match_reasons': match['match_reasons'],
+            'research_interests': profile.get('research_interests', []),
+            'profile_url': profile.get('url', ''),
+            'google_scholar': profile.get('google_scholar', ''),
+            'research_gate': profile.get('research_gate', '')
+        }
+
+
+def profile_fields(faculty_profiles: Iterable[Dict]) -> List[str]:
+    """Field names of a profile list in first-seen order (a profile store already knows them)"""
+    fields = getattr(faculty_profiles, 'fields', None)
+    if fields is not None:
+        return list(fields)
+
+    fields = {}
+    for profile in faculty_profiles:
+        fields.update(dict.fromkeys(profile))
+    return list(fields)
+
+
+def export_stream(rows: Iterable[Dict], fields: List[str], format_type: str,
+                  chunk_rows: int = 1000) -> Iterator[bytes]:
+    """Encode rows as ``format_type``, yielding one chunk per ``chunk_rows`` rows
+
+    Only one chunk of rows is held at a time, so exports of any size run in
+    constant memory and can be streamed straight into a response.
+    """
+    writers = {'csv': iter_csv, 'ndjson': iter_ndjson, 'json': iter_json, 'parquet': iter_parquet}
+    if format_type not in writers:
+        raise ValueError(f"Unsupported format: {format_type}")
+    return writers[format_type](rows, fields, max(1, chunk_rows))
+
+
+def iter_chunks(rows: Iterable[Dict], chunk_rows: int) -> Iterator[List[Dict]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def csv_value(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return '; '.join(str(item) for item in value)
+    return value
+
+
+def iter_csv(rows: Iterable[Dict], fields: List[str], chunk_rows: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for chunk in iter_chunks(rows, chunk_rows):
+        writer.writerows([csv_value(row.get(field)) for field in fields] for row in chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_ndjson(rows: Iterable[Dict], fields: List[str], chunk_rows: int) -> Iterator[bytes]:
+    for chunk in iter_chunks(rows, chunk_rows):
+        yield ''.join(
+            json.dumps({field: row.get(field) for field in fields}, ensure_ascii=False) + '\n' for row in chunk
+        ).encode('utf-8')
+
+
+def iter_json(rows: Iterable[Dict], fields: List[str], chunk_rows: int) -> Iterator[bytes]:
+    """A JSON array written incrementally, one element per line"""
+    separator = '[\n'
+    for chunk in iter_chunks(rows, chunk_rows):
+        parts = []
+        for row in chunk:
+            parts.append(separator + json.dumps({field: row.get(field) for field in fields}, ensure_ascii=False))
+            separator = ',\n'
+        yield ''.join(parts).encode('utf-8')
+    yield b'[]\n' if separator == '[\n' else b'\n]\n'
+
+
+class _ChunkSink:
+    """Write-only file object that hands the bytes written so far back to a generator"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def parquet_schema(fields: List[str]):
+    def field_type(field):
+        if field in LIST_FIELDS:
+            return pa.list_(pa.string())
+        if field in INTEGER_FIELDS:
+            return pa.int64()
+        if field in FLOAT_FIELDS:
+            return pa.float64()
+        return pa.string()
+    return pa.schema([(field, field_type(field)) for field in fields])
+
+
+def parquet_value(field: str, value):
+    if value is None:
+        return None
+    if field in LIST_FIELDS:
+        return [str(item) for item in value] if isinstance(value, (list, tuple)) else [str(value)]
+    if field in INTEGER_FIELDS or field in FLOAT_FIELDS:
+        return value
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def iter_parquet(rows: Iterable[Dict], fields: List[str], chunk_rows: int) -> Iterator[bytes]:
+    """Parquet with one row group per chunk (requires pyarrow)"""
+    if pa is None:
+        raise ValueError("Parquet export requires pyarrow")
+
+    schema = parquet_schema(fields)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in iter_chunks(rows, chunk_rows):
+            table = pa.Table.from_pylist(
+                [{field: parquet_value(field, row.get(field)) for field in fields} for row in chunk], schema=schema
+            )
+            writer.write_table(table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
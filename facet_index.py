@@ -0,0 +1,116 @@
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import numpy as np
+
+VALUE_FACETS = ('department', 'title')
+# Boolean facets: whether the profile has a non-empty value for the field
+FLAG_FACETS = {'has_google_scholar': 'google_scholar', 'has_research_gate': 'research_gate'}
+FACETS = VALUE_FACETS + tuple(FLAG_FACETS)
+
+
+def facet_value(text) -> str:
+    """Facet key of a field value: surrounding and repeated whitespace doesn't matter"""
+    return ' '.join(str(text).split())
+
+
+def normalize_filters(filters: Dict) -> Tuple:
+    """Canonical, hashable form of a filter dict, e.g. ``{'department': ['A', 'B'], 'has_google_scholar': True}``
+
+    Value facets take a string or a list of strings (any of them matches);
+    flag facets take a boolean. Raises ``ValueError`` for unknown facets or
+    malformed values.
+    """
+    if not filters:
+        return ()
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be an object mapping facet names to values")
+
+    normalized = []
+    for facet, value in filters.items():
+        if facet in FLAG_FACETS:
+            if isinstance(value, str) and value.lower() in ('true', 'false'):
+                value = value.lower() == 'true'
+            if not isinstance(value, bool):
+                raise ValueError(f"Filter {facet} must be true or false")
+            normalized.append((facet, (value,)))
+        elif facet in VALUE_FACETS:
+            values = [value] if isinstance(value, str) else value
+            if not isinstance(values, list) or not all(isinstance(item, str) for item in values):
+                raise ValueError(f"Filter {facet} must be a string or a list of strings")
+            values = tuple(sorted({facet_value(item) for item in values}))
+            if values:
+                normalized.append((facet, values))
+        else:
+            raise ValueError(f"Unknown filter: {facet}")
+    return tuple(sorted(normalized))
+
+
+class FacetIndex:
+    """Posting lists of corpus rows per facet value, built once when the corpus loads
+
+    Each posting list is a sorted NumPy array of row ids, so a filter is a
+    union of lists within a facet and an intersection across facets, and
+    costs time proportional to the rows involved rather than the corpus.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.size = 0
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self):
+        return self.size
+
+    def build(self, faculty_profiles: List[Dict]) -> 'FacetIndex':
+        rows_by_value = {facet: defaultdict(list) for facet in FACETS}
+        for row, profile in enumerate(faculty_profiles):
+            for facet in VALUE_FACETS:
+                value = facet_value(profile.get(facet) or '')
+                if value:
+                    rows_by_value[facet][value].append(row)
+            for facet, field in FLAG_FACETS.items():
+                rows_by_value[facet][bool(profile.get(field))].append(row)
+
+        self.postings = {
+            facet: {value: np.array(rows, dtype=np.int64) for value, rows in values.items()}
+            for facet, values in rows_by_value.items()
+        }
+        self.size = len(faculty_profiles)
+        self.logger.info(
+            f"Built facet index over {self.size} profiles "
+            f"({len(self.postings['department'])} departments, {len(self.postings['title'])} titles)"
+        )
+        return self
+
+    def select(self, filters: Tuple) -> np.ndarray:
+        """Sorted rows matching normalized ``filters`` (see ``normalize_filters``)"""
+        rows = None
+        # Intersect the smallest facets first so the working set shrinks fastest
+        matches = sorted(
+            (self._union(facet, values) for facet, values in filters), key=len
+        )
+        for facet_rows in matches:
+            rows = facet_rows if rows is None else np.intersect1d(rows, facet_rows, assume_unique=True)
+            if len(rows) == 0:
+                break
+        return np.arange(self.size, dtype=np.int64) if rows is None else rows
+
+    def _union(self, facet: str, values: Tuple) -> np.ndarray:
+        lists = [self.postings[facet][value] for value in values if value in self.postings[facet]]
+        if not lists:
+            return np.zeros(0, dtype=np.int64)
+        return lists[0] if len(lists) == 1 else np.unique(np.concatenate(lists))
+
+    def counts(self, rows: np.ndarray = None) -> Dict[str, List[Dict]]:
+        """Per facet, its values with profile counts (most common first), optionally within ``rows``"""
+        counts = {}
+        for facet, values in self.postings.items():
+            entries = []
+            for value, value_rows in values.items():
+                count = len(value_rows) if rows is None else len(np.intersect1d(value_rows, rows, assume_unique=True))
+                if count:
+                    entries.append({'value': value, 'count': int(count)})
+            entries.sort(key=lambda entry: (-entry['count'], str(entry['value'])))
+            counts[facet] = entries
+        return counts
@@ -1,7 +1,9 @@
-import time
 import json
+import time
 import logging
+import threading
 from typing import List, Dict, Optional
+from urllib.parse import urljoin
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,18 +15,56 @@ from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import requests
 from fake_useragent import UserAgent
-from retrying import retry
+from config import Config
+from http_fetcher import HTTPFetcher
+from rate_limiter import get_rate_limiter, host_key
+from driver_pool import DriverPool
+from crawl_checkpoint import CrawlCheckpoint, STATUS_DONE, STATUS_FAILED
+from crawl_state import CrawlState, profile_fingerprint
+from snapshot_store import SnapshotStore
+from profile_extractor import empty_profile, extract_profile
+from scrape_pipeline import ScrapePipeline
 
 class HKUSTGZScraper:
     """Scraper for HKUST-GZ faculty directory"""
     
-    def __init__(self, headless: bool = True, delay: float = 2.0):
+    FACULTY_LINK_SELECTORS = [
+        "a[href*='faculty']",
+        "a[href*='profile']", 
+        ".faculty-member a",
+        ".faculty-card a",
+        ".member a",
+        "a[href*='staff']"
+    ]
+    
+    def __init__(self, headless: bool = True, delay: float = None, fetch_mode: str = None,
+                 concurrency: int = None, pages_per_second: float = None, snapshot_dir: str = None,
+                 progress_callback=None, cancel_event: threading.Event = None):
+        self.config = Config()
         self.headless = headless
         self.delay = delay
+        self.fetch_mode = fetch_mode or self.config.SCRAPER_FETCH_MODE
+        self.concurrency = concurrency or self.config.SCRAPER_CONCURRENCY
+        self.browser_workers = self.config.SCRAPER_BROWSER_WORKERS
+        self.checkpoint_path = self.config.CRAWL_CHECKPOINT_FILE
+        self.state_path = self.config.CRAWL_STATE_FILE
+        snapshot_dir = snapshot_dir or self.config.SNAPSHOT_DIR
+        self.snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.progress = {'done': 0, 'failed': 0, 'total': 0}
+        self._progress_lock = threading.Lock()
         self.driver = None
         self.ua = UserAgent()
         self.setup_logging()
         
+        # A delay is the minimum spacing between requests, otherwise use the configured rate
+        if not pages_per_second:
+            pages_per_second = 1.0 / delay if delay else self.config.SCRAPER_PAGES_PER_SECOND
+        self.pages_per_second = pages_per_second
+        self.rate_limiter = get_rate_limiter()
+        self.rate_limiter.configure(host_key(self.get_faculty_directory_url()), pages_per_second)
+        
     def setup_logging(self):
         """Setup logging configuration"""
         logging.basicConfig(
@@ -38,7 +78,11 @@ class HKUSTGZScraper:
         self.logger = logging.getLogger(__name__)
     
     def setup_driver(self):
-        """Setup Chrome WebDriver with appropriate options"""
+        """Setup the Chrome WebDriver used for the directory listing"""
+        self.driver = self.create_driver()
+    
+    def create_driver(self) -> webdriver.Chrome:
+        """Create a Chrome WebDriver with appropriate options"""
         chrome_options = Options()
         
         if self.headless:
@@ -58,13 +102,15 @@ class HKUSTGZScraper:
         chrome_options.add_experimental_option("prefs", prefs)
         
         service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(10)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.implicitly_wait(10)
+        return driver
         
     def close_driver(self):
         """Close the WebDriver"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
     
     def get_faculty_directory_url(self) -> str:
         """Get the main faculty directory URL for HKUST-GZ"""
@@ -78,25 +124,17 @@ class HKUSTGZScraper:
             directory_url = self.get_faculty_directory_url()
             self.logger.info(f"Accessing faculty directory: {directory_url}")
             
+            self.rate_limiter.acquire(host_key(directory_url))
             self.driver.get(directory_url)
-            time.sleep(self.delay)
             
             # Wait for the page to load
             WebDriverWait(self.driver, 20).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
+            self.capture(directory_url, self.driver.page_source)
             
             # Look for faculty profile links
-            selectors = [
-                "a[href*='faculty']",
-                "a[href*='profile']", 
-                ".faculty-member a",
-                ".faculty-card a",
-                ".member a",
-                "a[href*='staff']"
-            ]
-            
-            for selector in selectors:
+            for selector in self.FACULTY_LINK_SELECTORS:
                 try:
                     links = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     for link in links:
@@ -117,158 +155,54 @@ class HKUSTGZScraper:
             
         return faculty_links
     
+    def get_faculty_links_http(self, fetcher: HTTPFetcher) -> List[str]:
+        """Extract faculty profile links from the directory page without a browser"""
+        faculty_links = []
+        
+        directory_url = self.get_faculty_directory_url()
+        self.logger.info(f"Fetching faculty directory over HTTP: {directory_url}")
+        html = fetcher.fetch(directory_url)
+        if not html:
+            return faculty_links
+        self.capture(directory_url, html)
+        
+        faculty_links = self.parse_faculty_links(html, directory_url)
+        self.logger.info(f"Found {len(faculty_links)} unique faculty links over HTTP")
+        return faculty_links
+    
+    def parse_faculty_links(self, html: str, directory_url: str) -> List[str]:
+        """Extract faculty profile links from directory page HTML, in page order"""
+        faculty_links = []
+        soup = BeautifulSoup(html, 'html.parser')
+        for selector in self.FACULTY_LINK_SELECTORS:
+            for link in soup.select(selector):
+                href = urljoin(directory_url, link.get('href', ''))
+                if href and 'faculty' in href.lower():
+                    faculty_links.append(href)
+        
+        # Remove duplicates, keeping page order
+        return list(dict.fromkeys(faculty_links))
+    
+    def capture(self, url: str, html: str):
+        """Keep a snapshot of a fetched page's raw HTML, when snapshots are enabled"""
+        if self.snapshots is None or not html:
+            return
+        try:
+            self.snapshots.put(url, html)
+        except Exception as e:
+            self.logger.warning(f"Error saving snapshot of {url}: {e}")
+    
+    def empty_profile(self, profile_url: str) -> Dict:
+        """Create a profile record with every field blank"""
+        return empty_profile(profile_url)
+    
     def extract_faculty_profile(self, profile_url: str) -> Dict:
         """Extract detailed information from a faculty profile page"""
-        profile_data = {
-            'url': profile_url,
-            'name': '',
-            'title': '',
-            'department': '',
-            'research_interests': [],
-            'publications': [],
-            'education': '',
-            'bio': '',
-            'email': '',
-            'phone': '',
-            'office': '',
-            'website': '',
-            'google_scholar': '',
-            'research_gate': '',
-            'linkedin': ''
-        }
+        profile_data = self.empty_profile(profile_url)
         
         try:
             self.logger.info(f"Extracting profile from: {profile_url}")
-            self.driver.get(profile_url)
-            time.sleep(self.delay)
-            
-            # Wait for page to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Extract name
-            name_selectors = [
-                'h1', 'h2', '.name', '.faculty-name', '.profile-name',
-                '[class*="name"]', '[id*="name"]'
-            ]
-            for selector in name_selectors:
-                try:
-                    name_elem = soup.select_one(selector)
-                    if name_elem and name_elem.get_text().strip():
-                        profile_data['name'] = name_elem.get_text().strip()
-                        break
-                except:
-                    continue
-            
-            # Extract title/position
-            title_selectors = [
-                '.title', '.position', '.rank', '.designation',
-                '[class*="title"]', '[class*="position"]'
-            ]
-            for selector in title_selectors:
-                try:
-                    title_elem = soup.select_one(selector)
-                    if title_elem and title_elem.get_text().strip():
-                        profile_data['title'] = title_elem.get_text().strip()
-                        break
-                except:
-                    continue
-            
-            # Extract department
-            dept_selectors = [
-                '.department', '.school', '.faculty', '.division',
-                '[class*="department"]', '[class*="school"]'
-            ]
-            for selector in dept_selectors:
-                try:
-                    dept_elem = soup.select_one(selector)
-                    if dept_elem and dept_elem.get_text().strip():
-                        profile_data['department'] = dept_elem.get_text().strip()
-                        break
-                except:
-                    continue
-            
-            # Extract research interests
-            research_selectors = [
-                '.research-interests', '.research-areas', '.interests',
-                '[class*="research"]', '[class*="interest"]'
-            ]
-            for selector in research_selectors:
-                try:
-                    research_elem = soup.select_one(selector)
-                    if research_elem:
-                        interests_text = research_elem.get_text().strip()
-                        # Split by common delimiters
-                        interests = [interest.strip() for interest in 
-                                   interests_text.replace(',', ';').split(';') 
-                                   if interest.strip()]
-                        profile_data['research_interests'] = interests
-                        break
-                except:
-                    continue
-            
-            # Extract publications
-            pub_selectors = [
-                '.publications', '.papers', '.research-output',
-                '[class*="publication"]', '[class*="paper"]'
-            ]
-            for selector in pub_selectors:
-                try:
-                    pub_elements = soup.select(selector)
-                    publications = []
-                    for elem in pub_elements:
-                        pub_text = elem.get_text().strip()
-                        if pub_text and len(pub_text) > 10:  # Minimum length for a publication
-                            publications.append(pub_text)
-                    profile_data['publications'] = publications
-                    break
-                except:
-                    continue
-            
-            # Extract contact information
-            email_selectors = ['a[href^="mailto:"]', '.email', '[class*="email"]']
-            for selector in email_selectors:
-                try:
-                    email_elem = soup.select_one(selector)
-                    if email_elem:
-                        email = email_elem.get('href', '').replace('mailto:', '') or email_elem.get_text().strip()
-                        if '@' in email:
-                            profile_data['email'] = email
-                            break
-                except:
-                    continue
-            
-            # Extract bio
-            bio_selectors = [
-                '.bio', '.biography', '.about', '.description',
-                '[class*="bio"]', '[class*="about"]'
-            ]
-            for selector in bio_selectors:
-                try:
-                    bio_elem = soup.select_one(selector)
-                    if bio_elem and bio_elem.get_text().strip():
-                        profile_data['bio'] = bio_elem.get_text().strip()
-                        break
-                except:
-                    continue
-            
-            # Extract social/ academic links
-            links = soup.find_all('a', href=True)
-            for link in links:
-                href = link.get('href', '').lower()
-                if 'scholar.google.com' in href:
-                    profile_data['google_scholar'] = link.get('href')
-                elif 'researchgate.net' in href:
-                    profile_data['research_gate'] = link.get('href')
-                elif 'linkedin.com' in href:
-                    profile_data['linkedin'] = link.get('href')
-                elif 'http' in href and not any(x in href for x in ['scholar.google.com', 'researchgate.net', 'linkedin.com']):
-                    profile_data['website'] = link.get('href')
-            
+            profile_data = self.parse_faculty_profile(self.render_page(self.driver, profile_url), profile_url)
             self.logger.info(f"Successfully extracted profile for: {profile_data['name']}")
             
         except Exception as e:
@@ -276,9 +210,124 @@ class HKUSTGZScraper:
         
         return profile_data
     
-    def scrape_all_faculty(self) -> List[Dict]:
-        """Scrape all faculty profiles from HKUST-GZ"""
+    def render_page(self, driver: webdriver.Chrome, url: str) -> str:
+        """Load a page in a browser and return the rendered HTML"""
+        self.rate_limiter.acquire(host_key(url))
+        driver.get(url)
+        
+        # Wait for page to load
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+        html = driver.page_source
+        self.capture(url, html)
+        return html
+    
+    def render_profiles(self, profile_urls: List[str], on_result=None) -> List[Optional[Dict]]:
+        """Render and parse profiles in parallel on a pool of browsers, in input order"""
+        pool = DriverPool(
+            self.create_driver,
+            size=self.browser_workers,
+            max_pages_per_driver=self.config.SCRAPER_DRIVER_MAX_PAGES
+        )
+        
+        def render_profile(driver, profile_url):
+            self.logger.info(f"Rendering profile: {profile_url}")
+            return self.parse_faculty_profile(self.render_page(driver, profile_url), profile_url)
+        
+        return pool.map(render_profile, profile_urls, on_result=on_result, stop_event=self.cancel_event)
+    
+    def parse_faculty_profile(self, html: str, profile_url: str) -> Dict:
+        """Parse a faculty profile page's HTML into a profile record"""
+        try:
+            return extract_profile(html, profile_url)
+        except Exception as e:
+            self.logger.error(f"Error parsing profile from {profile_url}: {e}")
+            return self.empty_profile(profile_url)
+    
+    def create_pipeline(self, fetch) -> ScrapePipeline:
+        """Create the fetch -> parse -> persist pipeline, parsing on a process pool"""
+        return ScrapePipeline(
+            fetch,
+            fetch_workers=self.concurrency,
+            parse_workers=self.config.SCRAPER_PARSE_WORKERS,
+            queue_size=self.config.SCRAPER_QUEUE_SIZE
+        )
+    
+    def create_http_fetcher(self) -> HTTPFetcher:
+        """Create the pooled HTTP fetcher used by the 'http' fetch mode"""
+        return HTTPFetcher(
+            max_workers=self.concurrency,
+            per_host_limit=self.config.SCRAPER_PER_HOST_LIMIT,
+            user_agent=self.ua.random,
+            rate_limiter=self.rate_limiter
+        )
+    
+    def open_checkpoint(self, resume: bool = True) -> CrawlCheckpoint:
+        """Open the crawl checkpoint log, resuming a previous crawl if one was interrupted"""
+        return CrawlCheckpoint(self.checkpoint_path).open(resume=resume)
+    
+    def record_profile(self, checkpoint: CrawlCheckpoint, profile_url: str, profile_data: Optional[Dict]):
+        """Append a profile result to the checkpoint log and report progress"""
+        scraped = bool(profile_data and profile_data['name'])
+        if scraped:
+            checkpoint.record(profile_url, STATUS_DONE, profile_data)
+            self.logger.info(f"Scraped profile {len(checkpoint.completed_urls())}: {profile_data['name']}")
+        else:
+            checkpoint.record(profile_url, STATUS_FAILED)
+        self.advance_progress(profile_url, profile_data)
+    
+    def advance_progress(self, profile_url: str, profile_data: Optional[Dict]):
+        """Count one profile as done or failed and report progress"""
+        scraped = bool(profile_data and profile_data['name'])
+        with self._progress_lock:
+            self.progress['done' if scraped else 'failed'] += 1
+            progress = dict(self.progress)
+        self.report_progress(stage='profiles', url=profile_url,
+                             name=profile_data['name'] if scraped else '', **progress)
+    
+    def start_progress(self, total: int, done: int = 0):
+        """Reset the profile counters for a crawl of ``total`` profiles, ``done`` of them already scraped"""
+        with self._progress_lock:
+            self.progress = {'done': done, 'failed': 0, 'total': total}
+            progress = dict(self.progress)
+        self.report_progress(stage='profiles', **progress)
+    
+    def report_progress(self, **progress):
+        """Send a progress update to the caller's callback, if any"""
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(progress)
+        except Exception as e:
+            self.logger.warning(f"Progress callback failed: {e}")
+    
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
+    def finish_crawl(self, checkpoint: CrawlCheckpoint, faculty_links: List[str]) -> List[Dict]:
+        """Compact the crawled profiles; the checkpoint is kept when the crawl was cancelled"""
+        profiles = checkpoint.compact(faculty_links)
+        if self.cancelled():
+            self.logger.info(f"Crawl cancelled with {len(profiles)} profiles, progress kept in {checkpoint.path}")
+            return profiles
+        checkpoint.finish()
+        self.logger.info(f"Successfully scraped {len(profiles)} faculty profiles")
+        return profiles
+    
+    def scrape_all_faculty(self, resume: bool = True) -> List[Dict]:
+        """Scrape all faculty profiles from HKUST-GZ
+        
+        Progress is appended to the checkpoint log as profiles complete; with
+        ``resume`` an interrupted crawl skips the profiles it already has.
+        """
+        if self.fetch_mode == 'http':
+            return self.scrape_all_faculty_http(resume=resume)
+        if self.fetch_mode == 'replay':
+            return self.replay_snapshots()
+        
         all_profiles = []
+        checkpoint = self.open_checkpoint(resume)
         
         try:
             self.setup_driver()
@@ -289,36 +338,213 @@ class HKUSTGZScraper:
                 # You might need to implement alternative scraping methods here
                 return all_profiles
             
-            self.logger.info(f"Starting to scrape {len(faculty_links)} faculty profiles")
+            # The listing browser is no longer needed once the pool takes over
+            self.close_driver()
+            pending_links = checkpoint.pending(faculty_links)
+            self.logger.info(f"Starting to scrape {len(pending_links)} of {len(faculty_links)} faculty profiles "
+                             f"with {self.browser_workers} browsers")
+            self.start_progress(len(faculty_links), len(faculty_links) - len(pending_links))
             
-            for i, link in enumerate(faculty_links, 1):
-                try:
-                    self.logger.info(f"Scraping profile {i}/{len(faculty_links)}")
-                    profile_data = self.extract_faculty_profile(link)
-                    
-                    if profile_data['name']:  # Only add if we got some data
-                        all_profiles.append(profile_data)
-                    
-                    # Save progress periodically
-                    if i % 5 == 0:
-                        self.save_progress(all_profiles, f"progress_{i}.json")
-                    
-                    time.sleep(self.delay)  # Be respectful to the server
-                    
-                except Exception as e:
-                    self.logger.error(f"Error scraping profile {link}: {e}")
-                    continue
+            self.render_profiles(
+                pending_links,
+                on_result=lambda index, link, profile_data: self.record_profile(checkpoint, link, profile_data)
+            )
             
-            self.logger.info(f"Successfully scraped {len(all_profiles)} faculty profiles")
+            all_profiles = self.finish_crawl(checkpoint, faculty_links)
             
         except Exception as e:
             self.logger.error(f"Error in scrape_all_faculty: {e}")
+            all_profiles = checkpoint.compact()
         
         finally:
+            checkpoint.close()
             self.close_driver()
         
         return all_profiles
     
+    def scrape_all_faculty_http(self, resume: bool = True) -> List[Dict]:
+        """Scrape all faculty profiles over pooled HTTP, using Selenium only for pages that need JS"""
+        profiles = []
+        browser_links = []
+        fetcher = self.create_http_fetcher()
+        checkpoint = self.open_checkpoint(resume)
+        
+        try:
+            faculty_links = self.get_faculty_links_http(fetcher)
+            if not faculty_links:
+                self.logger.info("No links in static directory HTML, falling back to Selenium for the listing")
+                self.setup_driver()
+                faculty_links = self.get_faculty_links()
+            
+            pending_links = checkpoint.pending(faculty_links)
+            self.logger.info(f"Starting to fetch {len(pending_links)} of {len(faculty_links)} "
+                             f"faculty profiles over HTTP")
+            self.start_progress(len(faculty_links), len(faculty_links) - len(pending_links))
+            
+            for link, html, profile_data in self.create_pipeline(fetcher.fetch).run(pending_links):
+                if self.cancelled():
+                    break
+                self.capture(link, html)
+                
+                # A page without a name in its static HTML is most likely rendered client-side
+                if profile_data and profile_data['name']:
+                    self.record_profile(checkpoint, link, profile_data)
+                else:
+                    browser_links.append(link)
+            
+            if browser_links and not self.cancelled():
+                self.logger.info(f"Rendering {len(browser_links)} profiles with Selenium")
+                self.close_driver()
+                self.render_profiles(
+                    browser_links,
+                    on_result=lambda index, link, profile_data: self.record_profile(checkpoint, link, profile_data)
+                )
+            
+            profiles = self.finish_crawl(checkpoint, faculty_links)
+            
+        except Exception as e:
+            self.logger.error(f"Error in scrape_all_faculty_http: {e}")
+            profiles = checkpoint.compact()
+        
+        finally:
+            checkpoint.close()
+            fetcher.close()
+            self.close_driver()
+        
+        return profiles
+    
+    def refresh_faculty(self, previous_profiles: List[Dict] = None) -> Dict:
+        """Re-crawl only what changed since the last refresh
+        
+        Profile pages are requested with the ETag/Last-Modified validators
+        saved by the previous refresh; 304 responses reuse the stored profile.
+        Other pages are parsed and compared by content fingerprint. Returns the
+        refreshed ``profiles`` in directory order plus the ``added``,
+        ``changed``, ``removed`` and ``unchanged`` profile URLs.
+        """
+        state = CrawlState(self.state_path).load()
+        state.seed(previous_profiles or [])
+        report = {'profiles': [], 'added': [], 'changed': [], 'removed': [], 'unchanged': []}
+        fetched = {}
+        browser_links = []
+        fetcher = self.create_http_fetcher()
+        
+        try:
+            faculty_links = self.get_faculty_links_http(fetcher)
+            if not faculty_links:
+                self.setup_driver()
+                faculty_links = self.get_faculty_links()
+                self.close_driver()
+            
+            if not faculty_links:
+                # Keep the previous state rather than reporting every profile as removed
+                self.logger.warning("No faculty links found, refresh aborted")
+                return report
+            
+            pages = [(link, state.validators(link)) for link in faculty_links]
+            not_modified = 0
+            self.start_progress(len(faculty_links))
+            for link, result in fetcher.fetch_many_conditional(pages):
+                if self.cancelled():
+                    break
+                if result['status'] == 304 and link in state.entries:
+                    fetched[link] = (state.entries[link]['profile'], result)
+                    not_modified += 1
+                    self.advance_progress(link, fetched[link][0])
+                    continue
+                
+                self.capture(link, result['html'])
+                profile_data = self.parse_faculty_profile(result['html'], link) if result['html'] else None
+                if profile_data and profile_data['name']:
+                    fetched[link] = (profile_data, result)
+                    self.advance_progress(link, profile_data)
+                else:
+                    browser_links.append(link)
+            
+            self.logger.info(f"Refresh: {not_modified} profiles not modified, "
+                             f"{len(browser_links)} need a browser")
+            
+            if browser_links and not self.cancelled():
+                def on_result(index, link, profile_data):
+                    if profile_data and profile_data['name']:
+                        fetched[link] = (profile_data, {'etag': None, 'last_modified': None})
+                    self.advance_progress(link, profile_data)
+                
+                self.render_profiles(browser_links, on_result=on_result)
+            
+            if self.cancelled():
+                # Leave the saved state alone so the next refresh compares against the last complete one
+                self.logger.info(f"Refresh cancelled after {len(fetched)} of {len(faculty_links)} profiles")
+                return report
+            
+            for link in faculty_links:
+                if link not in fetched:
+                    # Fetch failed: keep the last known profile rather than dropping it
+                    if link in state.entries:
+                        report['unchanged'].append(link)
+                        report['profiles'].append(state.entries[link]['profile'])
+                    continue
+                
+                profile_data, result = fetched[link]
+                previous = state.entries.get(link)
+                if previous is None:
+                    report['added'].append(link)
+                elif previous['fingerprint'] != profile_fingerprint(profile_data):
+                    report['changed'].append(link)
+                else:
+                    report['unchanged'].append(link)
+                
+                state.update(link, profile_data, result['etag'], result['last_modified'])
+                report['profiles'].append(profile_data)
+            
+            current_links = set(faculty_links)
+            report['removed'] = [url for url in state.entries if url not in current_links]
+            for url in report['removed']:
+                del state.entries[url]
+            
+            state.save()
+            self.logger.info(f"Refresh complete: {len(report['added'])} added, {len(report['changed'])} changed, "
+                             f"{len(report['removed'])} removed, {len(report['unchanged'])} unchanged")
+            
+        except Exception as e:
+            self.logger.error(f"Error in refresh_faculty: {e}")
+        
+        finally:
+            fetcher.close()
+            self.close_driver()
+        
+        return report
+    
+    def replay_snapshots(self, profile_urls: List[str] = None) -> List[Dict]:
+        """Run the extraction pipeline against stored snapshots, without any network access
+        
+        Profile URLs come from the stored directory page when there is one,
+        otherwise every stored page except the directory is parsed.
+        """
+        if self.snapshots is None:
+            self.logger.error("Replay requested but no snapshot directory is configured")
+            return []
+        
+        directory_url = self.get_faculty_directory_url()
+        if profile_urls is None:
+            directory_html = self.snapshots.get(directory_url)
+            if directory_html:
+                profile_urls = self.parse_faculty_links(directory_html, directory_url)
+            else:
+                profile_urls = [url for url in self.snapshots.load_index() if url != directory_url]
+        
+        start = time.perf_counter()
+        parsed = {}
+        for profile_url, html, profile_data in self.create_pipeline(self.snapshots.get).run(profile_urls):
+            if profile_data and profile_data['name']:
+                parsed[profile_url] = profile_data
+        profiles = [parsed[url] for url in profile_urls if url in parsed]
+        
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"Replayed {len(profile_urls)} snapshots into {len(profiles)} profiles "
+                         f"in {elapsed:.2f}s ({len(profile_urls) / max(elapsed, 1e-9):.0f} pages/s)")
+        return profiles
+    
     def save_progress(self, profiles: List[Dict], filename: str):
         """Save scraped data to JSON file"""
         try:
@@ -0,0 +1,124 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from rate_limiter import (RateLimiter, get_rate_limiter, host_key, call_with_backoff,
+                          is_retryable_status, parse_retry_after)
+
+
+def classify_http_error(error: Exception) -> Tuple[bool, Optional[float]]:
+    """Retry 429/5xx responses (honouring Retry-After) and transient network errors"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        response = error.response
+        return is_retryable_status(response.status_code), parse_retry_after(response.headers.get('Retry-After'))
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True, None
+    return False, None
+
+
+class HTTPFetcher:
+    """Concurrent page fetcher over a pooled ``requests.Session``
+
+    Requests run on a thread pool, with at most ``per_host_limit`` in flight
+    per host. Request rate comes from the shared per-host token buckets, and
+    429/5xx responses back off the whole host.
+    """
+
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 4, timeout: float = 15.0,
+                 user_agent: str = None, rate_limiter: RateLimiter = None):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.logger = logging.getLogger(__name__)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def get(self, url: str, headers: Dict[str, str] = None) -> requests.Response:
+        """GET a page, raising for error statuses"""
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Fetch a page and return its HTML, or None on failure"""
+        with self._host_slot(url):
+            try:
+                response = call_with_backoff(
+                    lambda: self.get(url), host_key(url), classify_http_error, self.rate_limiter
+                )
+                return response.text
+            except Exception as e:
+                self.logger.warning(f"HTTP fetch failed for {url}: {e}")
+                return None
+
+    def fetch_conditional(self, url: str, etag: str = None, last_modified: str = None) -> Dict:
+        """Conditionally fetch a page using validators from a previous response
+
+        Returns a dict with ``status`` (304 when the page is unchanged, None on
+        failure), ``html``, and the response's ``etag`` and ``last_modified``.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        with self._host_slot(url):
+            try:
+                response = call_with_backoff(
+                    lambda: self.get(url, headers=headers), host_key(url), classify_http_error, self.rate_limiter
+                )
+            except Exception as e:
+                self.logger.warning(f"HTTP fetch failed for {url}: {e}")
+                return {'status': None, 'html': None, 'etag': etag, 'last_modified': last_modified}
+
+        not_modified = response.status_code == 304
+        return {
+            'status': response.status_code,
+            'html': None if not_modified else response.text,
+            'etag': response.headers.get('ETag') or etag,
+            'last_modified': response.headers.get('Last-Modified') or last_modified
+        }
+
+    def fetch_many_conditional(self, pages: List[Tuple[str, Dict]]) -> Iterator[Tuple[str, Dict]]:
+        """Conditionally fetch ``(url, validators)`` pairs concurrently, in input order"""
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            results = executor.map(lambda page: self.fetch_conditional(page[0], **page[1]), pages)
+            for (url, _), result in zip(pages, results):
+                yield url, result
+        finally:
+            # A caller that stops early (e.g. on cancel) skips the fetches not yet started
+            executor.shutdown(cancel_futures=True)
+
+    def fetch_many(self, urls: List[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Fetch pages concurrently, yielding ``(url, html)`` in input order"""
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for url, html in zip(urls, executor.map(self.fetch, urls)):
+                yield url, html
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
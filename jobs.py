@@ -0,0 +1,367 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+# How often a running job checks the store for a cancel request from another worker
+CANCEL_POLL_SECONDS = 1.0
+
+
+class JobConflict(RuntimeError):
+    """Raised when another job of the same group is already pending or running"""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Job {job_id} is already running")
+        self.job_id = job_id
+
+
+class Job:
+    """A background task with status, progress, cancellation and an event log
+
+    Events carry increasing ids so a client can resume a stream from the
+    last id it saw. Only the most recent ``max_events`` are kept.
+    """
+
+    def __init__(self, kind: str, max_events: int = 1000, group: str = None, store: 'JobStore' = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.group = group
+        self.store = store
+        self.max_events = max_events
+        self.status = JOB_PENDING
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.events = deque(maxlen=max_events)
+        self._next_event_id = 1
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def publish(self, event: str, data: Dict = None):
+        """Append an event to the job's log and wake up any listeners"""
+        with self._changed:
+            record = {'id': self._next_event_id, 'event': event, 'data': data or {}}
+            self.events.append(record)
+            self._next_event_id += 1
+            self._changed.notify_all()
+        if self.store is not None:
+            self.store.record(self, record)
+
+    def report_progress(self, progress: Dict):
+        """Progress callback for the running task: update the snapshot and publish it"""
+        with self._changed:
+            self.progress.update(progress)
+        self.publish('progress', progress)
+
+    def set_status(self, status: str, **fields):
+        with self._changed:
+            self.status = status
+            for name, value in fields.items():
+                setattr(self, name, value)
+        self.publish('status', self.to_dict())
+
+    def cancel(self):
+        if not self.cancel_event.is_set():
+            self.cancel_event.set()
+            self.publish('cancelling', {'job_id': self.id})
+
+    def events_after(self, last_id: int = 0, timeout: float = None) -> List[Dict]:
+        """Events newer than ``last_id``, waiting up to ``timeout`` for one to arrive"""
+        with self._changed:
+            if timeout and not self.finished and (not self.events or self.events[-1]['id'] <= last_id):
+                self._changed.wait(timeout)
+            return [event for event in self.events if event['id'] > last_id]
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'progress': dict(self.progress),
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobStore:
+    """Job status and events in SQLite, shared by every worker process on the node
+
+    Any worker can look up, stream or cancel a job, whichever one runs it.
+    A job is inserted in the same write transaction that checks its group
+    for an unfinished job, so two workers can't start conflicting jobs.
+    Unfinished jobs whose process has exited are marked failed on lookup.
+    """
+
+    def __init__(self, path: str, history: int = 50):
+        self.path = path
+        self.history = history
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit; multi-statement writes open their own transaction
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, kind TEXT, job_group TEXT, pid INTEGER, status TEXT NOT NULL, '
+                'created_at REAL NOT NULL, state TEXT NOT NULL, cancel_requested INTEGER NOT NULL DEFAULT 0)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS events ('
+                'job_id TEXT, id INTEGER, event TEXT, data TEXT, PRIMARY KEY (job_id, id))'
+            )
+            self._connection = connection
+        return self._connection
+
+    def create(self, job: Job):
+        """Insert a new job, raising ``JobConflict`` if its group already has an unfinished one"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                self._expire_dead(connection)
+                if job.group:
+                    row = connection.execute(
+                        f'SELECT id FROM jobs WHERE job_group = ? AND status NOT IN ({_placeholders(FINISHED_STATES)})',
+                        (job.group,) + FINISHED_STATES
+                    ).fetchone()
+                    if row:
+                        raise JobConflict(row[0])
+                connection.execute(
+                    'INSERT INTO jobs (id, kind, job_group, pid, status, created_at, state) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (job.id, job.kind, job.group, os.getpid(), job.status, job.created_at, json.dumps(job.to_dict()))
+                )
+                self._prune(connection)
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+    def record(self, job: Job, event: Dict):
+        """Save a job's current state along with an event it just published"""
+        with self._lock:
+            connection = self._connect()
+            try:
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute(
+                    'UPDATE jobs SET status = ?, state = ? WHERE id = ?',
+                    (job.status, json.dumps(job.to_dict()), job.id)
+                )
+                connection.execute(
+                    'INSERT OR REPLACE INTO events (job_id, id, event, data) VALUES (?, ?, ?, ?)',
+                    (job.id, event['id'], event['event'], json.dumps(event['data']))
+                )
+                connection.execute(
+                    'DELETE FROM events WHERE job_id = ? AND id <= ?', (job.id, event['id'] - job.max_events)
+                )
+                connection.execute('COMMIT')
+            except sqlite3.Error as e:
+                # Other workers just see stale progress; the job itself keeps running
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+                self.logger.warning(f"Could not save job {job.id} to the job store: {e}")
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            connection = self._connect()
+            self._expire_dead(connection)
+            row = connection.execute('SELECT state FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def events_after(self, job_id: str, last_id: int = 0) -> List[Dict]:
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT id, event, data FROM events WHERE job_id = ? AND id > ? ORDER BY id', (job_id, last_id)
+            ).fetchall()
+            return [{'id': row[0], 'event': row[1], 'data': json.loads(row[2])} for row in rows]
+
+    def request_cancel(self, job_id: str):
+        """Flag a job for cancellation; the worker running it polls the flag"""
+        with self._lock:
+            self._connect().execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._connect().execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            return bool(row and row[0])
+
+    def _expire_dead(self, connection: sqlite3.Connection):
+        rows = connection.execute(
+            f'SELECT id, pid, state FROM jobs WHERE status NOT IN ({_placeholders(FINISHED_STATES)})', FINISHED_STATES
+        ).fetchall()
+        for job_id, pid, state in rows:
+            if _process_alive(pid):
+                continue
+            state = dict(json.loads(state), status=JOB_FAILED, error='Worker process exited', finished_at=time.time())
+            self.logger.warning(f"Job {job_id} lost its worker process (pid {pid}), marking it failed")
+            connection.execute('UPDATE jobs SET status = ?, state = ? WHERE id = ?',
+                               (JOB_FAILED, json.dumps(state), job_id))
+            last = connection.execute('SELECT MAX(id) FROM events WHERE job_id = ?', (job_id,)).fetchone()[0] or 0
+            connection.execute('INSERT INTO events (job_id, id, event, data) VALUES (?, ?, ?, ?)',
+                               (job_id, last + 1, 'status', json.dumps(state)))
+
+    def _prune(self, connection: sqlite3.Connection):
+        stale = connection.execute(
+            f'SELECT id FROM jobs WHERE status IN ({_placeholders(FINISHED_STATES)}) '
+            'ORDER BY created_at DESC LIMIT -1 OFFSET ?', FINISHED_STATES + (self.history,)
+        ).fetchall()
+        for (job_id,) in stale:
+            connection.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+            connection.execute('DELETE FROM events WHERE job_id = ?', (job_id,))
+
+
+def _placeholders(values) -> str:
+    return ', '.join('?' for _ in values)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobManager:
+    """Runs jobs on a small thread pool, off the web request threads
+
+    ``func(job)`` does the work; it should report progress through
+    ``job.report_progress`` and stop early once ``job.cancel_event`` is set.
+    Finished jobs are kept for lookup until ``history`` newer ones exist.
+    With a ``JobStore`` jobs are visible to, and exclusive across, every
+    worker process; lookups return job dicts wherever the job runs.
+    """
+
+    def __init__(self, max_workers: int = 1, history: int = 50, max_events: int = 1000,
+                 store: JobStore = None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self.history = history
+        self.max_events = max_events
+        self.store = store
+        self.jobs = OrderedDict()
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable[[Job], Any], group: str = None) -> Job:
+        """Queue ``func``; raises ``JobConflict`` while another job of ``group`` is unfinished"""
+        job = Job(kind, max_events=self.max_events, group=group, store=self.store)
+        with self._lock:
+            if self.store is not None:
+                self.store.create(job)
+            elif group:
+                for other in self.jobs.values():
+                    if other.group == group and not other.finished:
+                        raise JobConflict(other.id)
+            self.jobs[job.id] = job
+            self._prune()
+        job.publish('status', job.to_dict())
+        self.executor.submit(self._run, job, func)
+        self.logger.info(f"Submitted {kind} job {job.id}")
+        return job
+
+    def _run(self, job: Job, func: Callable[[Job], Any]):
+        if job.cancel_event.is_set():
+            job.set_status(JOB_CANCELLED, finished_at=time.time())
+            return
+
+        job.set_status(JOB_RUNNING, started_at=time.time())
+        if self.store is not None:
+            threading.Thread(target=self._watch_cancel, args=(job,), daemon=True,
+                             name=f'job-cancel-{job.id[:8]}').start()
+        try:
+            result = func(job)
+            if job.cancel_event.is_set():
+                job.set_status(JOB_CANCELLED, finished_at=time.time())
+            else:
+                job.set_status(JOB_SUCCEEDED, result=result, finished_at=time.time())
+        except Exception as e:
+            self.logger.error(f"{job.kind} job {job.id} failed: {e}")
+            job.set_status(JOB_FAILED, error=str(e), finished_at=time.time())
+
+    def _watch_cancel(self, job: Job):
+        """Relay a cancel request made through another worker to the running job"""
+        while not job.finished and not job.cancel_event.wait(CANCEL_POLL_SECONDS):
+            try:
+                if self.store.cancel_requested(job.id):
+                    job.cancel()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Could not check job {job.id} for cancellation: {e}")
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """A job's status, progress and result, from this process or the shared store"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self.store.get(job_id) if self.store is not None else None
+
+    def events_after(self, job_id: str, last_id: int = 0, timeout: float = None) -> List[Dict]:
+        """Events of a job newer than ``last_id``, waiting up to ``timeout`` for one to arrive"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return job.events_after(last_id, timeout)
+        if self.store is None:
+            return []
+
+        # Running in another worker: poll the store
+        deadline = time.monotonic() + (timeout or 0)
+        while True:
+            events = self.store.events_after(job_id, last_id)
+            if events or time.monotonic() >= deadline:
+                return events
+            state = self.store.get(job_id)
+            if state is None or state['status'] in FINISHED_STATES:
+                return self.store.events_after(job_id, last_id)
+            time.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Ask a job to stop; it finishes as cancelled once the task notices"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            if not job.finished:
+                job.cancel()
+            return job.to_dict()
+        if self.store is None:
+            return None
+
+        state = self.store.get(job_id)
+        if state is not None and state['status'] not in FINISHED_STATES:
+            self.store.request_cancel(job_id)
+        return state
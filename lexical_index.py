@@ -0,0 +1,120 @@
+import re
+import logging
+from collections import Counter, defaultdict
+from typing import List, Dict, Tuple
+import numpy as np
+from vector_index import top_k
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a about also an and are as at be been but by can for from has have he her his i
+in into is it its my of on or our she such that the their them they this to us
+was we were which while who will with work works working interested particularly
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class InvertedIndex:
+    """BM25 inverted index over faculty research interests, bios and publications
+
+    Each posting list is a pair of sorted NumPy arrays (document ids, term
+    frequencies), so scoring a query touches only the postings of its terms.
+    """
+
+    FIELDS = ('research_interests', 'bio', 'publications')
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.idf = {}
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def profile_text(self, faculty_profile: Dict) -> str:
+        """Join the indexed fields of a profile"""
+        parts = []
+        for field in self.FIELDS:
+            value = faculty_profile.get(field)
+            if isinstance(value, list):
+                parts.extend(value)
+            elif value:
+                parts.append(value)
+        return ' '.join(parts)
+
+    def build(self, faculty_profiles: List[Dict]) -> 'InvertedIndex':
+        """Tokenize every profile once and build the posting lists"""
+        docs_by_term = defaultdict(list)
+        tfs_by_term = defaultdict(list)
+        doc_lengths = np.zeros(len(faculty_profiles), dtype=np.float32)
+
+        for doc_id, profile in enumerate(faculty_profiles):
+            tokens = tokenize(self.profile_text(profile))
+            doc_lengths[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                docs_by_term[term].append(doc_id)
+                tfs_by_term[term].append(tf)
+
+        n = len(faculty_profiles)
+        self.doc_lengths = doc_lengths
+        self.postings = {
+            term: (np.array(docs, dtype=np.int64), np.array(tfs_by_term[term], dtype=np.float32))
+            for term, docs in docs_by_term.items()
+        }
+        self.idf = {
+            term: float(np.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5)))
+            for term, (docs, _) in self.postings.items()
+        }
+        self.logger.info(f"Built inverted index with {len(self.postings)} terms over {n} profiles")
+        return self
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of every profile for a query"""
+        scores = np.zeros(len(self), dtype=np.float32)
+        if not len(self):
+            return scores
+
+        avg_length = max(float(self.doc_lengths.mean()), 1.0)
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            docs, tfs = self.postings[term]
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / avg_length)
+            scores[docs] += self.idf[term] * tfs * (self.k1 + 1) / (tfs + norm)
+        return scores
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k profiles by BM25, skipping profiles that share no terms with the query"""
+        indices, scores = top_k(self.score(query), k)
+        keep = scores > 0
+        return indices[keep], scores[keep]
+
+    def contains(self, doc_id: int, term: str) -> bool:
+        """Check a term's posting list for a profile with a binary search"""
+        if term not in self.postings:
+            return False
+        docs = self.postings[term][0]
+        position = np.searchsorted(docs, doc_id)
+        return position < len(docs) and docs[position] == doc_id
+
+    def matching_keywords(self, doc_id: int, keywords: List[str]) -> List[str]:
+        """Keywords whose every token occurs in a profile, in O(query terms)"""
+        matched = []
+        seen = set()
+        for keyword in keywords:
+            terms = tokenize(keyword)
+            key = ' '.join(terms)
+            if not terms or key in seen:
+                continue
+            seen.add(key)
+            if all(self.contains(doc_id, term) for term in terms):
+                matched.append(keyword)
+        return matched
@@ -0,0 +1,141 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+MODE_READ_WRITE = 'read_write'
+MODE_CACHE_ONLY = 'cache_only'
+MODE_OFF = 'off'
+LLM_CACHE_MODES = (MODE_READ_WRITE, MODE_CACHE_ONLY, MODE_OFF)
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in cache-only mode when a prompt has no cached response"""
+
+
+class LLMCache:
+    """Persistent prompt-hash -> response text cache backed by SQLite
+
+    The key hashes the whole request (model, messages, sampling settings),
+    so any prompt change is a miss. Entries older than ``ttl`` seconds are
+    ignored (0 = never expire). Modes:
+      - ``read_write``: serve hits, call the API on misses and store the result
+      - ``cache_only``: serve hits, raise ``LLMCacheMiss`` instead of calling the API
+      - ``off``: always call the API
+    """
+
+    def __init__(self, path: str, ttl: float = 0, mode: str = MODE_READ_WRITE):
+        if mode not in LLM_CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        self.path = path
+        self.ttl = ttl
+        self.mode = mode
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            # WAL lets several worker processes read while one writes
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def make_key(request: Dict) -> str:
+        return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for ``key``, or None if missing or expired"""
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or (self.ttl and time.time() - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, model: str = None):
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (key, model, response, created_at) VALUES (?, ?, ?, ?)',
+                (key, model, response, time.time())
+            )
+            connection.commit()
+
+    def get_or_create(self, request: Dict, create, parse=None):
+        """Read through the cache: return the cached response or ``create()`` and store it
+
+        With ``parse`` the parsed response is returned, and only responses it
+        accepts are stored: a malformed reply raises without being cached, and
+        a cached one it rejects is treated as a miss.
+        """
+        if self.mode == MODE_OFF:
+            response = create()
+            return parse(response) if parse else response
+
+        key = self.make_key(request)
+        try:
+            cached = self.get(key)
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM cache read failed, calling the API: {e}")
+            cached = None
+        if cached is not None:
+            if not parse:
+                return cached
+            try:
+                return parse(cached)
+            except Exception as e:
+                self.logger.warning(f"Ignoring unparseable cached LLM response {key[:12]}: {e}")
+                with self._lock:
+                    self.hits -= 1
+                    self.misses += 1
+
+        if self.mode == MODE_CACHE_ONLY:
+            raise LLMCacheMiss(f"No cached LLM response for prompt {key[:12]}")
+
+        response = create()
+        # Raises before the store, so the next call asks the API again
+        value = parse(response) if parse else response
+        try:
+            self.put(key, response, request.get('model'))
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM cache write failed: {e}")
+        return value
+
+    def purge_expired(self) -> int:
+        """Delete expired entries, returning how many were removed"""
+        if not self.ttl:
+            return 0
+        with self._lock:
+            connection = self._connect()
+            removed = connection.execute(
+                'DELETE FROM responses WHERE created_at < ?', (time.time() - self.ttl,)
+            ).rowcount
+            connection.commit()
+            return removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'mode': self.mode,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,54 @@
+import threading
+import logging
+from collections import OrderedDict
+from research_matcher import ResearchMatcher, create_openai_client
+from config import Config
+
+
+class MatcherRegistry:
+    """Process-wide ResearchMatcher shared by all requests of a worker
+    
+    The sentence transformer and corpus embeddings are loaded once per
+    process. Only the OpenAI client depends on the caller's API key, so
+    per-request keys get a lightweight view of the shared matcher with a
+    cached client instead of a freshly constructed matcher.
+    """
+    
+    def __init__(self, max_clients: int = None):
+        self.config = Config()
+        self.max_clients = max_clients or self.config.MAX_OPENAI_CLIENTS
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._matcher = None
+        self._clients = OrderedDict()
+    
+    def get_matcher(self, openai_api_key: str = None) -> ResearchMatcher:
+        """Get the shared matcher, bound to ``openai_api_key`` when one is given"""
+        matcher = self._get_base_matcher()
+        if not openai_api_key or openai_api_key == self.config.OPENAI_API_KEY:
+            return matcher
+        return matcher.with_openai_client(self._get_client(openai_api_key))
+    
+    def warm_up(self):
+        """Load the model and run a warm-up encode, typically at worker boot"""
+        self._get_base_matcher().warm_up()
+    
+    def _get_base_matcher(self) -> ResearchMatcher:
+        with self._lock:
+            if self._matcher is None:
+                self._matcher = ResearchMatcher()
+                self.logger.info("Shared research matcher initialized")
+            return self._matcher
+    
+    def _get_client(self, api_key: str):
+        """Return a cached OpenAI client for ``api_key``, evicting the least recently used"""
+        with self._lock:
+            client = self._clients.pop(api_key, None)
+            if client is None:
+                client = create_openai_client(api_key)
+            self._clients[api_key] = client
+            
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+            
+            return client
@@ -0,0 +1,244 @@
+import re
+import logging
+from typing import Callable, Dict, List, Optional
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+    from bs4 import BeautifulSoup
+
+# Each field is resolved from its selectors in priority order:
+#   'text'   - first selector whose first match has non-empty text
+#   'exists' - first selector with any match
+#   'email'  - first selector whose first match yields an address containing '@'
+#   'all'    - every match of the selector, in document order
+# Only the selector subset used here is supported: tag, .class and one
+# [attr*="value"] / [attr^="value"] condition, optionally combined.
+PROFILE_RULES = [
+    {'field': 'name', 'mode': 'text', 'selectors': [
+        'h1', 'h2', '.name', '.faculty-name', '.profile-name',
+        '[class*="name"]', '[id*="name"]'
+    ]},
+    {'field': 'title', 'mode': 'text', 'selectors': [
+        '.title', '.position', '.rank', '.designation',
+        '[class*="title"]', '[class*="position"]'
+    ]},
+    {'field': 'department', 'mode': 'text', 'selectors': [
+        '.department', '.school', '.faculty', '.division',
+        '[class*="department"]', '[class*="school"]'
+    ]},
+    {'field': 'research_interests', 'mode': 'exists', 'selectors': [
+        '.research-interests', '.research-areas', '.interests',
+        '[class*="research"]', '[class*="interest"]'
+    ]},
+    # The old selector cascade always stopped at its first publications selector
+    {'field': 'publications', 'mode': 'all', 'selectors': ['.publications']},
+    {'field': 'email', 'mode': 'email', 'selectors': [
+        'a[href^="mailto:"]', '.email', '[class*="email"]'
+    ]},
+    {'field': 'bio', 'mode': 'text', 'selectors': [
+        '.bio', '.biography', '.about', '.description',
+        '[class*="bio"]', '[class*="about"]'
+    ]},
+]
+
+# Outbound links, checked in order against the lowercased href; the last link wins
+LINK_RULES = [
+    ('google_scholar', 'scholar.google.com'),
+    ('research_gate', 'researchgate.net'),
+    ('linkedin', 'linkedin.com'),
+    ('website', 'http'),
+]
+
+MIN_PUBLICATION_LENGTH = 10
+
+# Text directly inside these is code, not content (BeautifulSoup's get_text skips it too)
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+# lxml refuses str input that carries an encoding declaration
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+if lxml is not None:
+    CONTENT_TEXT = etree.XPath(
+        './/text()[not(' + ' or '.join(f'parent::{tag}' for tag in NON_TEXT_TAGS) + ')]'
+    )
+
+SELECTOR_PATTERN = re.compile(
+    r'^(?P<tag>[a-z][a-z0-9]*)?'
+    r'(?:\.(?P<cls>[\w-]+))?'
+    r'(?:\[(?P<attr>[\w-]+)(?P<op>[*^])="(?P<value>[^"]*)"\])?$'
+)
+
+
+def compile_selector(selector: str) -> Callable[[str, Dict[str, str]], bool]:
+    """Compile a simple CSS selector into a predicate over ``(tag, attributes)``"""
+    match = SELECTOR_PATTERN.match(selector)
+    if not match or not any(match.groupdict().values()):
+        raise ValueError(f"Unsupported selector: {selector}")
+
+    tag, cls, attr, op, value = match.group('tag', 'cls', 'attr', 'op', 'value')
+
+    def predicate(element_tag: str, attributes: Dict[str, str]) -> bool:
+        if tag and element_tag != tag:
+            return False
+        if cls and cls not in attributes.get('class', '').split():
+            return False
+        if attr:
+            actual = attributes.get(attr)
+            if actual is None:
+                return False
+            if op == '*' and value not in actual:
+                return False
+            if op == '^' and not actual.startswith(value):
+                return False
+        return True
+
+    return predicate
+
+
+class ProfileExtractor:
+    """Single-pass faculty profile extractor driven by precompiled selector rules
+
+    The page is walked once; every element is tested against all compiled
+    selectors, recording the first match of each (or every match for 'all'
+    rules) plus outbound links. Fields are then resolved from those matches
+    with the same priority order as the per-field selector cascade.
+    """
+
+    def __init__(self, rules: List[Dict] = None, link_rules: List = None):
+        self.rules = rules or PROFILE_RULES
+        self.link_rules = link_rules or LINK_RULES
+        self.logger = logging.getLogger(__name__)
+
+        # Flatten to (key, collect every match, predicate) for the walk
+        self.matchers = []
+        for rule_index, rule in enumerate(self.rules):
+            for selector_index, selector in enumerate(rule['selectors']):
+                key = (rule_index, selector_index)
+                self.matchers.append((key, rule['mode'] == 'all', compile_selector(selector)))
+
+    def extract(self, html: str) -> Dict:
+        """Extract profile fields from page HTML; fields that aren't found are omitted"""
+        if not html or not html.strip():
+            return {}
+        if lxml is not None:
+            try:
+                root = lxml.html.document_fromstring(XML_DECLARATION.sub('', html, count=1))
+            except (etree.ParserError, ValueError) as e:
+                # e.g. a page holding only comments
+                self.logger.warning(f"Could not parse profile page: {e}")
+                return {}
+            elements = self._walk_lxml(root)
+            get_text = lambda element: ''.join(CONTENT_TEXT(element))
+        else:
+            elements = self._walk_soup(html)
+            get_text = lambda element: element.get_text()
+
+        first = {}
+        every = {}
+        hrefs = []
+        for element, tag, attributes in elements:
+            for key, is_all, predicate in self.matchers:
+                if (key in first and not is_all) or not predicate(tag, attributes):
+                    continue
+                first.setdefault(key, (element, attributes))
+                if is_all:
+                    every.setdefault(key, []).append(element)
+            if tag == 'a' and 'href' in attributes:
+                hrefs.append(attributes['href'])
+
+        profile = {}
+        for rule_index, rule in enumerate(self.rules):
+            value = self._resolve(rule_index, rule, first, every, get_text)
+            if value is not None:
+                profile[rule['field']] = value
+        profile.update(self._resolve_links(hrefs))
+        return profile
+
+    def _walk_lxml(self, root):
+        for element in root.iter(etree.Element):
+            yield element, element.tag, element.attrib
+
+    def _walk_soup(self, html: str):
+        soup = BeautifulSoup(html, 'html.parser')
+        for element in soup.find_all(True):
+            attributes = {
+                name: ' '.join(value) if isinstance(value, list) else value
+                for name, value in element.attrs.items()
+            }
+            yield element, element.name, attributes
+
+    def _resolve(self, rule_index: int, rule: Dict, first: Dict, every: Dict, get_text) -> Optional[object]:
+        mode = rule['mode']
+        for selector_index in range(len(rule['selectors'])):
+            key = (rule_index, selector_index)
+            if mode == 'all':
+                texts = (get_text(element).strip() for element in every.get(key, []))
+                return [text for text in texts if text and len(text) > MIN_PUBLICATION_LENGTH]
+            if key not in first:
+                continue
+
+            element, attributes = first[key]
+            if mode == 'exists':
+                text = get_text(element).strip()
+                return [part.strip() for part in text.replace(',', ';').split(';') if part.strip()]
+            if mode == 'email':
+                email = attributes.get('href', '').replace('mailto:', '') or get_text(element).strip()
+                if '@' in email:
+                    return email
+                continue
+
+            text = get_text(element).strip()
+            if text:
+                return text
+        return None
+
+    def _resolve_links(self, hrefs: List[str]) -> Dict[str, str]:
+        links = {}
+        for href in hrefs:
+            lowered = href.lower()
+            for field, marker in self.link_rules:
+                if marker in lowered:
+                    links[field] = href
+                    break
+        return links
+
+
+_default_extractor = None
+
+
+def empty_profile(profile_url: str) -> Dict:
+    """Create a profile record with every field blank"""
+    return {
+        'url': profile_url,
+        'name': '',
+        'title': '',
+        'department': '',
+        'research_interests': [],
+        'publications': [],
+        'education': '',
+        'bio': '',
+        'email': '',
+        'phone': '',
+        'office': '',
+        'website': '',
+        'google_scholar': '',
+        'research_gate': '',
+        'linkedin': ''
+    }
+
+
+def extract_profile(html: str, profile_url: str) -> Dict:
+    """Parse a profile page into a full profile record
+
+    A plain module-level function using a per-process extractor, so it can
+    be sent to ``ProcessPoolExecutor`` workers.
+    """
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = ProfileExtractor()
+    profile = empty_profile(profile_url)
+    profile.update(_default_extractor.extract(html))
+    return profile
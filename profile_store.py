@@ -0,0 +1,261 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from collections.abc import Mapping
+from typing import Dict, Iterator, List
+import numpy as np
+
+STORE_FORMAT = 1
+# Low-cardinality fields kept as int32 codes into a shared vocabulary
+INTERNED_FIELDS = ('department', 'title')
+# Large fields left on disk and decoded only when a record asks for them
+HEAVY_FIELDS = ('bio', 'publications', 'education')
+
+
+def profiles_version(faculty_profiles: List[Dict]) -> str:
+    """Hash of a full profile list; a JSON file and the store converted from it share it"""
+    return hashlib.sha1(
+        json.dumps(faculty_profiles, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+
+
+def store_directory(profiles_path: str) -> str:
+    """Store directory written beside a ``faculty_profiles_*.json`` file"""
+    return f"{os.path.splitext(profiles_path)[0]}.profiles"
+
+
+class ProfileRecord(Mapping):
+    """Read-only, dict-like view of one profile in a ``ProfileStore``
+
+    Supports ``get``, ``[]``, ``in`` and iteration like the profile dicts
+    it replaces; heavy fields are decoded from the store on each access.
+    """
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: 'ProfileStore', row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, field: str):
+        return self._store.value(self._row, field)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self._store.fields if field in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, field) -> bool:
+        return self._store.has_value(self._row, field)
+
+    def __repr__(self):
+        return f"ProfileRecord({self.get('url') or self.get('name')!r})"
+
+    def to_dict(self) -> Dict:
+        return {field: self[field] for field in self}
+
+
+class ProfileStore:
+    """Compact, read-only columnar store of faculty profiles
+
+    Light fields are one list per field, with department and title interned
+    as int32 codes into a small vocabulary. Heavy fields (bio, publications,
+    education) are JSON values packed into one memory-mapped blob per field
+    plus an offsets array, so loading the store never decodes them. Records
+    are ``ProfileRecord`` views created on access. A missing key (or a JSON
+    ``null``) reads as absent, so ``get`` falls back to its default.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self.columns_path = os.path.join(directory, 'columns.json')
+        self.fields = []
+        self.version = None
+        self.source = {}
+        self.size = 0
+        self.columns = {}
+        self.codes = {}
+        self.vocab = {}
+        self.heavy = {}
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [ProfileRecord(self, index) for index in range(*row.indices(self.size))]
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError('profile index out of range')
+        return ProfileRecord(self, row)
+
+    def __iter__(self) -> Iterator[ProfileRecord]:
+        return (ProfileRecord(self, row) for row in range(self.size))
+
+    def has_value(self, row: int, field: str) -> bool:
+        if field in self.codes:
+            return self.codes[field][row] >= 0
+        if field in self.heavy:
+            offsets = self.heavy[field][0]
+            return offsets[row + 1] > offsets[row]
+        column = self.columns.get(field)
+        return column is not None and column[row] is not None
+
+    def value(self, row: int, field: str):
+        if field in self.codes:
+            code = self.codes[field][row]
+            if code >= 0:
+                return self.vocab[field][code]
+        elif field in self.heavy:
+            offsets, data = self.heavy[field]
+            start, end = offsets[row], offsets[row + 1]
+            if end > start:
+                return json.loads(data[start:end].tobytes())
+        else:
+            column = self.columns.get(field)
+            if column is not None and column[row] is not None:
+                return column[row]
+        raise KeyError(field)
+
+    def to_dicts(self) -> List[Dict]:
+        """Plain profile dicts, e.g. to serialize or fingerprint them"""
+        return [record.to_dict() for record in self]
+
+    def is_current(self, profiles_path: str) -> bool:
+        """Whether the store was converted from ``profiles_path`` as it is now"""
+        try:
+            stat = os.stat(profiles_path)
+        except OSError:
+            return False
+        return self.source.get('size') == stat.st_size and self.source.get('mtime_ns') == stat.st_mtime_ns
+
+    def load(self) -> bool:
+        """Load the light columns and map the heavy fields, if a compatible store exists"""
+        try:
+            if not (os.path.exists(self.manifest_path) and os.path.exists(self.columns_path)):
+                return False
+
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('format') != STORE_FORMAT:
+                self.logger.info(f"Profile store {self.directory} has another format, ignoring it")
+                return False
+
+            with open(self.columns_path, 'r', encoding='utf-8') as f:
+                columns = json.load(f)
+
+            heavy = {}
+            for field in manifest['heavy_fields']:
+                offsets = np.load(os.path.join(self.directory, f"{field}.offsets.npy"), mmap_mode='r')
+                data_path = os.path.join(self.directory, f"{field}.bin")
+                # An empty file can't be memory-mapped
+                if os.path.getsize(data_path):
+                    data = np.memmap(data_path, dtype=np.uint8, mode='r')
+                else:
+                    data = np.zeros(0, dtype=np.uint8)
+                heavy[field] = (offsets, data)
+
+            self.fields = manifest['fields']
+            self.version = manifest['version']
+            self.source = manifest.get('source') or {}
+            self.size = manifest['count']
+            self.columns = columns['columns']
+            self.vocab = columns['vocab']
+            self.codes = {field: np.asarray(codes, dtype=np.int32) for field, codes in columns['codes'].items()}
+            self.heavy = heavy
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error loading profile store {self.directory}: {e}")
+            return False
+
+    @classmethod
+    def write(cls, faculty_profiles: List[Dict], directory: str, source_path: str = None) -> 'ProfileStore':
+        """Convert profile dicts into a store at ``directory``, replacing any previous one"""
+        if isinstance(faculty_profiles, ProfileStore):
+            version = faculty_profiles.version
+            faculty_profiles = faculty_profiles.to_dicts()
+        else:
+            version = profiles_version(faculty_profiles)
+
+        fields = []
+        for profile in faculty_profiles:
+            for field in profile:
+                if field not in fields:
+                    fields.append(field)
+
+        tmp_dir = f"{directory}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        columns, codes, vocab = {}, {}, {}
+        for field in fields:
+            values = [profile.get(field) for profile in faculty_profiles]
+            if field in INTERNED_FIELDS:
+                table = {}
+                codes[field] = [-1 if value is None else table.setdefault(value, len(table)) for value in values]
+                vocab[field] = list(table)
+            elif field in HEAVY_FIELDS:
+                blobs = [b'' if value is None else json.dumps(value, ensure_ascii=False).encode('utf-8')
+                         for value in values]
+                offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+                np.cumsum([len(blob) for blob in blobs], out=offsets[1:])
+                np.save(os.path.join(tmp_dir, f"{field}.offsets.npy"), offsets)
+                with open(os.path.join(tmp_dir, f"{field}.bin"), 'wb') as f:
+                    f.write(b''.join(blobs))
+            else:
+                columns[field] = values
+
+        with open(os.path.join(tmp_dir, 'columns.json'), 'w', encoding='utf-8') as f:
+            json.dump({'columns': columns, 'codes': codes, 'vocab': vocab}, f, ensure_ascii=False)
+
+        source = {}
+        if source_path:
+            stat = os.stat(source_path)
+            source = {'path': os.path.basename(source_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': STORE_FORMAT,
+                'count': len(faculty_profiles),
+                'version': version,
+                'fields': fields,
+                'heavy_fields': [field for field in fields if field in HEAVY_FIELDS],
+                'source': source
+            }, f)
+
+        # Swap the whole directory so readers never see a half-written store
+        old_dir = f"{directory}.{os.getpid()}.old"
+        if os.path.isdir(directory):
+            os.rename(directory, old_dir)
+        os.rename(tmp_dir, directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+        store = cls(directory)
+        if not store.load():
+            raise OSError(f"Profile store {directory} could not be read back")
+        store.logger.info(f"Profile store written to {directory} ({len(store)} profiles)")
+        return store
+
+
+def open_profiles(profiles_path: str) -> ProfileStore:
+    """Open the store beside ``profiles_path``, converting the JSON file first if it's missing or stale"""
+    store = ProfileStore(store_directory(profiles_path))
+    if store.load() and store.is_current(profiles_path):
+        return store
+
+    with open(profiles_path, 'r', encoding='utf-8') as f:
+        faculty_profiles = json.load(f)
+    return ProfileStore.write(faculty_profiles, store.directory, source_path=profiles_path)
+
+
+def as_dicts(faculty_profiles) -> List[Dict]:
+    """Profiles as plain dicts, whether they come from a store or a JSON load"""
+    if isinstance(faculty_profiles, ProfileStore):
+        return faculty_profiles.to_dicts()
+    return faculty_profiles
@@ -0,0 +1,153 @@
+import time
+import random
+import logging
+import threading
+from typing import Any, Callable, Optional, Tuple
+from urllib.parse import urlparse
+from config import Config
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second, bursting up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the time spent waiting"""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= tokens:
+                        self.tokens -= tokens
+                        return waited
+                    wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds``, e.g. after a 429 response"""
+        with self._lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.updated_at = max(now, self.paused_until)
+
+
+class RateLimiter:
+    """Named token buckets shared by the scraper (one per host) and the matcher (one per API)"""
+
+    def __init__(self, rate: float = None, capacity: float = None):
+        config = Config()
+        self.default_rate = rate if rate is not None else config.MAX_REQUESTS_PER_MINUTE / 60.0
+        self.default_capacity = capacity if capacity is not None else config.RATE_LIMIT_BURST
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, key: str, rate: float, capacity: float = None):
+        """Set the rate of one bucket, keeping its current state if it already exists"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = TokenBucket(rate, capacity or self.default_capacity)
+            else:
+                bucket.rate = rate
+                bucket.capacity = max(capacity or bucket.capacity, 1.0)
+
+    def bucket(self, key: str) -> TokenBucket:
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(self.default_rate, self.default_capacity)
+            return self._buckets[key]
+
+    def acquire(self, key: str) -> float:
+        """Wait for a token from the ``key`` bucket"""
+        return self.bucket(key).acquire()
+
+    def pause(self, key: str, seconds: float):
+        """Back off every caller sharing the ``key`` bucket"""
+        self.bucket(key).pause(seconds)
+
+
+_shared_rate_limiter = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide rate limiter, so every scraper and matcher shares the same buckets"""
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = RateLimiter()
+        return _shared_rate_limiter
+
+
+def host_key(url: str) -> str:
+    """Bucket key for requests to the host of ``url``"""
+    return f"host:{urlparse(url).netloc}"
+
+
+def is_retryable_status(status: Optional[int]) -> bool:
+    """Rate limiting and server errors are worth retrying, other statuses are not"""
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Read a Retry-After header given in seconds (HTTP-date values are ignored)"""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base_delay: float = None, max_delay: float = None,
+                  retry_after: float = None) -> float:
+    """Exponential backoff with full jitter, never shorter than a server's Retry-After"""
+    config = Config()
+    base_delay = config.REQUEST_DELAY if base_delay is None else base_delay
+    max_delay = config.MAX_BACKOFF_SECONDS if max_delay is None else max_delay
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def call_with_backoff(func: Callable[[], Any], key: str, classify: Callable[[Exception], Tuple[bool, Optional[float]]],
+                      limiter: RateLimiter = None, max_retries: int = None) -> Any:
+    """Call ``func`` through the ``key`` bucket, backing off on retryable errors
+
+    ``classify(exception)`` returns ``(retryable, retry_after_seconds)``. A
+    backoff pauses the whole bucket, so concurrent callers slow down together.
+    """
+    limiter = limiter or get_rate_limiter()
+    max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+    logger = logging.getLogger(__name__)
+
+    for attempt in range(max_retries + 1):
+        limiter.acquire(key)
+        try:
+            return func()
+        except Exception as e:
+            retryable, retry_after = classify(e)
+            if not retryable or attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt, retry_after=retry_after)
+            logger.warning(f"{key} call failed ({e}), retrying in {delay:.1f}s")
+            limiter.pause(key, delay)
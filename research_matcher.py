@@ -1,12 +1,60 @@
+import copy
 import json
 import logging
-from typing import List, Dict, Tuple
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import List, Dict, Iterator, Optional, Tuple
 import openai
 from sentence_transformers import SentenceTransformer
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import pandas as pd
 from config import Config
+from embedding_store import EmbeddingStore, content_hash, make_profile_ids
+from vector_index import VectorIndex, create_index, load_index, top_k
+from lexical_index import InvertedIndex
+from facet_index import FacetIndex, normalize_filters
+from profile_store import profiles_version
+from result_cache import ResultCache, normalize_interests
+from llm_cache import LLMCache, MODE_CACHE_ONLY
+from rate_limiter import get_rate_limiter, call_with_backoff, is_retryable_status, parse_retry_after
+
+OPENAI_RATE_KEY = 'api:openai'
+
+# Exception names used by the OpenAI SDKs for transient failures
+RETRYABLE_OPENAI_ERRORS = {
+    'RateLimitError', 'APIConnectionError', 'APITimeoutError', 'InternalServerError',
+    'ServiceUnavailableError', 'Timeout', 'TryAgain'
+}
+
+_sentence_models = {}
+_sentence_models_lock = threading.Lock()
+
+def load_sentence_model(model_name: str) -> SentenceTransformer:
+    """Load a sentence transformer once per process and share it between matchers"""
+    with _sentence_models_lock:
+        if model_name not in _sentence_models:
+            _sentence_models[model_name] = SentenceTransformer(model_name)
+        return _sentence_models[model_name]
+
+def classify_openai_error(error: Exception) -> Tuple[bool, Optional[float]]:
+    """Decide whether an OpenAI error is worth retrying, and how long the API asked us to wait"""
+    status = getattr(error, 'status_code', None) or getattr(error, 'http_status', None)
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None) or {}
+    retryable = is_retryable_status(status) or type(error).__name__ in RETRYABLE_OPENAI_ERRORS
+    return retryable, parse_retry_after(headers.get('retry-after'))
+
+def create_openai_client(api_key: str):
+    """Create an OpenAI client bound to a single API key"""
+    if hasattr(openai, 'OpenAI'):
+        return openai.OpenAI(api_key=api_key)
+    
+    # Legacy SDKs only expose the module-level client
+    openai.api_key = api_key
+    return openai
 
 class ResearchMatcher:
     """AI-powered research interest matcher using LLM and semantic similarity"""
@@ -15,19 +63,31 @@ class ResearchMatcher:
         self.config = Config()
         self.openai_client = None
         self.sentence_model = None
+        self.corpus = None
+        self.result_cache = ResultCache(self.config.RESULT_CACHE_SIZE, self.config.RESULT_CACHE_TTL)
+        # Matches whose reasons a request is generating right now, so concurrent requests wait instead
+        self._reasons_lock = threading.Lock()
+        self._reasons_in_flight = {}
+        self.llm_cache = LLMCache(self.config.LLM_CACHE_PATH, self.config.LLM_CACHE_TTL, self.config.LLM_CACHE_MODE)
+        self.rate_limiter = get_rate_limiter()
+        self.rate_limiter.configure(
+            OPENAI_RATE_KEY, self.config.OPENAI_REQUESTS_PER_MINUTE / 60.0, self.config.OPENAI_BURST
+        )
         self.setup_logging()
         self.setup_models(openai_api_key)
         
     def setup_logging(self):
         """Setup logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('matcher.log'),
-                logging.StreamHandler()
-            ]
-        )
+        # basicConfig is a no-op once handlers exist, so only build them the first time
+        if not logging.getLogger().handlers:
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.FileHandler('matcher.log'),
+                    logging.StreamHandler()
+                ]
+            )
         self.logger = logging.getLogger(__name__)
     
     def setup_models(self, openai_api_key: str = None):
@@ -36,22 +96,62 @@ class ResearchMatcher:
             # Setup OpenAI
             api_key = openai_api_key or self.config.OPENAI_API_KEY
             if api_key:
-                openai.api_key = api_key
-                self.openai_client = openai
+                self.openai_client = create_openai_client(api_key)
                 self.logger.info("OpenAI client initialized")
             else:
                 self.logger.warning("No OpenAI API key provided - LLM features will be limited")
             
             # Setup sentence transformer for semantic similarity
-            self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.sentence_model = load_sentence_model(self.config.SENTENCE_MODEL)
             self.logger.info("Sentence transformer model loaded")
             
         except Exception as e:
             self.logger.error(f"Error setting up models: {e}")
     
+    def with_openai_client(self, openai_client) -> 'ResearchMatcher':
+        """Return a matcher sharing this one's model and corpus but using another OpenAI client"""
+        matcher = copy.copy(self)
+        matcher.openai_client = openai_client
+        return matcher
+    
+    def warm_up(self):
+        """Run one encode so the first request doesn't pay for lazy model initialization"""
+        try:
+            if self.sentence_model:
+                self.encode_texts(["warm up"])
+                self.logger.info("Sentence transformer warmed up")
+        except Exception as e:
+            self.logger.error(f"Error warming up sentence transformer: {e}")
+    
+    def use_llm(self) -> bool:
+        """Whether LLM answers are available, from the API or (in cache-only mode) the LLM cache"""
+        return self.openai_client is not None or self.llm_cache.mode == MODE_CACHE_ONLY
+    
+    def chat_completion(self, parse=None, **kwargs):
+        """Get a chat completion's message text, reading through the persistent LLM cache
+        
+        Cache misses create a rate-limited completion, backing off on 429/5xx responses.
+        With ``parse`` (e.g. ``json.loads``) the parsed text is returned and only
+        replies that parse are cached.
+        """
+        def create():
+            response = call_with_backoff(
+                lambda: self._create_chat_completion(**kwargs),
+                OPENAI_RATE_KEY, classify_openai_error, self.rate_limiter
+            )
+            return response.choices[0].message.content
+        
+        return self.llm_cache.get_or_create(kwargs, create, parse)
+    
+    def _create_chat_completion(self, **kwargs):
+        """Create a chat completion with whichever OpenAI SDK generation is installed"""
+        if hasattr(self.openai_client, 'chat'):
+            return self.openai_client.chat.completions.create(**kwargs)
+        return self.openai_client.ChatCompletion.create(**kwargs)
+    
     def analyze_research_interests(self, user_interests: str) -> Dict:
         """Analyze and structure user research interests using LLM"""
-        if not self.openai_client:
+        if not self.use_llm():
             return {"interests": user_interests, "keywords": user_interests.split()}
         
         try:
@@ -70,14 +170,13 @@ class ResearchMatcher:
             Return only the JSON object, no additional text.
             """
             
-            response = self.openai_client.ChatCompletion.create(
+            analysis = self.chat_completion(
+                parse=json.loads,
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 max_tokens=500
             )
-            
-            analysis = json.loads(response.choices[0].message.content)
             self.logger.info("Successfully analyzed user research interests")
             return analysis
             
@@ -103,6 +202,39 @@ class ResearchMatcher:
             self.logger.error(f"Error calculating semantic similarity: {e}")
             return 0.0
     
+    def encode_texts(self, texts: List[str], batch_size: int = None) -> np.ndarray:
+        """Encode texts in batches into L2-normalized float32 embeddings"""
+        if not texts:
+            dimension = self.sentence_model.get_sentence_embedding_dimension()
+            return np.zeros((0, dimension), dtype=np.float32)
+        
+        batch_size = batch_size or self.config.EMBEDDING_BATCH_SIZE
+        embeddings = self.sentence_model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+    
+    def calculate_semantic_similarities(self, query_text: str, texts: List[str], batch_size: int = None) -> np.ndarray:
+        """Calculate semantic similarity between one query and many texts in a single pass"""
+        try:
+            if not self.sentence_model or not texts:
+                return np.zeros(len(texts), dtype=np.float32)
+            
+            # Encode the query once and the corpus in batches
+            query_embedding = self.encode_texts([query_text])[0]
+            corpus_embeddings = self.encode_texts(texts, batch_size=batch_size)
+            
+            # Embeddings are normalized, so cosine similarity is a dot product
+            return corpus_embeddings @ query_embedding
+            
+        except Exception as e:
+            self.logger.error(f"Error calculating semantic similarities: {e}")
+            return np.zeros(len(texts), dtype=np.float32)
+    
     def extract_faculty_research_text(self, faculty_profile: Dict) -> str:
         """Extract and combine all research-related text from faculty profile"""
         research_text = []
@@ -128,70 +260,579 @@ class ResearchMatcher:
         
         return ' '.join(research_text)
     
-    def match_faculty_with_interests(self, faculty_profiles: List[Dict], user_interests: str) -> List[Dict]:
-        """Match faculty profiles with user research interests"""
+    def extract_faculty_research_chunks(self, faculty_profile: Dict) -> List[str]:
+        """Split a profile's research text into separately embedded chunks
+        
+        One chunk per research interest and per publication (all of them), and
+        the bio in windows of ``CHUNK_WORDS`` words so nothing is cut off by
+        the sentence model's token limit.
+        """
+        chunks = [interest.strip() for interest in (faculty_profile.get('research_interests') or []) if interest.strip()]
+        
+        # Older profile files store missing fields as null
+        words = (faculty_profile.get('bio') or '').split()
+        size = self.config.CHUNK_WORDS
+        chunks.extend(' '.join(words[start:start + size]) for start in range(0, len(words), size))
+        
+        chunks.extend(publication.strip() for publication in (faculty_profile.get('publications') or []) if publication.strip())
+        
+        # Profiles with only a title and department still get one chunk
+        if not chunks:
+            chunks.append(self.extract_faculty_research_text(faculty_profile))
+        return chunks
+    
+    def collect_candidates(self, faculty_profiles: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """Collect named profiles with non-empty research text, with that text"""
+        candidates = []
+        candidate_texts = []
+        for profile in faculty_profiles:
+            if not profile.get('name'):
+                continue
+            
+            faculty_research_text = self.extract_faculty_research_text(profile)
+            if not faculty_research_text.strip():
+                continue
+            
+            candidates.append(profile)
+            candidate_texts.append(faculty_research_text)
+        
+        return candidates, candidate_texts
+    
+    def has_corpus(self, faculty_profiles: List[Dict]) -> bool:
+        """Check whether embeddings for this exact profile list are loaded"""
+        return self.corpus is not None and self.corpus['source'] is faculty_profiles
+    
+    def load_corpus(self, faculty_profiles: List[Dict], profiles_path: str = None, batch_size: int = None,
+                    previous_path: str = None, embeddings: np.ndarray = None,
+                    offsets: np.ndarray = None) -> bool:
+        """Precompute corpus embeddings, reusing the on-disk store beside ``profiles_path``
+        
+        When ``profiles_path`` is a refreshed copy of ``previous_path``, rows of
+        unchanged profiles are taken from the previous file's store. Passing
+        ``embeddings`` (and chunk ``offsets`` in chunk mode) attaches rows that
+        were already computed, e.g. a shared corpus, without encoding anything.
+        """
         try:
+            candidates, candidate_texts = self.collect_candidates(faculty_profiles)
+            encode = partial(self.encode_texts, batch_size=batch_size)
+            
+            if embeddings is not None:
+                index = self.attach_index(embeddings, offsets, profiles_path)
+            elif self.config.EMBEDDING_MODE == 'chunks':
+                embeddings, index = self.embed_chunks(candidates, encode, profiles_path, previous_path)
+            else:
+                store = None
+                if profiles_path:
+                    store = EmbeddingStore(profiles_path, self.config.SENTENCE_MODEL)
+                    seed = EmbeddingStore(previous_path, self.config.SENTENCE_MODEL) if previous_path else None
+                    embeddings = store.sync(make_profile_ids(candidates), candidate_texts, encode, seed=seed)
+                else:
+                    embeddings = encode(candidate_texts)
+                index = self.build_index(embeddings, store)
+            
+            self.corpus = {
+                'source': faculty_profiles,
+                'version': self.corpus_version(faculty_profiles),
+                'profiles': candidates,
+                'embeddings': embeddings,
+                'index': index,
+                'lexical_index': InvertedIndex().build(candidates),
+                'facet_index': FacetIndex().build(candidates),
+                'positions': {id(profile): position for position, profile in enumerate(candidates)}
+            }
+            self.logger.info(f"Corpus loaded with {len(candidates)} embedded profiles")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error loading corpus embeddings: {e}")
+            self.corpus = None
+            return False
+        
+        finally:
+            # Cached matches were computed against the previous corpus
+            self.result_cache.clear()
+    
+    def embed_chunks(self, candidates: List[Dict], encode, profiles_path: str = None,
+                     previous_path: str = None) -> Tuple[np.ndarray, VectorIndex]:
+        """Embed every chunk of every profile into one packed matrix with a multi-vector index
+        
+        Chunk rows are keyed by profile id and chunk text, so only new or
+        edited chunks are re-encoded when a profile changes.
+        """
+        chunk_ids, chunk_texts, counts = [], [], []
+        for profile_id, profile in zip(make_profile_ids(candidates), candidates):
+            chunks = self.extract_faculty_research_chunks(profile)
+            counts.append(len(chunks))
+            chunk_texts.extend(chunks)
+            chunk_ids.extend(f"{profile_id}::{content_hash(chunk)}" for chunk in chunks)
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        
+        if profiles_path:
+            store = EmbeddingStore(profiles_path, self.config.SENTENCE_MODEL, suffix='chunks')
+            seed = EmbeddingStore(previous_path, self.config.SENTENCE_MODEL, suffix='chunks') if previous_path else None
+            embeddings = store.sync(chunk_ids, chunk_texts, encode, seed=seed)
+        else:
+            embeddings = encode(chunk_texts)
+        
+        index = create_index(
+            'multivector', offsets=offsets,
+            aggregation=self.config.CHUNK_AGGREGATION, top_m=self.config.CHUNK_TOP_M
+        )
+        index.build(embeddings)
+        self.logger.info(f"Embedded {len(chunk_texts)} chunks for {len(candidates)} profiles")
+        return embeddings, index
+    
+    def attach_index(self, embeddings: np.ndarray, offsets: np.ndarray = None,
+                     profiles_path: str = None) -> VectorIndex:
+        """Index precomputed corpus rows, reusing an index saved beside ``profiles_path``"""
+        if offsets is not None:
+            index = create_index(
+                'multivector', offsets=offsets,
+                aggregation=self.config.CHUNK_AGGREGATION, top_m=self.config.CHUNK_TOP_M
+            )
+            index.build(embeddings)
+            return index
+        
+        store = None
+        if profiles_path:
+            store = EmbeddingStore(profiles_path, self.config.SENTENCE_MODEL)
+            if not store.load() or len(store.ids) != len(embeddings):
+                store = None
+        return self.build_index(embeddings, store)
+    
+    def corpus_version(self, faculty_profiles: List[Dict]) -> str:
+        """Hash of the full profile list, identifying the corpus cached results came from"""
+        # A profile store carries the hash of the JSON file it was converted from
+        return getattr(faculty_profiles, 'version', None) or profiles_version(faculty_profiles)
+    
+    def result_cache_key(self, user_interests: str, filters: Dict = None) -> Tuple:
+        """Cache key for a (possibly filtered) match query against the loaded corpus"""
+        return (
+            normalize_interests(user_interests),
+            normalize_filters(filters),
+            self.corpus['version'],
+            self.config.SIMILARITY_THRESHOLD,
+            self.config.MAX_RESULTS,
+            self.use_llm()
+        )
+    
+    def build_index(self, embeddings: np.ndarray, store: EmbeddingStore = None) -> VectorIndex:
+        """Build the configured vector index, reusing one saved in the embedding store"""
+        kind = self.config.VECTOR_INDEX
+        if len(embeddings) < self.config.ANN_MIN_PROFILES:
+            # Approximate search only pays off on large corpora
+            kind = 'exact'
+        
+        params = {}
+        if kind == 'ivf':
+            params = {'nlist': self.config.IVF_NLIST, 'nprobe': self.config.IVF_NPROBE}
+        elif kind in ('float16', 'int8'):
+            params = {'rerank': self.config.QUANTIZED_RERANK}
+        
+        if kind == 'exact' or store is None:
+            index = create_index(kind, **params)
+            index.build(embeddings)
+            return index
+        
+        index_path = os.path.join(store.directory, f"{kind}.index.npz")
+        search_params = {name: value for name, value in params.items() if name != 'nlist'}
+        index = load_index(index_path, embeddings, store.version, **search_params)
+        if index is None or index.kind != kind:
+            index = create_index(kind, **params)
+            index.build(embeddings)
+            index.save(index_path, store.version)
+        return index
+    
+    def hybrid_rerank(self, query_text: str, query_embedding: np.ndarray, semantic_indices: np.ndarray,
+                      rows: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Fuse BM25 and embedding scores over semantic and lexical top candidates
+        
+        Returns candidate positions ordered by fused score, with their semantic
+        similarities and normalized BM25 scores. Lexical candidates are kept
+        within ``rows`` when the search is filtered.
+        """
+        lexical_scores = self.corpus['lexical_index'].score(query_text)
+        if rows is not None:
+            allowed = lexical_scores[rows]
+            lexical_scores = np.zeros_like(lexical_scores)
+            lexical_scores[rows] = allowed
+        lexical_indices, _ = top_k(lexical_scores, self.config.LEXICAL_CANDIDATES)
+        lexical_indices = lexical_indices[lexical_scores[lexical_indices] > 0]
+        pool = np.union1d(semantic_indices, lexical_indices)
+        
+        semantic = self.corpus['index'].score_rows(query_embedding, pool)
+        max_lexical = float(lexical_scores.max()) if len(lexical_scores) else 0.0
+        lexical = lexical_scores[pool] / max_lexical if max_lexical > 0 else np.zeros(len(pool), dtype=np.float32)
+        
+        weight = self.config.LEXICAL_WEIGHT
+        order = np.argsort(-((1 - weight) * semantic + weight * lexical), kind='stable')
+        return pool[order], semantic[order], lexical[order]
+    
+    def match_faculty_with_interests(self, faculty_profiles: List[Dict], user_interests: str, batch_size: int = None,
+                                     with_reasons: bool = True, filters: Dict = None) -> List[Dict]:
+        """Match faculty profiles with user research interests
+        
+        Reasons are generated only for the final matches, concurrently. With
+        ``with_reasons=False`` matches still missing reasons are flagged
+        ``reasons_pending`` and the caller can fill them lazily through
+        ``fill_match_reasons``. The ranked list is cached before any reasons
+        exist, so every page of a repeated query is served from the cache.
+        ``filters`` (see ``facet_index.normalize_filters``) restrict the
+        candidates before any vector scoring.
+        """
+        cached = self.cached_matches(faculty_profiles, user_interests, filters)
+        if cached is not None:
+            if with_reasons:
+                for _ in self.fill_match_reasons(cached, user_interests):
+                    pass
+            return cached
+        
+        try:
+            facet_filters = normalize_filters(filters)
+            
             # Analyze user interests
             interest_analysis = self.analyze_research_interests(user_interests)
             
             # Prepare user interest text for comparison
-            user_interest_text = user_interests
-            if isinstance(interest_analysis, dict) and 'keywords' in interest_analysis:
-                user_interest_text += ' ' + ' '.join(interest_analysis['keywords'])
-            
-            matches = []
+            user_interest_text = self.interest_query_text(user_interests, interest_analysis)
             
-            for profile in faculty_profiles:
-                if not profile.get('name'):
-                    continue
+            lexical_scores = None
+            if self.has_corpus(faculty_profiles):
+                # Corpus embeddings are precomputed, only the query needs a forward pass
+                candidates = self.corpus['profiles']
+                rows = self.corpus['facet_index'].select(facet_filters) if facet_filters else None
+                query_embedding = self.encode_texts([user_interest_text])[0]
+                top_indices, top_scores = self.search_corpus(query_embedding[np.newaxis], rows)[0]
                 
-                # Extract faculty research text
-                faculty_research_text = self.extract_faculty_research_text(profile)
-                
-                if not faculty_research_text.strip():
-                    continue
+                if self.config.LEXICAL_WEIGHT > 0:
+                    top_indices, top_scores, lexical_scores = self.hybrid_rerank(
+                        user_interest_text, query_embedding, top_indices, rows
+                    )
+            else:
+                candidates, candidate_texts = self.collect_candidates(faculty_profiles)
+                if facet_filters:
+                    rows = FacetIndex().build(candidates).select(facet_filters)
+                    candidates = [candidates[row] for row in rows]
+                    candidate_texts = [candidate_texts[row] for row in rows]
                 
-                # Calculate semantic similarity
-                similarity_score = self.calculate_semantic_similarity(
-                    user_interest_text, faculty_research_text
+                # Score every candidate with one batched encode and a matrix-vector product
+                similarity_scores = self.calculate_semantic_similarities(
+                    user_interest_text, candidate_texts, batch_size=batch_size
                 )
-                
-                # Only include matches above threshold
-                if similarity_score >= self.config.SIMILARITY_THRESHOLD:
-                    match_data = {
-                        'faculty_profile': profile,
-                        'similarity_score': similarity_score,
-                        'match_reasons': self.generate_match_reasons(
-                            profile, interest_analysis, similarity_score
-                        )
-                    }
-                    matches.append(match_data)
-            
-            # Sort by similarity score (highest first)
-            matches.sort(key=lambda x: x['similarity_score'], reverse=True)
-            
-            # Limit results
-            matches = matches[:self.config.MAX_RESULTS]
+                top_indices, top_scores = top_k(similarity_scores, self.config.MAX_RESULTS)
+            
+            matches = self.select_matches(candidates, top_indices, top_scores, lexical_scores)
             
             self.logger.info(f"Found {len(matches)} matching faculty members")
+            if self.has_corpus(faculty_profiles):
+                self.cache_matches(user_interests, matches, filters)
+            
+            if with_reasons:
+                for _ in self.fill_match_reasons(matches, interest_analysis):
+                    pass
             return matches
             
         except Exception as e:
             self.logger.error(f"Error matching faculty with interests: {e}")
             return []
     
+    def cached_matches(self, faculty_profiles: List[Dict], user_interests: str,
+                       filters: Dict = None) -> Optional[List[Dict]]:
+        """Ranked matches cached for this query and corpus, if any (reasons may still be pending)"""
+        if not self.has_corpus(faculty_profiles):
+            return None
+        cached = self.result_cache.get(self.result_cache_key(user_interests, filters))
+        if cached is None:
+            return None
+        self.logger.info(f"Found {len(cached)} matching faculty members (cached)")
+        return list(cached)
+    
+    def cache_matches(self, user_interests: str, matches: List[Dict], filters: Dict = None):
+        """Cache the ranked matches of the loaded corpus
+        
+        The cached match dicts are shared with the caller, so reasons filled
+        in later by ``fill_match_reasons`` are cached along with them.
+        """
+        if self.corpus is not None:
+            self.result_cache.put(self.result_cache_key(user_interests, filters), list(matches))
+    
+    def search_corpus(self, query_embeddings: np.ndarray,
+                      rows: np.ndarray = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Top ``MAX_RESULTS`` corpus positions and scores per query, optionally only among ``rows``
+        
+        A filtered search scores just the selected rows, so it costs in
+        proportion to the filtered subset instead of the whole corpus.
+        """
+        if rows is None:
+            return self.corpus['index'].search_batch(query_embeddings, self.config.MAX_RESULTS)
+        
+        results = []
+        for query_embedding in query_embeddings:
+            positions, scores = top_k(self.corpus['index'].score_rows(query_embedding, rows), self.config.MAX_RESULTS)
+            results.append((rows[positions], scores))
+        return results
+    
+    def iter_corpus_scores(self, user_interests: str, filters: Dict = None,
+                           block_size: int = 1024) -> Iterator[Tuple[Dict, Optional[float]]]:
+        """Every stored profile (within ``filters``) with its similarity to ``user_interests``
+        
+        Profiles come in stored order and are scored block by block from the
+        precomputed embeddings, so memory stays flat however large the corpus.
+        Profiles that were never embedded (no name or no research text) are
+        still yielded, with a score of ``None``.
+        """
+        if self.corpus is None:
+            raise ValueError("No corpus embeddings loaded")
+        
+        interest_analysis = self.analyze_research_interests(user_interests)
+        query_embedding = self.encode_texts([self.interest_query_text(user_interests, interest_analysis)])[0]
+        source = self.corpus['source']
+        facet_filters = normalize_filters(filters)
+        # The corpus facet index only covers embedded profiles, so filter the stored list itself
+        rows = FacetIndex().build(source).select(facet_filters) if facet_filters else None
+        total = len(source) if rows is None else len(rows)
+        positions = self.corpus['positions']
+        
+        for start in range(0, total, block_size):
+            if rows is None:
+                block = [source[row] for row in range(start, min(start + block_size, total))]
+            else:
+                block = [source[row] for row in rows[start:start + block_size]]
+            embedded = [positions[id(profile)] for profile in block if id(profile) in positions]
+            scores = iter(self.corpus['index'].score_rows(query_embedding, np.asarray(embedded, dtype=np.int64)))
+            for profile in block:
+                yield profile, (float(next(scores)) if id(profile) in positions else None)
+    
+    def match_batch(self, faculty_profiles: List[Dict], interests: List[str], with_reasons: bool = True,
+                    batch_size: int = None, filters: Dict = None) -> Iterator[Tuple[int, object]]:
+        """Match many interest statements against the corpus, yielding ``(query index, matches)``
+        
+        Queries are handled in blocks of ``MATCH_QUERY_BLOCK``: each block is
+        encoded as one matrix and scored against the corpus with a single
+        matrix product, so the first block's results stream out while later
+        blocks are still pending. Cached queries are answered immediately.
+        ``filters`` apply to every query. When a block fails, each of its
+        unanswered queries yields the exception instead of a match list, so
+        callers can tell a failure from a query without matches.
+        """
+        if not self.has_corpus(faculty_profiles):
+            self.load_corpus(faculty_profiles, batch_size=batch_size)
+        
+        pending = []
+        duplicates = {}
+        first_seen = {}
+        for query_index, user_interests in enumerate(interests):
+            if not user_interests or not user_interests.strip():
+                yield query_index, []
+                continue
+            cached = self.result_cache.get(self.result_cache_key(user_interests, filters)) if self.corpus else None
+            if cached is not None:
+                if with_reasons:
+                    for _ in self.fill_match_reasons(cached, user_interests):
+                        pass
+                yield query_index, list(cached)
+                continue
+            
+            # Statements that normalize to the same query are matched once
+            normalized = normalize_interests(user_interests)
+            if normalized in first_seen:
+                duplicates[first_seen[normalized]].append(query_index)
+            else:
+                first_seen[normalized] = query_index
+                duplicates[query_index] = []
+                pending.append(query_index)
+        
+        block_size = max(1, self.config.MATCH_QUERY_BLOCK)
+        for start in range(0, len(pending), block_size):
+            block = pending[start:start + block_size]
+            answered = set()
+            try:
+                if not self.corpus:
+                    raise ValueError("No corpus embeddings loaded")
+                results = self.match_query_block(block, [interests[i] for i in block], with_reasons,
+                                                 batch_size, filters)
+                for query_index, matches in results:
+                    answered.add(query_index)
+                    yield query_index, matches
+                    for duplicate_index in duplicates[query_index]:
+                        yield duplicate_index, list(matches)
+            except Exception as e:
+                self.logger.error(f"Error matching query batch: {e}")
+                for query_index in block:
+                    if query_index not in answered:
+                        for failed_index in [query_index] + duplicates[query_index]:
+                            yield failed_index, e
+    
+    def match_query_block(self, query_indices: List[int], interests: List[str], with_reasons: bool,
+                          batch_size: int = None, filters: Dict = None) -> Iterator[Tuple[int, List[Dict]]]:
+        """Match one block of queries with a single encode and one queries x corpus product"""
+        facet_filters = normalize_filters(filters)
+        rows = self.corpus['facet_index'].select(facet_filters) if facet_filters else None
+        if self.use_llm() and len(interests) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.config.LLM_CONCURRENCY, len(interests))) as executor:
+                analyses = list(executor.map(self.analyze_research_interests, interests))
+        else:
+            analyses = [self.analyze_research_interests(user_interests) for user_interests in interests]
+        
+        query_texts = [self.interest_query_text(user_interests, analysis)
+                       for user_interests, analysis in zip(interests, analyses)]
+        query_embeddings = self.encode_texts(query_texts, batch_size=batch_size)
+        results = self.search_corpus(query_embeddings, rows)
+        
+        for position, (top_indices, top_scores) in enumerate(results):
+            lexical_scores = None
+            if self.config.LEXICAL_WEIGHT > 0:
+                top_indices, top_scores, lexical_scores = self.hybrid_rerank(
+                    query_texts[position], query_embeddings[position], top_indices, rows
+                )
+            matches = self.select_matches(self.corpus['profiles'], top_indices, top_scores, lexical_scores)
+            self.cache_matches(interests[position], matches, filters)
+            
+            if with_reasons:
+                for _ in self.fill_match_reasons(matches, analyses[position]):
+                    pass
+            yield query_indices[position], matches
+    
+    def interest_query_text(self, user_interests: str, interest_analysis) -> str:
+        """Interests text expanded with the analysis keywords, as embedded for retrieval"""
+        if isinstance(interest_analysis, dict) and 'keywords' in interest_analysis:
+            return user_interests + ' ' + ' '.join(interest_analysis['keywords'])
+        return user_interests
+    
+    def select_matches(self, candidates: List[Dict], top_indices: np.ndarray, top_scores: np.ndarray,
+                       lexical_scores: np.ndarray = None) -> List[Dict]:
+        """Ranked candidates above the similarity threshold, flagged ``reasons_pending``"""
+        matches = []
+        for rank, (index, similarity_score) in enumerate(zip(top_indices, top_scores)):
+            similarity_score = float(similarity_score)
+            
+            # Only include matches above threshold
+            if similarity_score < self.config.SIMILARITY_THRESHOLD:
+                continue
+            
+            match_data = {
+                'faculty_profile': candidates[index],
+                'similarity_score': similarity_score,
+                'match_reasons': [],
+                'reasons_pending': True
+            }
+            if lexical_scores is not None:
+                match_data['lexical_score'] = float(lexical_scores[rank])
+            matches.append(match_data)
+            
+            if len(matches) >= self.config.MAX_RESULTS:
+                break
+        return matches
+    
+    def fill_match_reasons(self, matches: List[Dict], interest_analysis) -> Iterator[Tuple[int, List[str]]]:
+        """Generate reasons for the matches still flagged ``reasons_pending``, in place
+        
+        Yields ``(match index, reasons)`` as each one is ready. Matches shared
+        with the result cache keep their reasons, so a cached query generates
+        each result's reasons once however its pages are requested. Each match
+        is claimed under a lock first: a concurrent request for the same
+        matches waits for the claimed ones instead of generating them again.
+        """
+        pending = [index for index, match in enumerate(matches) if match.get('reasons_pending')]
+        while pending:
+            ready, claimed, waiting = [], [], []
+            with self._reasons_lock:
+                for index in pending:
+                    match = matches[index]
+                    if not match.get('reasons_pending'):
+                        # Filled by another request meanwhile
+                        ready.append(index)
+                    elif id(match) in self._reasons_in_flight:
+                        waiting.append(index)
+                    else:
+                        self._reasons_in_flight[id(match)] = threading.Event()
+                        claimed.append(index)
+            
+            for index in ready:
+                yield index, matches[index]['match_reasons']
+            
+            try:
+                for position, reasons in self.iter_match_reasons([matches[index] for index in claimed],
+                                                                 interest_analysis) if claimed else ():
+                    match = matches[claimed[position]]
+                    match['match_reasons'] = reasons
+                    match.pop('reasons_pending', None)
+                    self._release_reasons(match)
+                    yield claimed[position], reasons
+            finally:
+                # Hand back the claims left unfilled, e.g. when a streaming client went away
+                for index in claimed:
+                    self._release_reasons(matches[index])
+            
+            if waiting:
+                with self._reasons_lock:
+                    event = self._reasons_in_flight.get(id(matches[waiting[0]]))
+                if event is not None:
+                    event.wait()
+            pending = waiting
+    
+    def _release_reasons(self, match: Dict):
+        """Drop a match's claim and wake the requests waiting for its reasons"""
+        with self._reasons_lock:
+            event = self._reasons_in_flight.pop(id(match), None)
+        if event is not None:
+            event.set()
+    
+    def iter_match_reasons(self, matches: List[Dict], interest_analysis) -> Iterator[Tuple[int, List[str]]]:
+        """Yield ``(match index, reasons)`` as each match's reasons are ready
+        
+        LLM calls run on a thread pool of at most ``LLM_CONCURRENCY`` requests,
+        still subject to the shared OpenAI rate limit. ``interest_analysis`` may
+        be the raw interests text, in which case it is analyzed first (a cache
+        hit when the matches came from the same query).
+        """
+        if isinstance(interest_analysis, str):
+            interest_analysis = self.analyze_research_interests(interest_analysis)
+        
+        workers = min(self.config.LLM_CONCURRENCY, len(matches))
+        if not self.use_llm() or workers <= 1:
+            # Keyword reasons are local lookups, a pool would only add overhead
+            for index, match in enumerate(matches):
+                yield index, self.generate_match_reasons(
+                    match['faculty_profile'], interest_analysis, match['similarity_score']
+                )
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='match-reasons')
+        try:
+            futures = {
+                executor.submit(self.generate_match_reasons, match['faculty_profile'],
+                                interest_analysis, match['similarity_score']): index
+                for index, match in enumerate(matches)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Stop queued requests if the caller stops consuming early
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def generate_match_reasons(self, faculty_profile: Dict, interest_analysis: Dict, similarity_score: float) -> List[str]:
         """Generate specific reasons why a faculty member matches user interests"""
         reasons = []
         
         try:
-            if not self.openai_client:
+            if not self.use_llm():
+                if not isinstance(interest_analysis, dict) or 'keywords' not in interest_analysis:
+                    return reasons
+                
+                position = self.corpus['positions'].get(id(faculty_profile)) if self.corpus else None
+                if position is not None:
+                    # Posting-list lookups, no need to rebuild the profile text
+                    keywords = self.corpus['lexical_index'].matching_keywords(
+                        position, interest_analysis['keywords']
+                    )
+                    return [f"Research involves {keyword}" for keyword in keywords]
+                
                 # Fallback to simple keyword matching
                 faculty_text = self.extract_faculty_research_text(faculty_profile).lower()
-                if isinstance(interest_analysis, dict) and 'keywords' in interest_analysis:
-                    for keyword in interest_analysis['keywords']:
-                        if keyword.lower() in faculty_text:
-                            reasons.append(f"Research involves {keyword}")
+                for keyword in interest_analysis['keywords']:
+                    if keyword.lower() in faculty_text:
+                        reasons.append(f"Research involves {keyword}")
                 return reasons
             
             # Use LLM to generate specific match reasons
@@ -215,15 +856,14 @@ class ResearchMatcher:
             Return as a JSON array of strings.
             """
             
-            response = self.openai_client.ChatCompletion.create(
+            reasons = self.chat_completion(
+                parse=json.loads,
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 max_tokens=300
             )
             
-            reasons = json.loads(response.choices[0].message.content)
-            
         except Exception as e:
             self.logger.error(f"Error generating match reasons: {e}")
             reasons = [f"Semantic similarity score: {similarity_score:.3f}"]
@@ -0,0 +1,138 @@
+import os
+import queue
+import multiprocessing
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from profile_extractor import extract_profile
+
+_DONE = object()
+
+
+def parse_worker_context():
+    """Multiprocessing context for the parse workers
+
+    Forking a web worker that already runs torch/BLAS and request threads
+    can deadlock the child, so workers come from a fork server that only
+    preloads the extractor (lxml), or are spawned where there is none.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['profile_extractor'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+class ScrapePipeline:
+    """Streaming fetch -> parse -> persist pipeline for profile pages
+
+    Fetch threads put raw HTML on a bounded queue; a dispatcher hands each
+    page to a ``ProcessPoolExecutor`` parse worker and queues the pending
+    result on a second bounded queue, which the caller drains (the persist
+    stage). A slow stage therefore blocks the ones before it instead of
+    letting fetched pages pile up in memory.
+    """
+
+    def __init__(self, fetch: Callable[[str], Optional[str]],
+                 parse: Callable[[str, str], Dict] = extract_profile,
+                 fetch_workers: int = 8, parse_workers: int = None, queue_size: int = 64):
+        self.fetch = fetch
+        self.parse = parse
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = max(1, queue_size)
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str], Optional[Dict]]]:
+        """Yield ``(url, html, profile)`` as pages are parsed, roughly in input order
+
+        ``html`` is None when the fetch failed and ``profile`` is None when
+        there was nothing to parse or the parse worker raised.
+        """
+        urls = list(urls)
+        if not urls:
+            return
+
+        pages = queue.Queue(maxsize=self.queue_size)
+        parsed = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        url_iter = iter(urls)
+        url_lock = threading.Lock()
+        fetch_workers = min(self.fetch_workers, len(urls))
+
+        def put(target: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def fetch_stage():
+            try:
+                while not stop.is_set():
+                    with url_lock:
+                        url = next(url_iter, None)
+                    if url is None:
+                        break
+                    try:
+                        html = self.fetch(url)
+                    except Exception as e:
+                        self.logger.warning(f"Fetch failed for {url}: {e}")
+                        html = None
+                    if not put(pages, (url, html)):
+                        break
+            finally:
+                put(pages, _DONE)
+
+        def parse_stage(executor: ProcessPoolExecutor):
+            finished = 0
+            while finished < fetch_workers:
+                item = get(pages)
+                if item is _DONE:
+                    if stop.is_set():
+                        break
+                    finished += 1
+                    continue
+                url, html = item
+                future = executor.submit(self.parse, html, url) if html else None
+                if not put(parsed, (url, html, future)):
+                    break
+            put(parsed, _DONE)
+
+        executor = ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=parse_worker_context())
+        threads = [threading.Thread(target=fetch_stage, daemon=True) for _ in range(fetch_workers)]
+        threads.append(threading.Thread(target=parse_stage, args=(executor,), daemon=True))
+        try:
+            for thread in threads:
+                thread.start()
+
+            while True:
+                item = get(parsed)
+                if item is _DONE:
+                    break
+                url, html, future = item
+                profile = None
+                if future is not None:
+                    try:
+                        profile = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error parsing profile from {url}: {e}")
+                yield url, html, profile
+
+        finally:
+            stop.set()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+            executor.shutdown(wait=True, cancel_futures=True)
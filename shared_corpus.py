@@ -0,0 +1,117 @@
+import os
+import json
+import shutil
+import logging
+from typing import Dict, Optional, Tuple
+import numpy as np
+from profile_store import ProfileStore
+
+CURRENT_FILE = 'CURRENT'
+
+
+class SharedCorpus:
+    """Corpus published once per node and attached read-only by every worker
+
+    Each published corpus is an immutable version directory (a profile
+    store, the embedding matrix and, in chunk mode, chunk offsets) under a
+    RAM-backed root such as ``/dev/shm``. Workers memory-map the matrix and
+    the store's heavy fields, so those pages are shared no matter how many
+    workers run. A small ``CURRENT`` pointer
+    file is swapped atomically to switch every worker to a new version.
+    """
+
+    def __init__(self, root: str, keep_versions: int = 2):
+        self.root = root
+        self.keep_versions = keep_versions
+        self.pointer_path = os.path.join(root, CURRENT_FILE)
+        self.logger = logging.getLogger(__name__)
+        self._pointer_stamp = None
+        self._pointer = None
+
+    def current(self) -> Optional[Dict]:
+        """The published pointer (``version``, ``profiles_file``, ``count``), re-read only when it changes"""
+        try:
+            stat = os.stat(self.pointer_path)
+        except FileNotFoundError:
+            return None
+
+        # Each publish replaces the file, so a new inode marks a switch even
+        # when it lands within the filesystem's timestamp granularity
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp != self._pointer_stamp:
+            try:
+                with open(self.pointer_path, 'r', encoding='utf-8') as f:
+                    self._pointer = json.load(f)
+                self._pointer_stamp = stamp
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Error reading shared corpus pointer {self.pointer_path}: {e}")
+                return None
+        return self._pointer
+
+    def publish(self, version: str, faculty_profiles, profiles_file: str,
+                embeddings: np.ndarray, offsets: np.ndarray = None) -> Dict:
+        """Write a version directory (unless it already exists) and point ``CURRENT`` at it"""
+        os.makedirs(self.root, exist_ok=True)
+        version_dir = os.path.join(self.root, version)
+
+        if not os.path.isdir(version_dir):
+            tmp_dir = os.path.join(self.root, f".{version}.{os.getpid()}.tmp")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            try:
+                os.makedirs(tmp_dir)
+                if isinstance(faculty_profiles, ProfileStore):
+                    shutil.copytree(faculty_profiles.directory, os.path.join(tmp_dir, 'profiles'))
+                else:
+                    ProfileStore.write(faculty_profiles, os.path.join(tmp_dir, 'profiles'))
+                np.save(os.path.join(tmp_dir, 'embeddings.npy'), np.asarray(embeddings, dtype=np.float32))
+                if offsets is not None:
+                    np.save(os.path.join(tmp_dir, 'offsets.npy'), np.asarray(offsets, dtype=np.int64))
+            except BaseException:
+                # A small RAM-backed root fills up easily; don't leave a partial copy in it
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+            try:
+                os.rename(tmp_dir, version_dir)
+            except OSError:
+                # Another worker published the same version first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        pointer = {'version': version, 'profiles_file': profiles_file, 'count': len(faculty_profiles)}
+        tmp_pointer = f"{self.pointer_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_pointer, 'w', encoding='utf-8') as f:
+                json.dump(pointer, f)
+            os.replace(tmp_pointer, self.pointer_path)
+        except BaseException:
+            if os.path.exists(tmp_pointer):
+                os.remove(tmp_pointer)
+            raise
+        self.logger.info(f"Published corpus version {version} ({len(faculty_profiles)} profiles) to {self.root}")
+
+        self.prune(version)
+        return pointer
+
+    def attach(self, pointer: Dict) -> Tuple[ProfileStore, np.ndarray, Optional[np.ndarray]]:
+        """Load a published version: profile store, read-only mapped embeddings and chunk offsets"""
+        version_dir = os.path.join(self.root, pointer['version'])
+        faculty_profiles = ProfileStore(os.path.join(version_dir, 'profiles'))
+        if not faculty_profiles.load():
+            raise OSError(f"Shared profile store {faculty_profiles.directory} could not be loaded")
+        embeddings = np.load(os.path.join(version_dir, 'embeddings.npy'), mmap_mode='r')
+
+        offsets = None
+        offsets_path = os.path.join(version_dir, 'offsets.npy')
+        if os.path.exists(offsets_path):
+            offsets = np.load(offsets_path)
+        return faculty_profiles, embeddings, offsets
+
+    def prune(self, current_version: str):
+        """Remove old versions; workers still mapping one keep their pages until they re-attach"""
+        versions = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name != current_version and not name.startswith('.') and os.path.isdir(path):
+                versions.append((os.path.getmtime(path), path))
+
+        for _, path in sorted(versions, reverse=True)[max(0, self.keep_versions - 1):]:
+            shutil.rmtree(path, ignore_errors=True)
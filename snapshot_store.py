@@ -0,0 +1,93 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+
+class SnapshotStore:
+    """Compressed, content-addressed store of raw profile page HTML
+
+    Pages are gzip-compressed under ``objects/<aa>/<sha256>.html.gz``, so
+    identical HTML is stored once. ``index.jsonl`` appends one line per
+    capture mapping a URL to its digest; the latest capture wins.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.index_path = os.path.join(directory, 'index.jsonl')
+        self.index = {}
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def _ensure_loaded(self):
+        """Read ``index.jsonl`` once (caller holds ``_lock``)"""
+        if self._loaded:
+            return
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.index[entry['url']] = entry['digest']
+        self._loaded = True
+
+    def load_index(self) -> Dict[str, str]:
+        """Latest snapshot digest per URL (a copy, safe to keep while pages are captured)"""
+        with self._lock:
+            self._ensure_loaded()
+            return dict(self.index)
+
+    def put(self, url: str, html: str) -> str:
+        """Store a page's HTML and return its digest"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._ensure_loaded()
+            if self.index.get(url) != digest:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'url': url, 'digest': digest, 'timestamp': time.time()}) + '\n')
+                self.index[url] = digest
+        return digest
+
+    def get(self, url: str) -> Optional[str]:
+        """HTML of the latest snapshot of ``url``, or None if it was never captured"""
+        with self._lock:
+            self._ensure_loaded()
+            digest = self.index.get(url)
+        return self._read(digest) if digest else None
+
+    def _read(self, digest: str) -> str:
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Iterate ``(url, html)`` over the latest snapshot of every URL"""
+        # One copy of the index up front; each page is then a single object read
+        for url, digest in self.load_index().items():
+            yield url, self._read(digest)
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self.index)
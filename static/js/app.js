@@ -1,10 +1,13 @@
 // Faculty Research Agent - Frontend JavaScript
 
 let currentMatches = [];
+let matchCursor = null;
+let matchQuery = null;
 
 // Initialize the application
 document.addEventListener('DOMContentLoaded', function() {
     loadAvailableFiles();
+    loadFacets();
     setupEventListeners();
 });
 
@@ -38,9 +41,14 @@ function loadAvailableFiles() {
         });
 }
 
+let scrapeJobId = null;
+let scrapeEvents = null;
+
 function startScraping() {
     const headless = document.getElementById('headless').checked;
-    const delay = parseFloat(document.getElementById('delay').value);
+    // Left empty, the server's configured crawl rate applies
+    const delayValue = document.getElementById('delay').value;
+    const delay = delayValue ? parseFloat(delayValue) : null;
     
     showStatus('scrapingStatus', 'Starting scraping process...', 'info');
     
@@ -56,10 +64,9 @@ function startScraping() {
     })
     .then(response => response.json())
     .then(data => {
-        if (data.success) {
-            showStatus('scrapingStatus', data.message, 'success');
-            document.getElementById('matchBtn').disabled = false;
-            loadAvailableFiles(); // Refresh file list
+        if (data.success || data.job_id) {
+            // Follow the new job, or the one that is already running
+            followScrapeJob(data.job_id);
         } else {
             showStatus('scrapingStatus', `Error: ${data.error}`, 'error');
         }
@@ -70,6 +77,97 @@ function startScraping() {
     });
 }
 
+function followScrapeJob(jobId) {
+    scrapeJobId = jobId;
+    setScrapingActive(true);
+    
+    if (scrapeEvents) {
+        scrapeEvents.close();
+    }
+    scrapeEvents = new EventSource(`/jobs/${jobId}/events`);
+    
+    scrapeEvents.addEventListener('progress', function(event) {
+        showScrapeProgress(JSON.parse(event.data));
+    });
+    
+    scrapeEvents.addEventListener('cancelling', function() {
+        showStatus('scrapingStatus', 'Cancelling...', 'info');
+    });
+    
+    scrapeEvents.addEventListener('status', function(event) {
+        const job = JSON.parse(event.data);
+        if (job.status === 'succeeded') {
+            finishScrapeJob();
+            showStatus('scrapingStatus', job.result.message, 'success');
+            document.getElementById('matchBtn').disabled = false;
+            loadAvailableFiles(); // Refresh file list
+            loadFacets();
+        } else if (job.status === 'failed') {
+            finishScrapeJob();
+            showStatus('scrapingStatus', `Error: ${job.error}`, 'error');
+        } else if (job.status === 'cancelled') {
+            finishScrapeJob();
+            showStatus('scrapingStatus', 'Scraping cancelled; the next run resumes where it stopped', 'info');
+        }
+    });
+}
+
+function showScrapeProgress(progress) {
+    if (progress.stage === 'embedding') {
+        showStatus('scrapingStatus', 'Embedding profiles...', 'info');
+        return;
+    }
+    if (!progress.total) {
+        return;
+    }
+    
+    const finished = progress.done + progress.failed;
+    const percent = Math.round(100 * finished / progress.total);
+    const element = document.getElementById('scrapingStatus');
+    element.innerHTML = `
+        <div class="status-message status-info">
+            Scraped ${progress.done} of ${progress.total} profiles${progress.failed ? ` (${progress.failed} failed)` : ''}
+            ${progress.name ? `<br><small>${progress.name}</small>` : ''}
+        </div>
+        <div class="progress mt-2">
+            <div class="progress-bar" role="progressbar" style="width: ${percent}%"
+                 aria-valuenow="${percent}" aria-valuemin="0" aria-valuemax="100">${percent}%</div>
+        </div>
+    `;
+}
+
+function cancelScraping() {
+    if (!scrapeJobId) {
+        return;
+    }
+    
+    fetch(`/jobs/${scrapeJobId}/cancel`, { method: 'POST' })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                showStatus('scrapingStatus', `Error: ${data.error}`, 'error');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            showStatus('scrapingStatus', 'Error cancelling scraping', 'error');
+        });
+}
+
+function finishScrapeJob() {
+    if (scrapeEvents) {
+        scrapeEvents.close();
+        scrapeEvents = null;
+    }
+    scrapeJobId = null;
+    setScrapingActive(false);
+}
+
+function setScrapingActive(active) {
+    document.getElementById('scrapeBtn').disabled = active;
+    document.getElementById('cancelScrapeBtn').style.display = active ? 'inline-block' : 'none';
+}
+
 function loadProfiles() {
     const filename = document.getElementById('fileSelect').value;
     
@@ -94,6 +192,7 @@ function loadProfiles() {
         if (data.success) {
             showStatus('loadingStatus', data.message, 'success');
             document.getElementById('matchBtn').disabled = false;
+            loadFacets();
         } else {
             showStatus('loadingStatus', `Error: ${data.error}`, 'error');
         }
@@ -104,6 +203,44 @@ function loadProfiles() {
     });
 }
 
+function loadFacets() {
+    fetch('/facets')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                fillFacetSelect('departmentFilter', 'Any department', data.facets.department);
+                fillFacetSelect('titleFilter', 'Any title', data.facets.title);
+            }
+        })
+        .catch(error => console.error('Error loading facets:', error));
+}
+
+function fillFacetSelect(elementId, anyLabel, entries) {
+    const select = document.getElementById(elementId);
+    const selected = select.value;
+    select.innerHTML = `<option value="">${anyLabel}</option>`;
+    
+    entries.forEach(entry => {
+        const option = document.createElement('option');
+        option.value = entry.value;
+        option.textContent = `${entry.value} (${entry.count})`;
+        select.appendChild(option);
+    });
+    select.value = entries.some(entry => entry.value === selected) ? selected : '';
+}
+
+function getMatchFilters() {
+    const filters = {};
+    const department = document.getElementById('departmentFilter').value;
+    const title = document.getElementById('titleFilter').value;
+    
+    if (department) filters.department = department;
+    if (title) filters.title = title;
+    if (document.getElementById('scholarFilter').checked) filters.has_google_scholar = true;
+    if (document.getElementById('researchGateFilter').checked) filters.has_research_gate = true;
+    return filters;
+}
+
 function findMatches() {
     const interests = document.getElementById('interests').value.trim();
     const openaiKey = document.getElementById('openaiKey').value.trim();
@@ -114,7 +251,22 @@ function findMatches() {
     }
     
     showStatus('matchingStatus', 'Finding matches...', 'info');
+    fetchMatchPage(interests, openaiKey, getMatchFilters(), null);
+}
+
+function loadMoreMatches() {
+    if (!matchCursor) {
+        return;
+    }
     
+    document.getElementById('loadMoreBtn').disabled = true;
+    fetchMatchPage(matchQuery.interests, matchQuery.openaiKey, matchQuery.filters, matchCursor);
+}
+
+function fetchMatchPage(interests, openaiKey, filters, cursor) {
+    matchQuery = { interests: interests, openaiKey: openaiKey, filters: filters };
+    
+    // Streamed: the ranked page arrives first, each result's reasons follow as they finish
     fetch('/match', {
         method: 'POST',
         headers: {
@@ -122,32 +274,76 @@ function findMatches() {
         },
         body: JSON.stringify({
             interests: interests,
-            openai_key: openaiKey
+            openai_key: openaiKey,
+            stream: true,
+            filters: filters,
+            cursor: cursor
         })
     })
-    .then(response => response.json())
-    .then(data => {
-        if (data.success) {
-            currentMatches = data.matches;
-            displayResults(data);
-            showStatus('matchingStatus', `Found ${data.total_matches} matches out of ${data.total_profiles} profiles`, 'success');
-        } else {
-            showStatus('matchingStatus', `Error: ${data.error}`, 'error');
+    .then(response => {
+        if (!response.ok || !response.body) {
+            return response.json().then(data => {
+                throw new Error(data.error || 'Error finding matches');
+            });
         }
+        return readNdjson(response, handleMatchEvent);
     })
     .catch(error => {
         console.error('Error:', error);
-        showStatus('matchingStatus', 'Error finding matches', 'error');
+        showStatus('matchingStatus', `Error: ${error.message}`, 'error');
+        document.getElementById('loadMoreBtn').disabled = false;
     });
 }
 
+function readNdjson(response, onLine) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    function pump() {
+        return reader.read().then(({ done, value }) => {
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+            const lines = buffer.split('\n');
+            buffer = done ? '' : lines.pop();
+            lines.filter(line => line.trim()).forEach(line => onLine(JSON.parse(line)));
+            return done ? null : pump();
+        });
+    }
+    return pump();
+}
+
+function handleMatchEvent(event) {
+    if (event.type === 'page') {
+        currentMatches = currentMatches.slice(0, event.offset).concat(event.matches);
+        matchCursor = event.next_cursor;
+        displayResults(event);
+        showStatus('matchingStatus', `Found ${event.total_matches} matches out of ${event.total_profiles} profiles`, 'success');
+    } else if (event.type === 'reasons') {
+        currentMatches[event.rank].match_reasons = event.match_reasons;
+        updateMatchReasons(event.rank, event.match_reasons);
+    } else if (event.type === 'error') {
+        showStatus('matchingStatus', `Error: ${event.error}`, 'error');
+    }
+}
+
 function displayResults(data) {
     const resultsCard = document.getElementById('resultsCard');
     const resultsSummary = document.getElementById('resultsSummary');
     const resultsList = document.getElementById('resultsList');
+    const loadMoreBtn = document.getElementById('loadMoreBtn');
     
     // Show results section
     resultsCard.style.display = 'block';
+    loadMoreBtn.style.display = data.next_cursor ? 'block' : 'none';
+    loadMoreBtn.disabled = false;
+    
+    // Later pages are appended below the ones already shown
+    if (data.offset > 0) {
+        data.matches.forEach((match, index) => {
+            resultsList.appendChild(createFacultyCard(match, data.offset + index, data.reasons_pending));
+        });
+        return;
+    }
     
     // Update summary
     resultsSummary.innerHTML = `
@@ -171,12 +367,19 @@ function displayResults(data) {
     }
     
     data.matches.forEach((match, index) => {
-        const matchCard = createFacultyCard(match, index);
+        const matchCard = createFacultyCard(match, index, data.reasons_pending);
         resultsList.appendChild(matchCard);
     });
 }
 
-function createFacultyCard(match, index) {
+function updateMatchReasons(rank, reasons) {
+    const list = document.getElementById(`matchReasons${rank}`);
+    if (list) {
+        list.innerHTML = reasons.map(reason => `<li>${reason}</li>`).join('');
+    }
+}
+
+function createFacultyCard(match, index, reasonsPending) {
     const card = document.createElement('div');
     card.className = 'card faculty-card';
     
@@ -206,8 +409,8 @@ function createFacultyCard(match, index) {
                     
                     <div class="match-reasons">
                         <strong>Why this match:</strong>
-                        <ul class="mb-0 mt-1">
-                            ${match.match_reasons.map(reason => `<li>${reason}</li>`).join('')}
+                        <ul class="mb-0 mt-1" id="matchReasons${index}">
+                            ${reasonsPending ? '<li class="text-muted">Generating reasons...</li>' : match.match_reasons.map(reason => `<li>${reason}</li>`).join('')}
                         </ul>
                     </div>
                 </div>
@@ -343,9 +546,22 @@ function displayAnalysis(analysis) {
     `;
 }
 
-function exportResults(format) {
-    if (currentMatches.length === 0) {
-        alert('No results to export');
+function exportResults(format, mode = 'matches') {
+    const fields = { format: format, mode: mode };
+    
+    if (mode === 'matches') {
+        if (currentMatches.length === 0) {
+            alert('No results to export');
+            return;
+        }
+        fields.matches = JSON.stringify(currentMatches);
+    } else if (matchQuery) {
+        // Full run or scored corpus: the server re-runs the last query and streams every row
+        fields.interests = matchQuery.interests;
+        fields.openai_key = matchQuery.openaiKey;
+        fields.filters = JSON.stringify(matchQuery.filters || {});
+    } else if (mode === 'run') {
+        alert('Run a search before exporting it');
         return;
     }
     
@@ -353,18 +569,13 @@ function exportResults(format) {
     form.method = 'POST';
     form.action = '/export';
     
-    const matchesInput = document.createElement('input');
-    matchesInput.type = 'hidden';
-    matchesInput.name = 'matches';
-    matchesInput.value = JSON.stringify(currentMatches);
-    
-    const formatInput = document.createElement('input');
-    formatInput.type = 'hidden';
-    formatInput.name = 'format';
-    formatInput.value = format;
-    
-    form.appendChild(matchesInput);
-    form.appendChild(formatInput);
+    Object.entries(fields).forEach(([name, value]) => {
+        const input = document.createElement('input');
+        input.type = 'hidden';
+        input.name = name;
+        input.value = value;
+        form.appendChild(input);
+    });
     
     document.body.appendChild(form);
     form.submit();
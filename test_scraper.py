@@ -4,10 +4,39 @@ Test script for HKUST-GZ Faculty Scraper
 This script tests the scraper functionality with sample data
 """
 
+import io
+import os
+import csv
 import json
 import sys
+import subprocess
+import threading
+import tempfile
+import time
+import numpy as np
+import requests
 from hkust_scraper import HKUSTGZScraper
 from research_matcher import ResearchMatcher
+from llm_cache import LLMCache
+from vector_index import create_index, load_index, top_k
+from lexical_index import InvertedIndex, tokenize
+from rate_limiter import RateLimiter, TokenBucket
+from crawl_checkpoint import CrawlCheckpoint, STATUS_DONE, STATUS_FAILED
+from crawl_state import CrawlState, profile_fingerprint
+from http_fetcher import HTTPFetcher
+from snapshot_store import SnapshotStore
+from result_cache import ResultCache, normalize_interests
+from shared_corpus import SharedCorpus
+from facet_index import FacetIndex, normalize_filters
+from profile_store import open_profiles, profiles_version
+from exporters import MATCH_FIELDS, export_stream, match_rows, parquet_available
+from jobs import JOB_CANCELLED, JOB_FAILED, JOB_SUCCEEDED, Job, JobConflict, JobManager, JobStore
+from embedding_store import EmbeddingStore
+from driver_pool import DriverPool
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from scrape_pipeline import ScrapePipeline
+from matcher_registry import MatcherRegistry
+from profile_extractor import PROFILE_RULES, empty_profile, extract_profile
 
 def test_scraper():
     """Test the scraper with a small sample"""
@@ -106,6 +135,1028 @@ def test_matcher():
     
     return matches
 
+def test_batched_similarity():
+    """Test that batched scoring matches the per-pair similarity path"""
+    print("\nTesting Batched Similarity...")
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    
+    matcher = ResearchMatcher()
+    query = "deep learning for computer vision"
+    texts = [matcher.extract_faculty_research_text(profile) for profile in faculty_data]
+    
+    batched = matcher.calculate_semantic_similarities(query, texts, batch_size=2)
+    for text, score in zip(texts, batched):
+        expected = matcher.calculate_semantic_similarity(query, text)
+        assert abs(float(score) - expected) < 1e-5, (float(score), expected)
+    
+    print(f"✓ Batched scores match per-pair scores for {len(texts)} profiles")
+
+def test_llm_cache_skips_unparseable():
+    """Test that malformed LLM replies are not cached and are retried"""
+    print("\nTesting LLM Cache Validation...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LLMCache(os.path.join(directory, 'llm.sqlite3'))
+        request = {'model': 'test', 'messages': [{'role': 'user', 'content': 'hi'}]}
+        replies = ['```json\n{"a": 1}\n```', '{"a": 1}']
+        calls = []
+        
+        def create():
+            calls.append(1)
+            return replies[len(calls) - 1]
+        
+        try:
+            cache.get_or_create(request, create, json.loads)
+            assert False, "malformed reply should raise"
+        except ValueError:
+            pass
+        assert cache.get(cache.make_key(request)) is None
+        
+        assert cache.get_or_create(request, create, json.loads) == {'a': 1}
+        assert cache.get_or_create(request, create, json.loads) == {'a': 1}
+        assert len(calls) == 2, calls
+    
+    print("✓ Malformed replies are retried, valid ones are served from the cache")
+
+# Saved profile pages covering the layouts the extractor has to handle
+SAVED_PROFILE_PAGES = [
+    """<html><head><title>Faculty</title><style>.bio { color: red; }</style></head><body>
+    <h1>  </h1><h2>Prof. Wei Zhang</h2><div class="position">Associate Professor</div>
+    <div class="school-info">Information Hub</div>
+    <div class="research-areas">Robotics, Control; Multi-Agent Systems</div>
+    <ul><li class="publications">Learning to Walk with Model Predictive Control (2023)</li>
+    <li class="publications">Short</li><li class="publications">Swarm Robotics in the Wild, ICRA 2022</li></ul>
+    <a href="mailto:wzhang@hkust-gz.edu.cn">Email</a>
+    <div class="about-me"><script>trackVisit();</script>Works on robots.<style>p {}</style> And control.</div>
+    <a href="https://scholar.google.com/citations?user=abc">Scholar</a>
+    <a href="https://www.researchgate.net/profile/W_Zhang">RG</a>
+    <a href="https://lab.example.org">Lab</a><a href="/local">Local</a>
+    </body></html>""",
+    """<?xml version="1.0" encoding="utf-8"?>
+    <!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">
+    <html xmlns="http://www.w3.org/1999/xhtml"><body>
+    <div class="faculty-name">Dr. Li Na</div><span class="title">Professor</span>
+    <p class="department">Data Science and Analytics</p><div class="email">li.na@hkust-gz.edu.cn</div>
+    <div class="biography"><template>hidden</template>Data mining researcher.</div>
+    <a href="https://www.linkedin.com/in/lina">LinkedIn</a>
+    </body></html>""",
+    """<html><body><div id="profile-name">Chen Ming</div>
+    <div class="interests">Computer Vision</div><p class="description">  </p><div class="bio-text">Vision and graphics.</div>
+    </body></html>""",
+    "<!-- generated page, content loaded by script -->",
+]
+
+def legacy_parse_profile(html):
+    """The per-field BeautifulSoup selector cascade the extractor replaced"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    profile = {}
+    
+    def first_text(selectors):
+        for selector in selectors:
+            element = soup.select_one(selector)
+            if element and element.get_text().strip():
+                return element.get_text().strip()
+    
+    for field, rule in ((rule['field'], rule) for rule in PROFILE_RULES if rule['mode'] == 'text'):
+        value = first_text(rule['selectors'])
+        if value:
+            profile[field] = value
+    
+    for selector in ['.research-interests', '.research-areas', '.interests', '[class*="research"]', '[class*="interest"]']:
+        element = soup.select_one(selector)
+        if element:
+            text = element.get_text().strip()
+            profile['research_interests'] = [part.strip() for part in text.replace(',', ';').split(';') if part.strip()]
+            break
+    
+    profile['publications'] = [
+        element.get_text().strip() for element in soup.select('.publications')
+        if element.get_text().strip() and len(element.get_text().strip()) > 10
+    ]
+    
+    for selector in ['a[href^="mailto:"]', '.email', '[class*="email"]']:
+        element = soup.select_one(selector)
+        if element:
+            email = element.get('href', '').replace('mailto:', '') or element.get_text().strip()
+            if '@' in email:
+                profile['email'] = email
+                break
+    
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '').lower()
+        if 'scholar.google.com' in href:
+            profile['google_scholar'] = link.get('href')
+        elif 'researchgate.net' in href:
+            profile['research_gate'] = link.get('href')
+        elif 'linkedin.com' in href:
+            profile['linkedin'] = link.get('href')
+        elif 'http' in href:
+            profile['website'] = link.get('href')
+    return profile
+
+def test_profile_extractor_matches_legacy_parser():
+    """Test that the single-pass extractor returns what the selector cascade did"""
+    print("\nTesting Profile Extractor...")
+    
+    for page in SAVED_PROFILE_PAGES:
+        expected = dict(empty_profile('u'), **legacy_parse_profile(page))
+        actual = extract_profile(page, 'u')
+        assert actual == expected, (actual, expected)
+    
+    print(f"✓ Extracted profiles match the BeautifulSoup cascade on {len(SAVED_PROFILE_PAGES)} saved pages")
+
+def clustered_embeddings(n, dim=32, clusters=16, seed=0):
+    """L2-normalized vectors scattered around a few topics, like profile embeddings"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def recall_at_k(index, exact, queries, k):
+    """Share of the exact top-k rows an index returns"""
+    found = 0
+    for query in queries:
+        expected = set(exact.search(query, k)[0].tolist())
+        found += len(expected & set(index.search(query, k)[0].tolist()))
+    return found / (k * len(queries))
+
+def test_vector_index_recall():
+    """Test top-k selection and IVF recall against exact search"""
+    print("\nTesting Vector Index Recall...")
+    
+    scores = np.random.default_rng(1).random(1000).astype(np.float32)
+    indices, top_scores = top_k(scores, 10)
+    assert indices.tolist() == np.argsort(-scores)[:10].tolist()
+    assert np.all(np.diff(top_scores) <= 0)
+    
+    embeddings = clustered_embeddings(4000)
+    queries = clustered_embeddings(50, seed=2)
+    exact = create_index('exact')
+    exact.build(embeddings)
+    for query, (rows, row_scores) in zip(queries[:5], exact.search_batch(queries[:5], 10)):
+        assert rows.tolist() == exact.search(query, 10)[0].tolist()
+        assert np.allclose(row_scores, embeddings[rows] @ query)
+    
+    ivf = create_index('ivf', nprobe=8)
+    ivf.build(embeddings)
+    recall = recall_at_k(ivf, exact, queries, 10)
+    assert recall >= 0.9, recall
+    
+    print(f"✓ IVF recall@10 is {recall:.2f} over {ivf.nlist} cells")
+
+def test_quantized_index_recall():
+    """Test that float16 and int8 indexes find what exact search finds, also after a reload"""
+    print("\nTesting Quantized Index Recall...")
+    
+    embeddings = clustered_embeddings(4000)
+    queries = clustered_embeddings(50, seed=2)
+    exact = create_index('exact')
+    exact.build(embeddings)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in ('float16', 'int8'):
+            index = create_index(kind)
+            index.build(embeddings)
+            recall = recall_at_k(index, exact, queries, 10)
+            assert recall >= 0.99, (kind, recall)
+            
+            path = os.path.join(directory, f"{kind}.npz")
+            index.save(path, version='v1')
+            assert load_index(path, embeddings, version='v2') is None
+            loaded = load_index(path, embeddings, version='v1')
+            assert loaded.kind == kind
+            assert loaded.search(queries[0], 10)[0].tolist() == index.search(queries[0], 10)[0].tolist()
+            print(f"✓ {kind} recall@10 is {recall:.2f}")
+
+def test_multivector_index():
+    """Test that chunked profiles rank by their best chunk, or their top-m mean"""
+    print("\nTesting Multi-Vector Index...")
+    
+    rng = np.random.default_rng(3)
+    counts = rng.integers(1, 8, size=500)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    chunks = clustered_embeddings(int(offsets[-1]))
+    queries = clustered_embeddings(5, seed=4)
+    
+    for aggregation, top_m in (('max', 1), ('mean', 3)):
+        index = create_index('multivector', offsets=offsets, aggregation=aggregation, top_m=top_m)
+        index.build(chunks)
+        for query, (batch_rows, _) in zip(queries, index.search_batch(queries, 10)):
+            # Brute force: score every profile from its own chunks
+            expected = np.array([
+                np.sort(chunks[start:end] @ query)[::-1][:top_m].mean()
+                for start, end in zip(offsets[:-1], offsets[1:])
+            ])
+            rows, scores = index.search(query, 10)
+            assert rows.tolist() == np.argsort(-expected, kind='stable')[:10].tolist()
+            assert np.allclose(scores, expected[rows], atol=1e-5)
+            assert batch_rows.tolist() == rows.tolist()
+    
+    try:
+        create_index('multivector', offsets=[0, 2, 2]).build(chunks[:2])
+        assert False, "a profile without chunks should be rejected"
+    except ValueError:
+        pass
+    
+    print(f"✓ Multi-vector search matches brute force over {len(counts)} profiles")
+
+def test_lexical_fusion():
+    """Test BM25 scoring and the fusion of BM25 with embedding scores"""
+    print("\nTesting Hybrid Lexical Retrieval...")
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    
+    index = InvertedIndex().build(faculty_data)
+    query = "robotics and control theory"
+    docs = [tokenize(index.profile_text(profile)) for profile in faculty_data]
+    avg_length = sum(len(doc) for doc in docs) / len(docs)
+    for doc, score in zip(docs, index.score(query)):
+        expected = 0.0
+        for term in set(tokenize(query)):
+            n = sum(term in other for other in docs)
+            tf = doc.count(term)
+            if tf:
+                idf = np.log(1 + (len(docs) - n + 0.5) / (n + 0.5))
+                expected += idf * tf * 2.5 / (tf + 1.5 * (0.25 + 0.75 * len(doc) / avg_length))
+        assert abs(score - expected) < 1e-4, (score, expected)
+    
+    rows, _ = index.search(query, 10)
+    assert rows.tolist() == [2]
+    assert index.matching_keywords(2, ['Control Theory', 'robotics', 'deep learning']) == ['Control Theory', 'robotics']
+    
+    matcher = ResearchMatcher()
+    assert matcher.load_corpus(faculty_data)
+    query_embedding = matcher.encode_texts([query])[0]
+    # Profile 2 is only a lexical candidate here, and is pulled into the pool by BM25
+    pool, semantic, lexical = matcher.hybrid_rerank(query, query_embedding, np.array([0]))
+    assert sorted(pool.tolist()) == [0, 2]
+    weight = matcher.config.LEXICAL_WEIGHT
+    fused = (1 - weight) * semantic + weight * lexical
+    assert np.all(np.diff(fused) <= 1e-6)
+    assert lexical[pool.tolist().index(2)] == 1.0 and lexical[pool.tolist().index(0)] == 0.0
+    
+    print("✓ BM25 scores match the formula and fused candidates are ranked by their blended score")
+
+def test_token_bucket():
+    """Test token bucket bursts, refill rate and pauses"""
+    print("\nTesting Token Bucket...")
+    
+    bucket = TokenBucket(rate=50, capacity=5)
+    assert sum(bucket.acquire() for _ in range(5)) == 0
+    waited = bucket.acquire()
+    assert 0.01 < waited < 0.1, waited
+    
+    bucket.pause(0.1)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.1
+    
+    limiter = RateLimiter(rate=1, capacity=1)
+    limiter.acquire('host:a')
+    assert limiter.acquire('host:b') == 0
+    assert TokenBucket(rate=0).acquire(100) == 0
+    
+    print("✓ Bursts are free, later tokens wait for the refill and pauses block every caller")
+
+def test_checkpoint_resume():
+    """Test that a crawl resumes from its checkpoint log after a torn write"""
+    print("\nTesting Crawl Checkpoint Resume...")
+    
+    urls = ['https://example.edu/a', 'https://example.edu/b', 'https://example.edu/c']
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'crawl.jsonl')
+        checkpoint = CrawlCheckpoint(path).open(resume=False)
+        checkpoint.record(urls[0], STATUS_DONE, {'name': 'A', 'url': urls[0]})
+        checkpoint.record(urls[1], STATUS_FAILED, error='timeout')
+        checkpoint.close()
+        # Simulate a crash halfway through writing the next record
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "https://example.edu/c", "status": "do')
+        
+        checkpoint = CrawlCheckpoint(path).open()
+        assert checkpoint.pending(urls) == urls[1:]
+        checkpoint.record(urls[1], STATUS_DONE, {'name': 'B', 'url': urls[1]})
+        checkpoint.close()
+        
+        checkpoint = CrawlCheckpoint(path).open()
+        assert checkpoint.pending(urls) == [urls[2]]
+        assert [profile['name'] for profile in checkpoint.compact(urls)] == ['A', 'B']
+        checkpoint.finish()
+        assert not os.path.exists(path)
+    
+    print("✓ Done profiles are skipped and the torn line is dropped on resume")
+
+class StubSession:
+    """Stands in for ``requests.Session``: serves one page with an ETag and honours If-None-Match"""
+    
+    def __init__(self, html, etag):
+        self.html = html
+        self.etag = etag
+        self.sent_headers = []
+    
+    def get(self, url, headers=None, timeout=None):
+        self.sent_headers.append(dict(headers or {}))
+        response = requests.Response()
+        response.url = url
+        response.headers['ETag'] = self.etag
+        if (headers or {}).get('If-None-Match') == self.etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = self.html.encode('utf-8')
+        return response
+
+def test_conditional_recrawl():
+    """Test that saved validators turn a re-crawl of an unchanged page into a 304"""
+    print("\nTesting Conditional Re-crawl...")
+    
+    url = 'https://example.edu/faculty/a'
+    profile = {'name': 'A', 'url': url, 'research_interests': ['Robotics']}
+    with tempfile.TemporaryDirectory() as directory:
+        fetcher = HTTPFetcher(rate_limiter=RateLimiter(rate=0))
+        fetcher.session = StubSession('<html>A</html>', '"v1"')
+        state = CrawlState(os.path.join(directory, 'crawl_state.json')).load()
+        state.seed([profile])
+        assert state.validators(url) == {'etag': None, 'last_modified': None}
+        
+        result = fetcher.fetch_conditional(url, **state.validators(url))
+        assert result['status'] == 200 and result['html'] == '<html>A</html>'
+        state.update(url, profile, result['etag'], result['last_modified'])
+        state.save()
+        
+        state = CrawlState(state.path).load()
+        result = fetcher.fetch_conditional(url, **state.validators(url))
+        assert fetcher.session.sent_headers[-1] == {'If-None-Match': '"v1"'}
+        assert result['status'] == 304 and result['html'] is None and result['etag'] == '"v1"'
+        assert state.entries[url]['fingerprint'] == profile_fingerprint(profile)
+        assert profile_fingerprint(dict(profile, research_interests=['Control'])) != profile_fingerprint(profile)
+    
+    print("✓ Unchanged pages come back as 304 and changed profiles get a new fingerprint")
+
+def test_snapshot_store():
+    """Test that captured pages replay as stored and identical HTML is stored once"""
+    print("\nTesting Snapshot Store...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = SnapshotStore(directory)
+        first = store.put('https://example.edu/a', '<html>Prof. A — 机器人</html>')
+        assert store.put('https://example.edu/b', '<html>Prof. A — 机器人</html>') == first
+        store.put('https://example.edu/a', '<html>Prof. A v2</html>')
+        
+        replay = SnapshotStore(directory)
+        assert replay.get('https://example.edu/a') == '<html>Prof. A v2</html>'
+        assert replay.get('https://example.edu/missing') is None
+        assert dict(replay) == {
+            'https://example.edu/a': '<html>Prof. A v2</html>',
+            'https://example.edu/b': '<html>Prof. A — 机器人</html>'
+        }
+        objects = [name for _, _, names in os.walk(os.path.join(directory, 'objects')) for name in names]
+        assert len(objects) == 2, objects
+    
+    print("✓ Latest captures replay and duplicate pages share one object")
+
+def test_result_cache():
+    """Test result cache LRU eviction, expiry and query normalization"""
+    print("\nTesting Result Cache...")
+    
+    cache = ResultCache(max_entries=2, ttl=0)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+    
+    cache = ResultCache(max_entries=2, ttl=0.05)
+    cache.put('a', 1)
+    time.sleep(0.1)
+    assert cache.get('a') is None and cache.stats()['size'] == 0
+    
+    cache = ResultCache(max_entries=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+    
+    assert normalize_interests("  Machine   Learning. ") == normalize_interests("machine learning")
+    
+    print("✓ Least recently used entries are evicted and stale ones expire")
+
+def test_shared_corpus_switch():
+    """Test that workers attached to a shared corpus switch when a new version is published"""
+    print("\nTesting Shared Corpus Versions...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        publisher = SharedCorpus(directory, keep_versions=2)
+        worker = SharedCorpus(directory)
+        assert worker.current() is None
+        
+        for version in ('v1', 'v2', 'v3'):
+            profiles = [{'name': f"Prof. {version}", 'bio': f"Bio {version}"}]
+            embeddings = clustered_embeddings(1, seed=len(version))
+            publisher.publish(version, profiles, f"faculty_profiles_{version}.json", embeddings)
+            
+            pointer = worker.current()
+            assert pointer == {'version': version, 'profiles_file': f"faculty_profiles_{version}.json", 'count': 1}
+            store, mapped, offsets = worker.attach(pointer)
+            assert store.to_dicts() == profiles and offsets is None
+            assert np.array_equal(mapped, embeddings) and not mapped.flags.writeable
+        
+        versions = sorted(name for name in os.listdir(directory) if name.startswith('v'))
+        assert versions == ['v2', 'v3'], versions
+        
+        # A publish that fails halfway leaves nothing behind and keeps the current version
+        try:
+            publisher.publish('v4', profiles, 'faculty_profiles_v4.json', 'not a matrix')
+            assert False, "a bad embedding matrix should fail the publish"
+        except ValueError:
+            pass
+        assert sorted(os.listdir(directory)) == ['CURRENT', 'v2', 'v3']
+        assert worker.current()['version'] == 'v3'
+    
+    print("✓ Workers see each published version, old versions are pruned and failed publishes are cleaned up")
+
+def test_match_cursor_pages():
+    """Test that /match cursors page through the full ranking and reject other queries"""
+    print("\nTesting Match Pagination...")
+    
+    import app as web_app
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    
+    # Keep the test corpus private to this process
+    web_app.shared_corpus = None
+    web_app.set_corpus(faculty_data, None)
+    matcher = web_app.matcher_registry.get_matcher()
+    matcher.config.SIMILARITY_THRESHOLD = 0.0
+    client = web_app.app.test_client()
+    
+    assert web_app.decode_cursor(web_app.encode_cursor(20, 'key'), 'key') == 20
+    for cursor, key in ((web_app.encode_cursor(20, 'key'), 'other'), ('not-a-cursor', 'key')):
+        try:
+            web_app.decode_cursor(cursor, key)
+            assert False, "cursor should be rejected"
+        except ValueError:
+            pass
+    
+    interests = "robotics and machine learning"
+    names = []
+    cursor = None
+    while True:
+        page = client.post('/match', json={'interests': interests, 'page_size': 1, 'cursor': cursor}).get_json()
+        names.extend(match['name'] for match in page['matches'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    
+    ranking = matcher.match_faculty_with_interests(faculty_data, interests, with_reasons=False)
+    assert names == [match['faculty_profile']['name'] for match in ranking]
+    assert len(names) == len(faculty_data)
+    
+    other = client.post('/match', json={'interests': 'data mining', 'cursor': web_app.encode_cursor(1, 'x')})
+    assert other.status_code == 400
+    
+    print(f"✓ Cursors walked all {len(names)} ranked matches, one page at a time")
+
+def test_facet_select():
+    """Test that facet filters select the same rows as a scan over the profiles"""
+    print("\nTesting Facet Index...")
+    
+    profiles = [
+        {'department': 'Robotics', 'title': 'Professor', 'google_scholar': 'https://scholar.google.com/a'},
+        {'department': ' Data  Science ', 'title': 'Assistant Professor'},
+        {'department': 'Robotics', 'title': 'Assistant Professor', 'google_scholar': ''},
+        {'department': 'Data Science', 'title': 'Professor', 'google_scholar': 'https://scholar.google.com/d'},
+        {'title': 'Professor'},
+    ]
+    index = FacetIndex().build(profiles)
+    cases = [
+        ({}, [0, 1, 2, 3, 4]),
+        ({'department': 'Data Science'}, [1, 3]),
+        ({'department': ['Robotics', 'Data Science'], 'title': 'Professor'}, [0, 3]),
+        ({'has_google_scholar': True}, [0, 3]),
+        ({'has_google_scholar': 'false', 'title': 'Assistant Professor'}, [1, 2]),
+        ({'department': 'Chemistry'}, []),
+        ({'department': []}, [0, 1, 2, 3, 4]),
+    ]
+    for filters, expected in cases:
+        assert index.select(normalize_filters(filters)).tolist() == expected, (filters, expected)
+    
+    for filters in ({'building': 'A'}, {'has_google_scholar': 'maybe'}, {'department': 3}, ['department']):
+        try:
+            normalize_filters(filters)
+            assert False, f"{filters} should be rejected"
+        except ValueError:
+            pass
+    
+    counts = index.counts(np.array([0, 2, 3]))
+    assert counts['department'] == [{'value': 'Robotics', 'count': 2}, {'value': 'Data Science', 'count': 1}]
+    
+    print(f"✓ {len(cases)} filters select the expected rows")
+
+def test_profile_store_round_trip():
+    """Test that the columnar profile store reads back the JSON profiles, decoding heavy fields lazily"""
+    print("\nTesting Profile Store...")
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    faculty_data.append({'name': 'Dr. Null', 'department': None, 'bio': None, 'research_interests': []})
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'faculty_profiles_test.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(faculty_data, f)
+        
+        store = open_profiles(path)
+        expected = [{field: value for field, value in profile.items() if value is not None} for profile in faculty_data]
+        assert store.to_dicts() == expected
+        assert store.version == profiles_version(faculty_data)
+        assert store[-1].get('bio', '') == '' and 'department' not in store[-1]
+        assert store[0]['publications'] == faculty_data[0]['publications']
+        
+        # Heavy fields stay on disk until a record asks for them
+        assert isinstance(store.heavy['bio'][1], np.memmap)
+        with open(store.columns_path, 'r', encoding='utf-8') as f:
+            assert faculty_data[0]['bio'] not in f.read()
+        
+        manifest_mtime = os.path.getmtime(store.manifest_path)
+        assert open_profiles(path).to_dicts() == expected
+        assert os.path.getmtime(store.manifest_path) == manifest_mtime
+        
+        faculty_data[0]['title'] = 'Professor'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(faculty_data, f)
+        assert open_profiles(path)[0]['title'] == 'Professor'
+    
+    print(f"✓ {len(expected)} profiles round-trip through the store")
+
+def test_export_formats():
+    """Test that every export format decodes back to the rows, across chunk boundaries"""
+    print("\nTesting Export Formats...")
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    
+    matches = [
+        {'faculty_profile': profile, 'similarity_score': 0.9 - 0.1 * i, 'match_reasons': [f"Reason {i}", 'Shared, "quoted"']}
+        for i, profile in enumerate(faculty_data)
+    ]
+    rows = list(match_rows(matches))
+    assert [row['rank'] for row in rows] == [1, 2, 3]
+    
+    def export(format_type, rows=rows):
+        chunks = list(export_stream(iter(rows), MATCH_FIELDS, format_type, chunk_rows=2))
+        return b''.join(chunks)
+    
+    assert json.loads(export('json')) == rows
+    assert json.loads(export('json', [])) == []
+    assert [json.loads(line) for line in export('ndjson').decode('utf-8').splitlines()] == rows
+    
+    records = list(csv.DictReader(io.StringIO(export('csv').decode('utf-8'))))
+    assert [record['name'] for record in records] == [row['name'] for row in rows]
+    assert records[0]['match_reasons'] == 'Reason 0; Shared, "quoted"'
+    
+    if parquet_available():
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(io.BytesIO(export('parquet')))
+        assert parquet.num_row_groups == 2 and parquet.read().to_pylist() == rows
+    
+    try:
+        export('xml')
+        assert False, "unknown formats should be rejected"
+    except ValueError:
+        pass
+    
+    print("✓ CSV, NDJSON, JSON" + (" and Parquet" if parquet_available() else "") + " exports decode back to the rows")
+
+def wait_for(condition, timeout=5.0):
+    """Poll ``condition`` until it's true or ``timeout`` seconds pass"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+def test_job_store():
+    """Test the shared job store: one crawl at a time, cancellation, event replay and dead workers"""
+    print("\nTesting Job Store...")
+    
+    import jobs
+    import app as web_app
+    
+    poll_seconds = jobs.CANCEL_POLL_SECONDS
+    jobs.CANCEL_POLL_SECONDS = 0.05
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'jobs.sqlite3')
+            # Two managers over one store stand in for two worker processes
+            worker_a = JobManager(store=JobStore(path))
+            worker_b = JobManager(store=JobStore(path))
+            
+            def crawl(job):
+                job.report_progress({'done': 1})
+                job.cancel_event.wait(5)
+                job.report_progress({'done': 2})
+            
+            job = worker_a.submit('scrape', crawl, group='crawl')
+            wait_for(lambda: worker_b.get(job.id)['progress'].get('done') == 1)
+            try:
+                worker_b.submit('refresh', crawl, group='crawl')
+                assert False, "a second crawl should be rejected"
+            except JobConflict as e:
+                assert e.job_id == job.id
+            
+            seen = worker_b.events_after(job.id)
+            assert [event['event'] for event in seen] == ['status', 'status', 'progress']
+            assert worker_b.events_after(job.id, seen[-1]['id']) == []
+            
+            worker_b.cancel(job.id)
+            wait_for(lambda: worker_b.get(job.id)['status'] == JOB_CANCELLED)
+            resumed = worker_b.events_after(job.id, seen[-1]['id'])
+            assert [event['event'] for event in resumed] == ['cancelling', 'progress', 'status']
+            assert [event['id'] for event in resumed] == list(range(seen[-1]['id'] + 1, seen[-1]['id'] + 4))
+            
+            # A job whose worker process died must not block the next crawl
+            exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+            exited.wait()
+            orphan = Job('scrape', group='crawl')
+            worker_b.store.create(orphan)
+            worker_b.store._connect().execute('UPDATE jobs SET pid = ? WHERE id = ?', (exited.pid, orphan.id))
+            assert worker_a.get(orphan.id)['status'] == JOB_FAILED
+            assert worker_a.events_after(orphan.id)[-1]['data']['error'] == 'Worker process exited'
+            retry = worker_a.submit('scrape', lambda job: 'ok', group='crawl')
+            wait_for(lambda: worker_b.get(retry.id)['status'] == JOB_SUCCEEDED)
+            assert worker_b.get(retry.id)['result'] == 'ok'
+    finally:
+        jobs.CANCEL_POLL_SECONDS = poll_seconds
+    
+    # Malformed resume ids are a client error, not a server one
+    web_app.job_manager = JobManager()
+    job = web_app.job_manager.submit('scrape', lambda job: None)
+    client = web_app.app.test_client()
+    assert client.get(f'/jobs/{job.id}/events?after=x').status_code == 400
+    assert client.get(f'/jobs/{job.id}/events', headers={'Last-Event-ID': 'abc'}).status_code == 400
+    
+    print("✓ Crawls are exclusive across workers, cancel and resume work, and dead workers' jobs expire")
+
+def test_deferred_match_reasons():
+    """Test that deferred reasons are filled once, even by concurrent requests for one query"""
+    print("\nTesting Deferred Match Reasons...")
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    
+    matcher = ResearchMatcher()
+    matcher.config.SIMILARITY_THRESHOLD = 0.0
+    assert matcher.load_corpus(faculty_data)
+    interests = "machine learning and robotics"
+    
+    generated = []
+    generate = matcher.generate_match_reasons
+    
+    def slow_generate(faculty_profile, interest_analysis, similarity_score):
+        generated.append(faculty_profile['name'])
+        time.sleep(0.05)
+        return generate(faculty_profile, interest_analysis, similarity_score)
+    
+    matcher.generate_match_reasons = slow_generate
+    
+    matches = matcher.match_faculty_with_interests(faculty_data, interests, with_reasons=False)
+    assert matches and all(match['reasons_pending'] and match['match_reasons'] == [] for match in matches)
+    assert generated == []
+    
+    # Two requests for the same cached query fill its reasons at once
+    results = [None, None]
+    
+    def fill(slot):
+        page = matcher.match_faculty_with_interests(faculty_data, interests, with_reasons=False)
+        results[slot] = dict(matcher.fill_match_reasons(page, interests))
+    
+    threads = [threading.Thread(target=fill, args=(slot,)) for slot in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sorted(generated) == sorted(match['faculty_profile']['name'] for match in matches), generated
+    assert results[0] == results[1] and sorted(results[0]) == list(range(len(matches)))
+    assert all('reasons_pending' not in match and match['match_reasons'] for match in matches)
+    assert matcher.match_faculty_with_interests(faculty_data, interests)[0] is matches[0]
+    assert len(generated) == len(matches)
+    
+    print(f"✓ Reasons for {len(matches)} cached matches were generated once across two concurrent requests")
+
+def test_match_batch():
+    """Test that /match_batch answers each query like /match, deduplicating and isolating failures"""
+    print("\nTesting Batch Matching...")
+    
+    import app as web_app
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    
+    web_app.shared_corpus = None
+    web_app.set_corpus(faculty_data, None)
+    matcher = web_app.matcher_registry.get_matcher()
+    matcher.config.SIMILARITY_THRESHOLD = 0.0
+    matcher.config.MATCH_QUERY_BLOCK = 1
+    matcher.result_cache.clear()
+    
+    matched_queries = []
+    match_query_block = matcher.match_query_block
+    
+    def failing_block(query_indices, interests, *args):
+        matched_queries.extend(interests)
+        if 'quantum' in interests[0]:
+            raise ValueError("encoder failed")
+        return match_query_block(query_indices, interests, *args)
+    
+    matcher.match_query_block = failing_block
+    interests = ["machine learning", "robotics", "  Machine   learning. ", "   ", "quantum computing"]
+    try:
+        response = web_app.app.test_client().post('/match_batch', json={'interests': interests})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    finally:
+        del matcher.match_query_block
+        del matcher.config.MATCH_QUERY_BLOCK
+    
+    results = {line['query_index']: line for line in lines if 'query_index' in line}
+    assert sorted(results) == list(range(len(interests)))
+    assert sorted(matched_queries) == ["machine learning", "quantum computing", "robotics"], matched_queries
+    
+    # Each answer matches a fresh single-query match
+    reference = ResearchMatcher()
+    reference.config.SIMILARITY_THRESHOLD = 0.0
+    assert reference.load_corpus(faculty_data)
+    for query_index in (0, 1, 2):
+        expected = reference.match_faculty_with_interests(faculty_data, interests[query_index])
+        assert results[query_index]['matches'] == [web_app.format_match(match) for match in expected]
+    
+    assert results[3]['matches'] == []
+    assert results[4]['error'] == "encoder failed" and 'matches' not in results[4]
+    
+    print(f"✓ {len(interests)} queries answered, duplicates matched once and the failed query reported")
+
+def test_embedding_store_reencodes_changes():
+    """Test that the embedding store re-encodes only new or changed profiles"""
+    print("\nTesting Embedding Store...")
+    
+    matcher = ResearchMatcher()
+    encoded = []
+    
+    def encode(texts):
+        encoded.extend(texts)
+        return matcher.encode_texts(texts)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'faculty_profiles_test.json')
+        ids = ['a', 'b', 'c']
+        texts = ['robotics and control', 'data mining', 'computer vision']
+        first = np.array(EmbeddingStore(path, 'model-1').sync(ids, texts, encode))
+        assert encoded == texts
+        
+        # A fresh store (e.g. another worker) reuses every row
+        encoded.clear()
+        store = EmbeddingStore(path, 'model-1')
+        assert np.array_equal(store.sync(ids, texts, encode), first) and encoded == []
+        
+        # One edited, one removed, one added: only two texts go to the model
+        matrix = store.sync(['a', 'c', 'd'], ['robotics and control', 'computer graphics', 'quantum computing'], encode)
+        assert encoded == ['computer graphics', 'quantum computing']
+        assert np.array_equal(matrix[0], first[0])
+        assert np.allclose(matrix[1], matcher.encode_texts(['computer graphics'])[0])
+        
+        # Another model, or a manifest that doesn't describe the matrix, is ignored
+        assert not EmbeddingStore(path, 'model-2').load()
+        with open(store.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        with open(store.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(manifest, ids=manifest['ids'][:2], hashes=manifest['hashes'][:2]), f)
+        assert not EmbeddingStore(path, 'model-1').load()
+        assert not [name for name in os.listdir(store.directory) if '.tmp' in name]
+    
+    print("✓ Only new or changed profiles were re-encoded")
+
+class FakeDriver:
+    """Stands in for a WebDriver, recording launches and quits"""
+    
+    def __init__(self, launched):
+        self.quit_called = False
+        launched.append(self)
+    
+    def quit(self):
+        self.quit_called = True
+
+def test_driver_pool():
+    """Test that the driver pool keeps order, recycles crashed drivers and keeps timed-out ones"""
+    print("\nTesting Driver Pool...")
+    
+    launched = []
+    pool = DriverPool(lambda: FakeDriver(launched), size=1, max_pages_per_driver=3)
+    pages = ['a', 'slow-b', 'c', 'crash-d', 'e', 'f']
+    finished = []
+    crashed = set()
+    
+    def render(driver, url):
+        # 'crash' pages break the browser once, 'slow' pages always time out
+        if url.startswith('crash') and url not in crashed:
+            crashed.add(url)
+            raise WebDriverException("chrome not reachable")
+        if url.startswith('slow'):
+            raise TimeoutException("page load timed out")
+        return f"<html>{url}</html>"
+    
+    results = pool.map(render, pages, on_result=lambda index, url, result: finished.append(index))
+    
+    assert results == ['<html>a</html>', None, '<html>c</html>', '<html>crash-d</html>', '<html>e</html>',
+                       '<html>f</html>']
+    assert finished == list(range(len(pages)))
+    # Recycled once at the page limit (the timeout didn't count as a crash) and once for the crash
+    assert len(launched) == 3 and all(driver.quit_called for driver in launched), len(launched)
+    
+    stop = threading.Event()
+    stop.set()
+    stopped = DriverPool(lambda: FakeDriver(launched), size=2).map(lambda driver, url: url, pages, stop_event=stop)
+    assert stopped == [None] * len(pages) and len(launched) == 3
+    
+    print(f"✓ {len(pages)} pages rendered in order with 3 browser launches")
+
+def test_scrape_pipeline():
+    """Test pipeline output order, backpressure on a slow consumer and early stop"""
+    print("\nTesting Scrape Pipeline...")
+    
+    fetched = []
+    
+    def fetch(url):
+        fetched.append(url)
+        if url.endswith('/3'):
+            raise IOError("connection reset")
+        if url.endswith('/4'):
+            return None
+        return f"<html><body><h2>Prof. {url[-1]}</h2></body></html>"
+    
+    urls = [f"https://example.edu/faculty/{i}" for i in range(6)]
+    pipeline = ScrapePipeline(fetch, fetch_workers=1, parse_workers=1, queue_size=2)
+    results = list(pipeline.run(urls))
+    assert [url for url, _, _ in results] == urls
+    assert [profile['name'] if profile else None for _, _, profile in results] == [
+        'Prof. 0', 'Prof. 1', 'Prof. 2', None, None, 'Prof. 5'
+    ]
+    assert results[3][1] is None and results[4][1] is None
+    
+    # A consumer that stops reading holds the fetchers back to the queue bounds
+    fetched.clear()
+    urls = [f"https://example.edu/faculty/{i}" for i in range(200)]
+    results = pipeline.run(urls)
+    next(results)
+    time.sleep(0.5)
+    in_flight = len(fetched)
+    assert in_flight <= 8, in_flight
+    
+    # Closing the stream stops the fetchers
+    results.close()
+    time.sleep(0.2)
+    assert len(fetched) == in_flight
+    
+    print(f"✓ Results kept input order and a stalled consumer held fetching to {in_flight} pages")
+
+def test_matcher_registry():
+    """Test that per-key matchers share one model and corpus, with one cached client per key"""
+    print("\nTesting Matcher Registry...")
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    
+    registry = MatcherRegistry(max_clients=2)
+    base = registry.get_matcher()
+    assert registry.get_matcher() is base and registry.get_matcher(registry.config.OPENAI_API_KEY) is base
+    assert ResearchMatcher().sentence_model is base.sentence_model
+    assert base.load_corpus(faculty_data)
+    
+    first = registry.get_matcher('sk-first')
+    again = registry.get_matcher('sk-first')
+    assert first is not base and again is not first
+    assert first.sentence_model is base.sentence_model and first.corpus is base.corpus
+    assert again.openai_client is first.openai_client is registry._clients['sk-first']
+    
+    registry.get_matcher('sk-second')
+    registry.get_matcher('sk-first')
+    registry.get_matcher('sk-third')
+    assert list(registry._clients) == ['sk-first', 'sk-third']
+    
+    print("✓ Matchers share one model and corpus; clients are cached per key with LRU eviction")
+
+class MixedSession:
+    """Stands in for ``requests.Session``: serves pages by URL, with 404s and network errors"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+    
+    def get(self, url, headers=None, timeout=None):
+        page = self.pages.get(url)
+        if isinstance(page, Exception):
+            raise page
+        response = requests.Response()
+        response.url = url
+        response.status_code = 404 if page is None else 200
+        response._content = (page or 'Not Found').encode('utf-8')
+        return response
+    
+    def close(self):
+        pass
+
+def test_http_fetch_with_browser_fallback():
+    """Test concurrent HTTP fetching and the Selenium fallback for pages it can't use"""
+    print("\nTesting HTTP Fetch Mode...")
+    
+    base = 'https://example.edu/faculty/'
+    pages = {
+        base + 'a': '<html><body><h2>Prof. A</h2><div class="research-areas">Robotics</div></body></html>',
+        base + 'b': '<html><body><div id="app"></div><script>render()</script></body></html>',
+        base + 'd': requests.exceptions.InvalidURL("bad url"),
+        base + 'e': '<html><body><h2>Prof. E</h2></body></html>'
+    }
+    links = [base + name for name in 'abcde']
+    fetcher = HTTPFetcher(max_workers=4, rate_limiter=RateLimiter(rate=0))
+    fetcher.session = MixedSession(pages)
+    
+    fetched = list(fetcher.fetch_many(links))
+    assert [url for url, _ in fetched] == links
+    assert [html is not None for _, html in fetched] == [True, True, False, False, True]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        scraper = HKUSTGZScraper(fetch_mode='http')
+        scraper.checkpoint_path = os.path.join(directory, 'crawl.jsonl')
+        scraper.snapshots = None
+        scraper.create_http_fetcher = lambda: fetcher
+        scraper.get_faculty_links_http = lambda fetcher: links
+        rendered = []
+        
+        def render_profiles(profile_urls, on_result=None):
+            rendered.extend(profile_urls)
+            profiles = [dict(empty_profile(url), name=f"Rendered {url[-1]}") for url in profile_urls]
+            for index, (url, profile) in enumerate(zip(profile_urls, profiles)):
+                on_result(index, url, profile)
+            return profiles
+        
+        scraper.render_profiles = render_profiles
+        profiles = scraper.scrape_all_faculty()
+    
+    # The JS-only page, the 404 and the network error go to the browser
+    assert rendered == [base + 'b', base + 'c', base + 'd']
+    assert [profile['name'] for profile in profiles] == ['Prof. A', 'Rendered b', 'Rendered c', 'Rendered d', 'Prof. E']
+    assert profiles[0]['research_interests'] == ['Robotics']
+    
+    print(f"✓ {len(links) - len(rendered)} pages parsed over HTTP, {len(rendered)} rendered in the browser")
+
+def test_corpus_export():
+    """Test that a scored corpus export lists every stored profile, unembedded ones with an empty score"""
+    print("\nTesting Corpus Export...")
+    
+    import app as web_app
+    
+    with open('sample_faculty_data.json', 'r', encoding='utf-8') as f:
+        faculty_data = json.load(f)
+    department = faculty_data[0]['department']
+    faculty_data.insert(1, {'name': '', 'department': department, 'research_interests': ['robot learning']})
+    faculty_data.append({'name': 'No Research Text', 'research_interests': [], 'email': 'none@example.edu'})
+    
+    web_app.shared_corpus = None
+    web_app.set_corpus(faculty_data, None)
+    matcher = web_app.matcher_registry.get_matcher()
+    client = web_app.app.test_client()
+    
+    def export(filters=None):
+        response = client.post('/export', json={'mode': 'corpus', 'format': 'ndjson',
+                                                'interests': 'machine learning', 'filters': filters})
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    
+    rows = export()
+    assert [row['name'] for row in rows] == [profile['name'] for profile in faculty_data]
+    embedded = {id(profile) for profile in matcher.corpus['profiles']}
+    for profile, row in zip(faculty_data, rows):
+        assert (row['similarity_score'] is None) == (id(profile) not in embedded), row
+    assert rows[1]['similarity_score'] is None and rows[-1]['similarity_score'] is None
+    
+    # Filters apply to unembedded profiles too, and scores don't depend on the block size
+    filtered = export({'department': department})
+    assert [row['name'] for row in filtered] == [profile['name'] for profile in faculty_data
+                                                 if profile.get('department') == department]
+    blocked = [score for _, score in matcher.iter_corpus_scores('machine learning', block_size=2)]
+    assert [score is None for score in blocked] == [row['similarity_score'] is None for row in rows]
+    assert np.allclose([score for score in blocked if score is not None],
+                       [row['similarity_score'] for row in rows if row['similarity_score'] is not None], atol=1e-6)
+    
+    response = client.post('/export', json={'mode': 'corpus', 'format': 'csv', 'interests': 'machine learning'})
+    records = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(records) == len(faculty_data) and records[1]['similarity_score'] == ''
+    
+    print(f"✓ Corpus export listed all {len(rows)} stored profiles, {len(rows) - len(embedded)} without a score")
+
 def test_web_scraping():
     """Test actual web scraping (optional)"""
     print("\nTesting Web Scraping (Optional)...")
@@ -148,7 +1199,85 @@ def main():
         # Test 2: Research matching
         test_matcher()
         
-        # Test 3: Web scraping (optional)
+        # Test 3: Batched similarity
+        test_batched_similarity()
+        
+        # Test 4: LLM cache validation
+        test_llm_cache_skips_unparseable()
+        
+        # Test 5: Profile extraction
+        test_profile_extractor_matches_legacy_parser()
+        
+        # Test 6: Vector index recall
+        test_vector_index_recall()
+        
+        # Test 7: Quantized index recall
+        test_quantized_index_recall()
+        
+        # Test 8: Multi-vector index
+        test_multivector_index()
+        
+        # Test 9: Hybrid lexical retrieval
+        test_lexical_fusion()
+        
+        # Test 10: Token bucket
+        test_token_bucket()
+        
+        # Test 11: Crawl checkpoint resume
+        test_checkpoint_resume()
+        
+        # Test 12: Conditional re-crawl
+        test_conditional_recrawl()
+        
+        # Test 13: Snapshot store
+        test_snapshot_store()
+        
+        # Test 14: Result cache
+        test_result_cache()
+        
+        # Test 15: Shared corpus versions
+        test_shared_corpus_switch()
+        
+        # Test 16: Match pagination
+        test_match_cursor_pages()
+        
+        # Test 17: Facet index
+        test_facet_select()
+        
+        # Test 18: Profile store
+        test_profile_store_round_trip()
+        
+        # Test 19: Export formats
+        test_export_formats()
+        
+        # Test 20: Job store
+        test_job_store()
+        
+        # Test 21: Deferred match reasons
+        test_deferred_match_reasons()
+        
+        # Test 22: Batch matching
+        test_match_batch()
+        
+        # Test 23: Embedding store
+        test_embedding_store_reencodes_changes()
+        
+        # Test 24: Driver pool
+        test_driver_pool()
+        
+        # Test 25: Scrape pipeline
+        test_scrape_pipeline()
+        
+        # Test 26: Matcher registry
+        test_matcher_registry()
+        
+        # Test 27: HTTP fetch mode
+        test_http_fetch_with_browser_fallback()
+        
+        # Test 28: Corpus export
+        test_corpus_export()
+        
+        # Test 29: Web scraping (optional)
         test_web_scraping()
         
         print("\n" + "=" * 60)
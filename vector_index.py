@@ -0,0 +1,461 @@
+import os
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the indices and scores of the ``k`` highest scores, best first
+
+    Uses ``argpartition`` so only the selected ``k`` entries are sorted.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    if k < len(scores):
+        indices = np.argpartition(scores, -k)[-k:]
+    else:
+        indices = np.arange(len(scores))
+
+    order = np.argsort(-scores[indices], kind='stable')
+    indices = indices[order]
+    return indices, scores[indices]
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise ``top_k`` of an (m, n) score matrix: (m, k) indices and scores, best first"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((len(scores), 0), dtype=np.int64), np.zeros((len(scores), 0), dtype=np.float32)
+
+    if k < scores.shape[1]:
+        indices = np.argpartition(scores, -k, axis=1)[:, -k:]
+    else:
+        indices = np.tile(np.arange(scores.shape[1]), (len(scores), 1))
+
+    selected = np.take_along_axis(scores, indices, axis=1)
+    order = np.argsort(-selected, axis=1, kind='stable')
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(selected, order, axis=1)
+
+
+def blocked_argmax(vectors: np.ndarray, centroids: np.ndarray, block_size: int = 8192) -> np.ndarray:
+    """Assign each vector to its highest inner-product centroid, in bounded-memory blocks"""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = np.asarray(vectors[start:start + block_size], dtype=np.float32)
+        assignments[start:start + block_size] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def segment_max(scores: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Max of each non-empty segment ``scores[offsets[i]:offsets[i + 1]]``"""
+    if len(offsets) <= 1:
+        return np.zeros(0, dtype=np.float32)
+    return np.maximum.reduceat(scores, offsets[:-1])
+
+
+def segment_top_mean(scores: np.ndarray, offsets: np.ndarray, m: int) -> np.ndarray:
+    """Mean of the ``m`` highest scores of each non-empty segment (all of them if fewer)"""
+    counts = np.diff(offsets)
+    if len(counts) == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    # Sort by segment, then by descending score; segments keep their positions
+    segments = np.repeat(np.arange(len(counts)), counts)
+    order = np.lexsort((-scores, segments))
+    ranks = np.arange(len(scores)) - np.repeat(offsets[:-1], counts)
+    keep = order[ranks < m]
+
+    sums = np.bincount(segments[keep], weights=scores[keep], minlength=len(counts))
+    return (sums / np.minimum(counts, m)).astype(np.float32)
+
+
+class VectorIndex:
+    """Top-k inner-product search over L2-normalized embeddings
+
+    Backends implement ``build`` and ``search``; the embedding matrix itself
+    is owned by the embedding store, so only derived structures are saved.
+    """
+
+    kind = None
+
+    def __init__(self):
+        self.embeddings = None
+        self.logger = logging.getLogger(__name__)
+
+    def build(self, embeddings: np.ndarray):
+        """Build the index over an (n, d) embedding matrix"""
+        self.embeddings = embeddings
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return row indices and scores of the ``k`` nearest embeddings, best first"""
+        raise NotImplementedError
+
+    def search_batch(self, queries: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """``search`` for each row of an (m, d) query matrix"""
+        return [self.search(query, k) for query in queries]
+
+    def score_rows(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Exact scores of the given rows"""
+        return self.embeddings[rows] @ query
+
+    def __len__(self):
+        return 0 if self.embeddings is None else len(self.embeddings)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Arrays that need to be persisted to restore the index"""
+        return {}
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        """Restore the index from arrays written by ``get_state``"""
+
+    def get_params(self) -> Dict:
+        """Build parameters saved with the index (search-time ones are passed on load)"""
+        return {}
+
+    def save(self, path: str, version: str = None):
+        """Atomically save the index structures, tagged with the corpus version"""
+        meta = {'kind': self.kind, 'version': version, 'size': len(self), 'params': self.get_params()}
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)), **self.get_state())
+        os.replace(tmp_path, path)
+        self.logger.info(f"Saved {self.kind} index to {path}")
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force search: one matrix-vector product plus argpartition"""
+
+    kind = 'exact'
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores = self.embeddings @ query
+        return top_k(scores, k)
+
+    def search_batch(self, queries: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        # One (m, n) matrix product for the whole query block
+        indices, scores = top_k_rows(queries @ self.embeddings.T, k)
+        return list(zip(indices, scores))
+
+
+class IVFIndex(VectorIndex):
+    """Inverted-file index: spherical k-means cells, only ``nprobe`` cells are scanned per query"""
+
+    kind = 'ivf'
+
+    def __init__(self, nlist: int = 0, nprobe: int = 8, iterations: int = 20,
+                 sample_size: int = 256, seed: int = 0):
+        super().__init__()
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.sample_size = sample_size
+        self.seed = seed
+        self.centroids = None
+        self.list_offsets = None
+        self.list_ids = None
+
+    def get_params(self) -> Dict:
+        return {'nlist': self.nlist}
+
+    def build(self, embeddings: np.ndarray):
+        super().build(embeddings)
+        n = len(embeddings)
+        if n == 0:
+            self.centroids = np.zeros((0, embeddings.shape[1]), dtype=np.float32)
+            self.list_offsets = np.zeros(1, dtype=np.int64)
+            self.list_ids = np.zeros(0, dtype=np.int64)
+            return
+
+        # Default to ~sqrt(n) cells, as is usual for IVF
+        nlist = self.nlist or int(np.sqrt(n))
+        nlist = max(1, min(nlist, n))
+        self.centroids = self._train_centroids(embeddings, nlist)
+        self.nlist = len(self.centroids)
+
+        # Group row ids by cell into one contiguous array plus offsets
+        assignments = blocked_argmax(embeddings, self.centroids)
+        self.list_ids = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=self.nlist)
+        self.list_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.logger.info(f"Built IVF index with {self.nlist} cells over {n} vectors")
+
+    def _train_centroids(self, embeddings: np.ndarray, nlist: int) -> np.ndarray:
+        """Spherical k-means on a sample of the corpus"""
+        rng = np.random.default_rng(self.seed)
+        n = len(embeddings)
+        sample_ids = rng.choice(n, size=min(n, nlist * self.sample_size), replace=False)
+        sample = np.asarray(embeddings[np.sort(sample_ids)], dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            assignments = blocked_argmax(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=nlist)
+
+            # Re-seed empty cells with random sample points
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        return centroids.astype(np.float32)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.nlist == 0:
+            return top_k(np.zeros(0, dtype=np.float32), k)
+
+        nprobe = min(self.nprobe, self.nlist)
+        cells, _ = top_k(self.centroids @ query, nprobe)
+        candidate_ids = np.concatenate([
+            self.list_ids[self.list_offsets[cell]:self.list_offsets[cell + 1]] for cell in cells
+        ])
+        if len(candidate_ids) == 0:
+            return top_k(np.zeros(0, dtype=np.float32), k)
+
+        # Sorted ids keep the gather from the (possibly memory-mapped) matrix sequential
+        candidate_ids.sort()
+        positions, scores = top_k(self.embeddings[candidate_ids] @ query, k)
+        return candidate_ids[positions], scores
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {
+            'centroids': self.centroids,
+            'list_offsets': self.list_offsets,
+            'list_ids': self.list_ids
+        }
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        self.centroids = state['centroids']
+        self.list_offsets = state['list_offsets']
+        self.list_ids = state['list_ids']
+        self.nlist = len(self.centroids)
+
+
+class QuantizedIndex(VectorIndex):
+    """Search over a compressed copy of the embeddings, re-ranked in float32
+
+    The whole corpus is scored against the quantized matrix in fixed-size
+    blocks that are widened to float32 for BLAS, then the best
+    ``rerank * k`` candidates are re-scored exactly against the (memory-mapped)
+    float32 matrix. Only those rows of the float32 matrix are ever read.
+
+    This saves resident memory, not time: NumPy has no float16/int8 BLAS,
+    so every query pays for the widening. At 50k x 384, int8 is about as
+    fast as exact search and float16 about 4-5x slower (~60 ms p50), so use
+    these only when the float32 matrix can stay on disk and ``exact`` (the
+    default) doesn't fit in memory.
+    """
+
+    def __init__(self, rerank: int = 4, block_size: int = 1024):
+        super().__init__()
+        self.rerank = max(1, rerank)
+        self.block_size = block_size
+        self.codes = None
+
+    def build(self, embeddings: np.ndarray):
+        super().build(embeddings)
+        self.codes = np.empty(embeddings.shape, dtype=self.code_dtype)
+        for start in range(0, len(embeddings), 65536):
+            block = np.asarray(embeddings[start:start + 65536], dtype=np.float32)
+            self.codes[start:start + 65536] = self.quantize(block)
+        self.logger.info(f"Built {self.kind} index over {len(embeddings)} vectors "
+                         f"({self.codes.nbytes / 1e6:.1f} MB)")
+
+    def quantize(self, block: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def prepare_query(self, query: np.ndarray) -> np.ndarray:
+        """Query vector to multiply with the widened codes"""
+        return query
+
+    def approximate_scores(self, query: np.ndarray) -> np.ndarray:
+        query = np.asarray(self.prepare_query(query), dtype=np.float32)
+        scores = np.empty(len(self.codes), dtype=np.float32)
+        buffer = np.empty((self.block_size, self.codes.shape[1]), dtype=np.float32)
+        for start in range(0, len(self.codes), self.block_size):
+            block = self.codes[start:start + self.block_size]
+            widened = buffer[:len(block)]
+            np.copyto(widened, block, casting='unsafe')
+            np.dot(widened, query, out=scores[start:start + len(block)])
+        return scores
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.codes is None or len(self.codes) == 0:
+            return top_k(np.zeros(0, dtype=np.float32), k)
+
+        candidate_ids, _ = top_k(self.approximate_scores(query), k * self.rerank)
+        candidate_ids.sort()
+        positions, scores = top_k(self.embeddings[candidate_ids] @ query, k)
+        return candidate_ids[positions], scores
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {'codes': self.codes}
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        self.codes = state['codes']
+
+
+class Float16Index(QuantizedIndex):
+    """Half-precision copy of the embeddings (2x smaller)"""
+
+    kind = 'float16'
+    code_dtype = np.float16
+
+    def quantize(self, block: np.ndarray) -> np.ndarray:
+        return block.astype(np.float16)
+
+
+class Int8Index(QuantizedIndex):
+    """Symmetric per-dimension int8 scalar quantization (4x smaller)
+
+    Each dimension ``d`` is stored as ``round(x_d / scale_d)`` with
+    ``scale_d = max|x_d| / 127``, so ``q . x ~= (q * scale) . codes``.
+    """
+
+    kind = 'int8'
+    code_dtype = np.int8
+
+    def __init__(self, rerank: int = 4, block_size: int = 1024):
+        super().__init__(rerank, block_size)
+        self.scale = None
+
+    def build(self, embeddings: np.ndarray):
+        peak = np.zeros(embeddings.shape[1], dtype=np.float32)
+        for start in range(0, len(embeddings), 65536):
+            block = np.asarray(embeddings[start:start + 65536], dtype=np.float32)
+            peak = np.maximum(peak, np.abs(block).max(axis=0))
+        self.scale = np.maximum(peak, 1e-12) / 127.0
+        super().build(embeddings)
+
+    def quantize(self, block: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(block / self.scale), -127, 127).astype(np.int8)
+
+    def prepare_query(self, query: np.ndarray) -> np.ndarray:
+        return query * self.scale
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {'codes': self.codes, 'scale': self.scale}
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        self.codes = state['codes']
+        self.scale = state['scale']
+
+
+class MultiVectorIndex(VectorIndex):
+    """Exact search over rows that own several embeddings (e.g. profile chunks)
+
+    ``embeddings`` packs every chunk vector into one contiguous matrix and
+    row ``i`` owns chunks ``offsets[i]:offsets[i + 1]``. A row scores the max
+    of its chunk similarities, or with ``aggregation='mean'`` the mean of its
+    ``top_m`` best chunks.
+    """
+
+    kind = 'multivector'
+
+    def __init__(self, offsets: np.ndarray = None, aggregation: str = 'max', top_m: int = 3):
+        super().__init__()
+        if aggregation not in ('max', 'mean'):
+            raise ValueError(f"Unknown chunk aggregation: {aggregation}")
+        self.offsets = np.zeros(1, dtype=np.int64) if offsets is None else np.asarray(offsets, dtype=np.int64)
+        self.aggregation = aggregation
+        self.top_m = max(1, top_m)
+
+    def build(self, embeddings: np.ndarray):
+        if self.offsets[-1] != len(embeddings) or (np.diff(self.offsets) <= 0).any():
+            raise ValueError("Chunk offsets must cover the embedding matrix with at least one chunk per row")
+        super().build(embeddings)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def aggregate(self, chunk_scores: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Reduce chunk scores to one score per segment of ``offsets``"""
+        if self.aggregation == 'max' or self.top_m == 1:
+            return segment_max(chunk_scores, offsets)
+        return segment_top_mean(chunk_scores, offsets, self.top_m)
+
+    def _gather(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Chunk positions owned by ``rows``, with the offsets of each row's chunks among them"""
+        starts = self.offsets[rows]
+        counts = self.offsets[rows + 1] - starts
+        local_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        positions = np.arange(local_offsets[-1]) + np.repeat(starts - local_offsets[:-1], counts)
+        return positions, local_offsets
+
+    def score(self, query: np.ndarray) -> np.ndarray:
+        """Scores of every row"""
+        return self.aggregate(self.embeddings @ query, self.offsets)
+
+    def score_rows(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        positions, local_offsets = self._gather(np.asarray(rows, dtype=np.int64))
+        return self.aggregate(self.embeddings[positions] @ query, local_offsets)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        chunk_scores = self.embeddings @ query
+        maxima = segment_max(chunk_scores, self.offsets)
+        if self.aggregation == 'max' or self.top_m == 1 or len(maxima) == 0:
+            return top_k(maxima, k)
+
+        # A top-m mean never exceeds the row's max, so rows are ranked exactly
+        # once the best unranked max falls below the k-th best mean
+        order = np.argsort(-maxima, kind='stable')
+        size = min(len(order), max(4 * k, 64))
+        while True:
+            rows = order[:size]
+            positions, local_offsets = self._gather(rows)
+            means = segment_top_mean(chunk_scores[positions], local_offsets, self.top_m)
+            best, best_scores = top_k(means, k)
+            if size == len(order) or maxima[order[size]] < best_scores[-1]:
+                return rows[best], best_scores
+            size = min(len(order), size * 2)
+
+    def search_batch(self, queries: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        if (self.aggregation != 'max' and self.top_m != 1) or len(self) == 0:
+            return super().search_batch(queries, k)
+        maxima = np.maximum.reduceat(queries @ self.embeddings.T, self.offsets[:-1], axis=1)
+        indices, scores = top_k_rows(maxima, k)
+        return list(zip(indices, scores))
+
+
+INDEX_BACKENDS = {
+    ExactIndex.kind: ExactIndex,
+    IVFIndex.kind: IVFIndex,
+    Float16Index.kind: Float16Index,
+    Int8Index.kind: Int8Index,
+    MultiVectorIndex.kind: MultiVectorIndex
+}
+
+
+def create_index(kind: str, **params) -> VectorIndex:
+    """Create an unbuilt index for a backend name listed in ``INDEX_BACKENDS``"""
+    if kind not in INDEX_BACKENDS:
+        raise ValueError(f"Unknown vector index backend: {kind}")
+    return INDEX_BACKENDS[kind](**params)
+
+
+def load_index(path: str, embeddings: np.ndarray, version: str = None, **params) -> Optional[VectorIndex]:
+    """Load a saved index if it was built for the same corpus version and size"""
+    logger = logging.getLogger(__name__)
+    try:
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != version or meta.get('size') != len(embeddings):
+                return None
+            state = {name: data[name] for name in data.files if name != 'meta'}
+
+        index = create_index(meta['kind'], **{**params, **meta.get('params', {})})
+        index.embeddings = embeddings
+        index.set_state(state)
+        return index
+
+    except Exception as e:
+        logger.error(f"Error loading vector index {path}: {e}")
+        return None